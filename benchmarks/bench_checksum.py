@@ -0,0 +1,107 @@
+"""
+Descriptor checksum benchmark: table-driven incremental implementation
+against the original per-character polymod.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_checksum.py
+"""
+import time
+from embit.descriptor.checksum import checksum, checksums, DescriptorChecksum
+from embit.descriptor.errors import DescriptorError
+from embit.bip32 import HDKey
+
+N = 200
+
+INPUT_CHARSET = (
+    "0123456789()[],'/*abcdefgh@:$%{}IJKLMNOPQRSTUVW"
+    'XYZ&+-.;<=>?!^_|~ijklmnopqrstuvwxyzABCDEFGH`#"\\ '
+)
+CHECKSUM_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+
+def polymod_reference(c: int, val: int) -> int:
+    c0 = c >> 35
+    c = ((c & 0x7FFFFFFFF) << 5) ^ val
+    if c0 & 1:
+        c ^= 0xF5DEE51989
+    if c0 & 2:
+        c ^= 0xA9FDCA3312
+    if c0 & 4:
+        c ^= 0x1BAB10E32D
+    if c0 & 8:
+        c ^= 0x3706B1677A
+    if c0 & 16:
+        c ^= 0x644D626FFD
+    return c
+
+
+def checksum_reference(desc: str) -> str:
+    """Original implementation"""
+    c = 1
+    cls = 0
+    clscount = 0
+    for ch in desc:
+        pos = INPUT_CHARSET.find(ch)
+        if pos == -1:
+            raise DescriptorError("Invalid character '%s' in the input string" % ch)
+        c = polymod_reference(c, pos & 31)
+        cls = cls * 3 + (pos >> 5)
+        clscount += 1
+        if clscount == 3:
+            c = polymod_reference(c, cls)
+            cls = 0
+            clscount = 0
+    if clscount > 0:
+        c = polymod_reference(c, cls)
+    for j in range(0, 8):
+        c = polymod_reference(c, 0)
+    c ^= 1
+    return "".join([CHECKSUM_CHARSET[(c >> (5 * (7 - j))) & 31] for j in range(0, 8)])
+
+
+xpubs = [
+    HDKey.from_seed(bytes([i]) * 64).derive("m/48h/0h/0h/2h").to_public()
+    for i in range(15)
+]
+DESCS = {
+    "wpkh": "wpkh([12345678/84h/0h/0h]%s/0/*)" % xpubs[0],
+    "multi 3-of-5": "wsh(sortedmulti(3,%s))"
+    % ",".join(["%s/<0;1>/*" % k for k in xpubs[:5]]),
+    "multi 11-of-15": "wsh(sortedmulti(11,%s))"
+    % ",".join(["%s/<0;1>/*" % k for k in xpubs]),
+}
+
+
+def run(fn, desc):
+    """Returns time per checksum in microseconds"""
+    t0 = time.perf_counter()
+    for i in range(N):
+        fn(desc)
+    return (time.perf_counter() - t0) / N * 1e6
+
+
+def main():
+    for name, desc in DESCS.items():
+        assert checksum(desc) == checksum_reference(desc)
+        old = run(checksum_reference, desc)
+        new = run(checksum, desc)
+        print(
+            "%-14s %5d chars: reference %8.1f us, table %8.1f us, x%.1f"
+            % (name, len(desc), old, new, old / new)
+        )
+    # checksum of the same descriptor on different branches from a saved state
+    desc = DESCS["multi 11-of-15"]
+    prefix, suffix = desc[:-4], desc[-4:]
+    state = DescriptorChecksum(prefix)
+    t0 = time.perf_counter()
+    for i in range(N):
+        state.copy().update(suffix).checksum()
+    dt = (time.perf_counter() - t0) / N * 1e6
+    print("continue from saved state: %8.1f us" % dt)
+    descs = list(DESCS.values()) * N
+    t0 = time.perf_counter()
+    checksums(descs)
+    dt = (time.perf_counter() - t0) / len(descs) * 1e6
+    print("batch of %d descriptors: %8.1f us per descriptor" % (len(descs), dt))
+
+
+if __name__ == "__main__":
+    main()
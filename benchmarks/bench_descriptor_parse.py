@@ -0,0 +1,51 @@
+"""
+Parsing benchmark for descriptors with big taptrees.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_descriptor_parse.py
+"""
+import time
+from embit.descriptor import Descriptor
+from embit.ec import PrivateKey
+
+N = 20
+
+keys = [PrivateKey(i.to_bytes(32, "big")).xonly().hex() for i in range(1, 257)]
+
+
+def balanced(ks):
+    """Balanced taptree with one leaf per key"""
+    if len(ks) == 1:
+        return "and_v(v:pk(%s),older(%d))" % (ks[0], 144)
+    h = len(ks) // 2
+    return "{%s,%s}" % (balanced(ks[:h]), balanced(ks[h:]))
+
+
+def chain(ks):
+    """Maximally unbalanced taptree"""
+    if len(ks) == 1:
+        return "pk(%s)" % ks[0]
+    return "{pk(%s),%s}" % (ks[0], chain(ks[1:]))
+
+
+def run(desc):
+    """Returns parsing time in ms"""
+    t0 = time.perf_counter()
+    for i in range(N):
+        Descriptor.from_string(desc)
+    return (time.perf_counter() - t0) / N * 1e3
+
+
+def main():
+    for num_leafs in [16, 64, 256]:
+        for name, fn in [("balanced", balanced), ("chain", chain)]:
+            if name == "chain" and num_leafs > 128:
+                # taptree depth is limited to 128
+                continue
+            desc = "tr(%s,%s)" % (keys[0], fn(keys[:num_leafs]))
+            print(
+                "%-8s %3d leafs, %6d chars: %7.2f ms"
+                % (name, num_leafs, len(desc), run(desc))
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Pickling overhead benchmark for objects sent to worker processes.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_pickle.py
+"""
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from embit.ec import PrivateKey
+from embit.bip32 import HDKey
+from embit.descriptor import Descriptor
+from embit.transaction import Transaction, TransactionInput, TransactionOutput
+from embit import script
+
+N = 2000
+
+root = HDKey.from_seed(b"1" * 64)
+xpub = root.derive("m/84h/0h/0h").to_public()
+pk = PrivateKey(b"2" * 32)
+desc = Descriptor.from_string(
+    "wsh(sortedmulti(2,%s/0/*,%s/1/*))" % (xpub, root.derive("m/1h").to_public())
+)
+tx = Transaction(
+    vin=[TransactionInput(bytes([i]) * 32, i) for i in range(10)],
+    vout=[TransactionOutput(1000, script.p2wpkh(pk)) for i in range(10)],
+)
+
+OBJECTS = {
+    "PublicKey": pk.get_public_key(),
+    "PrivateKey": pk,
+    "HDKey": xpub,
+    "Descriptor": desc,
+    "Transaction": tx,
+}
+
+
+def roundtrip(obj):
+    """Returns pickled size and time of dumps+loads in microseconds"""
+    t0 = time.perf_counter()
+    for i in range(N):
+        b = pickle.dumps(obj)
+        pickle.loads(b)
+    return len(b), (time.perf_counter() - t0) / N * 1e6
+
+
+def address(obj):
+    return obj.derive(0).address()
+
+
+def fanout(obj, workers=4):
+    """Time to send the same object to N tasks in a process pool, ms"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # warm up the pool
+        list(executor.map(address, [obj] * workers))
+        t0 = time.perf_counter()
+        list(executor.map(address, [obj] * N, chunksize=16))
+        return (time.perf_counter() - t0) * 1e3
+
+
+def main():
+    for name, obj in OBJECTS.items():
+        size, dt = roundtrip(obj)
+        print("%-12s %5d bytes  %8.1f us per dumps+loads" % (name, size, dt))
+    print("fan-out of %d descriptor tasks: %.0f ms" % (N, fanout(desc)))
+
+
+if __name__ == "__main__":
+    main()
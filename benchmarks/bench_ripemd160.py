@@ -0,0 +1,86 @@
+"""
+Pure python RIPEMD-160 and hash160 throughput benchmark.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_ripemd160.py
+"""
+import hashlib
+import time
+from embit import hashes
+from embit.util import py_ripemd160
+from embit.util.py_ripemd160 import ML, MR, RL, RR, KL, KR
+
+N = 2000
+
+
+def fi(x, y, z, i):
+    """Original round functions"""
+    if i == 0:
+        return x ^ y ^ z
+    elif i == 1:
+        return (x & y) | (~x & z)
+    elif i == 2:
+        return (x | ~y) ^ z
+    elif i == 3:
+        return (x & z) | (y & ~z)
+    return x ^ (y | ~z)
+
+
+def rol(x, i):
+    return ((x << i) | ((x & 0xFFFFFFFF) >> (32 - i))) & 0xFFFFFFFF
+
+
+def compress_reference(h0, h1, h2, h3, h4, block):
+    """Original compression function with a loop over the tables"""
+    al, bl, cl, dl, el = h0, h1, h2, h3, h4
+    ar, br, cr, dr, er = h0, h1, h2, h3, h4
+    x = [int.from_bytes(block[4 * i : 4 * (i + 1)], "little") for i in range(16)]
+    for j in range(80):
+        rnd = j >> 4
+        al = rol(al + fi(bl, cl, dl, rnd) + x[ML[j]] + KL[rnd], RL[j]) + el
+        al, bl, cl, dl, el = el, al, bl, rol(cl, 10), dl
+        ar = rol(ar + fi(br, cr, dr, 4 - rnd) + x[MR[j]] + KR[rnd], RR[j]) + er
+        ar, br, cr, dr, er = er, ar, br, rol(cr, 10), dr
+    return h1 + cl + dr, h2 + dl + er, h3 + el + ar, h4 + al + br, h0 + bl + cr
+
+
+def run(fn, data, n=N):
+    """Returns number of calls per second"""
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(data)
+    return n / (time.perf_counter() - t0)
+
+
+def best(fn, repeat=5):
+    """Best time of several runs in seconds"""
+    res = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        res.append(time.perf_counter() - t0)
+    return min(res)
+
+
+def main():
+    block = bytes(range(64))
+    state = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+    ref = [h & 0xFFFFFFFF for h in compress_reference(*state, block)]
+    assert ref == list(py_ripemd160.compress(*state, block))
+    old = run(lambda b: compress_reference(*state, b), block)
+    new = run(lambda b: py_ripemd160.compress(*state, b), block)
+    print(
+        "compress:  reference %6.0f blocks/s, unrolled %6.0f blocks/s, x%.2f"
+        % (old, new, new / old)
+    )
+    data = b"\x01" * 1024
+    print("ripemd160: %.1f kB/s on 1kB messages" % run(py_ripemd160.ripemd160, data))
+    pubs = [bytes([2]) + hashlib.sha256(bytes([i % 256])).digest() for i in range(N)]
+    single = best(lambda: [hashes.hash160(pub) for pub in pubs])
+    many = best(lambda: hashes.hash160_many(pubs))
+    print(
+        "hash160 (%s): one by one %.0f/s, hash160_many %.0f/s"
+        % (hashes.ripemd160.__module__, len(pubs) / single, len(pubs) / many)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Tagged hash benchmark: cached sha256 midstates against hashing the tag every time.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_tagged_hash.py
+"""
+import hashlib
+import time
+from embit.hashes import tagged_hash
+from embit.descriptor import Descriptor
+from embit.bip32 import HDKey
+
+N = 100000
+
+
+def tagged_hash_reference(tag: str, data: bytes) -> bytes:
+    """Original implementation"""
+    hashtag = hashlib.sha256(tag.encode()).digest()
+    return hashlib.sha256(hashtag + hashtag + data).digest()
+
+
+def run(fn, tag, data):
+    """Returns time per hash in microseconds"""
+    t0 = time.perf_counter()
+    for i in range(N):
+        fn(tag, data)
+    return (time.perf_counter() - t0) / N * 1e6
+
+
+def main():
+    for tag, data in [
+        ("TapTweak", b"\x01" * 64),
+        ("TapLeaf", b"\xc0\x22" + b"\x02" * 34),
+        ("TapBranch", b"\x03" * 64),
+        ("BIP0340/challenge", b"\x04" * 96),
+    ]:
+        assert tagged_hash(tag, data) == tagged_hash_reference(tag, data)
+        old = run(tagged_hash_reference, tag, data)
+        new = run(tagged_hash, tag, data)
+        print(
+            "%-18s reference %5.2f us, midstate %5.2f us, x%.2f"
+            % (tag, old, new, old / new)
+        )
+    xpub = HDKey.from_seed(b"1" * 64).to_public()
+    desc = Descriptor.from_string(
+        "tr(%s/0/*,{pk(%s/1/*),pk(%s/2/*)})" % (xpub, xpub, xpub)
+    )
+    t0 = time.perf_counter()
+    for i in range(200):
+        desc.derive(i).script_pubkey()
+    dt = (time.perf_counter() - t0) / 200 * 1e3
+    print("tr() with 2 leafs: %.3f ms per derived scriptPubKey" % dt)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Signing benchmark for a large taproot PSBT.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_taproot_sign.py
+"""
+import time
+from embit import script
+from embit.ec import PrivateKey
+from embit.bip32 import HDKey
+from embit.psbt import PSBT, DerivationPath
+from embit.transaction import Transaction, TransactionInput, TransactionOutput
+
+N = 500
+
+root = HDKey.from_seed(b"1" * 64)
+wif = PrivateKey(b"2" * 32)
+
+
+def make_psbt(keys):
+    """Creates a PSBT spending one keypath taproot utxo per key"""
+    vin = [TransactionInput(bytes([i % 256]) * 32, i) for i in range(len(keys))]
+    vout = [TransactionOutput(1000, script.p2tr(wif))]
+    psbt = PSBT(Transaction(vin=vin, vout=vout))
+    for inp, (pub, der) in zip(psbt.inputs, keys):
+        inp.witness_utxo = TransactionOutput(10000, script.p2tr(pub))
+        if der is not None:
+            inp.taproot_bip32_derivations[pub] = ([], der)
+    return psbt
+
+
+def measure(name, psbt, key):
+    t0 = time.perf_counter()
+    n = psbt.sign_with(key)
+    dt = time.perf_counter() - t0
+    assert n == N
+    print("%-14s %4d inputs: %7.1f ms" % (name, N, dt * 1000))
+
+
+def main():
+    # same key in every input
+    pub = wif.get_public_key()
+    measure("single key", make_psbt([(pub, None)] * N), wif)
+    # different derived key in every input
+    fingerprint = root.my_fingerprint
+    keys = []
+    for i in range(N):
+        der = [0x80000000 + 86, 0x80000000, 0x80000000, 0, i]
+        keys.append(
+            (root.derive(der).get_public_key(), DerivationPath(fingerprint, der))
+        )
+    measure("derived keys", make_psbt(keys), root)
+    # raw signing with the same key
+    msgs = [i.to_bytes(32, "big") for i in range(N)]
+    t0 = time.perf_counter()
+    for msg in msgs:
+        wif.schnorr_sign(msg)
+    dt = time.perf_counter() - t0
+    print("%-14s %4d sigs:   %7.1f ms" % ("schnorr_sign", N, dt * 1000))
+
+
+if __name__ == "__main__":
+    main()
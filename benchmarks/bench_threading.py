@@ -0,0 +1,65 @@
+"""
+Scaling benchmark for secp256k1 calls from multiple threads.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_threading.py
+"""
+import os
+import threading
+import time
+from embit.ec import PrivateKey
+from embit.bip32 import HDKey
+
+N = 2000
+
+pk = PrivateKey(b"1" * 32)
+pub = pk.get_public_key()
+msg = b"2" * 32
+sig = pk.sign(msg)
+root = HDKey.from_seed(b"3" * 64)
+xpub = root.to_public()
+
+
+def sign():
+    for i in range(N):
+        pk.sign(msg)
+
+
+def verify():
+    for i in range(N):
+        pub.verify(sig, msg)
+
+
+def child():
+    for i in range(N):
+        xpub.child(i)
+
+
+def run(fn, num_threads):
+    """Runs fn in num_threads threads, returns operations per second"""
+    threads = [threading.Thread(target=fn) for i in range(num_threads)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return N * num_threads / (time.perf_counter() - t0)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    for fn in [sign, verify, child]:
+        base = None
+        for num_threads in counts:
+            ops = run(fn, num_threads)
+            if base is None:
+                base = ops
+            print(
+                "%-8s threads: %3d  %10.0f ops/s  x%.2f"
+                % (fn.__name__, num_threads, ops, ops / base)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Transaction hashing benchmark: streaming double sha256 against
+serializing every input and output to bytes.
+Run from the repository root: PYTHONPATH=src python benchmarks/bench_txid.py
+"""
+import hashlib
+import time
+from embit import compact, hashes
+from embit.ec import PrivateKey
+from embit.script import p2wpkh, Script
+from embit.transaction import Transaction, TransactionInput, TransactionOutput, txids
+
+N = 200
+
+pk = PrivateKey(b"1" * 32)
+
+
+def make_tx(num_inputs, num_outputs):
+    vin = [
+        TransactionInput(bytes([i % 256]) * 32, i, script_sig=Script(b"\x01" * 107))
+        for i in range(num_inputs)
+    ]
+    vout = [TransactionOutput(1000 + i, p2wpkh(pk)) for i in range(num_outputs)]
+    return Transaction(vin=vin, vout=vout)
+
+
+def hash_reference(tx):
+    """Original implementation"""
+    h = hashlib.sha256()
+    h.update(tx.version.to_bytes(4, "little"))
+    h.update(compact.to_bytes(len(tx.vin)))
+    for inp in tx.vin:
+        h.update(inp.serialize())
+    h.update(compact.to_bytes(len(tx.vout)))
+    for out in tx.vout:
+        h.update(out.serialize())
+    h.update(tx.locktime.to_bytes(4, "little"))
+    return hashlib.sha256(h.digest()).digest()
+
+
+def run(fn, arg, n=N):
+    """Returns time per call in microseconds"""
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(arg)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    for num_inputs, num_outputs in [(1, 2), (10, 10), (100, 2)]:
+        tx = make_tx(num_inputs, num_outputs)
+        assert tx.hash() == hash_reference(tx)
+        old = run(hash_reference, tx)
+        new = run(Transaction.hash, tx)
+        print(
+            "%3d inputs %3d outputs: reference %7.1f us, streaming %7.1f us, x%.2f"
+            % (num_inputs, num_outputs, old, new, old / new)
+        )
+    # block-sized workload: 2000 raw transactions
+    raws = [make_tx(2, 2).serialize() for i in range(2000)]
+    t0 = time.perf_counter()
+    [Transaction.parse(raw).txid() for raw in raws]
+    parsed = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    txids(raws)
+    raw = time.perf_counter() - t0
+    print(
+        "txids of %d raw transactions: parse+txid %.1f ms, txids() %.1f ms"
+        % (len(raws), parsed * 1e3, raw * 1e3)
+    )
+    msgs = [b"\x01" * 250] * 20000
+    t0 = time.perf_counter()
+    [hashes.double_sha256(msg) for msg in msgs]
+    single = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    hashes.double_sha256_many(msgs)
+    many = time.perf_counter() - t0
+    print(
+        "double_sha256 of %d messages: one by one %.1f ms, batch %.1f ms"
+        % (len(msgs), single * 1e3, many * 1e3)
+    )
+
+
+if __name__ == "__main__":
+    main()
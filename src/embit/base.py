@@ -1,6 +1,7 @@
 """Base classes"""
 from io import BytesIO
 from binascii import hexlify, unhexlify
+from . import hashes
 
 
 class EmbitError(Exception):
@@ -10,6 +11,8 @@ class EmbitError(Exception):
 
 
 class EmbitBase:
+    __slots__ = ()
+
     @classmethod
     def read_from(cls, stream, *args, **kwargs):
         """All classes should be readable from stream"""
@@ -81,6 +84,8 @@ class EmbitBase:
 
 
 class EmbitKey(EmbitBase):
+    __slots__ = ()
+
     def sec(self) -> bytes:
         """
         Any EmbitKey should implement sec() method that returns
@@ -94,6 +99,10 @@ class EmbitKey(EmbitBase):
         """xonly representation of the key"""
         return self.sec()[1:33]
 
+    def hash160(self) -> bytes:
+        """hash160 of the sec representation of the key"""
+        return hashes.hash160(self.sec())
+
     @property
     def is_private(self) -> bool:
         """
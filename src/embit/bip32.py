@@ -1,14 +1,35 @@
 from . import ec
 from .base import EmbitKey, EmbitError
-from .misc import copy, const, secp256k1
+from .misc import copy, const, secp256k1, get_parse_cache
 from .networks import NETWORKS
 from . import base58
-from . import hashes
 import hmac
 from binascii import hexlify
+from collections import OrderedDict
+
+try:
+    from threading import Lock
+except ImportError:
+    # MicroPython
+    from _thread import allocate_lock as Lock
+
+
+def _hmac_can_copy():
+    # MicroPython hashes can't be copied, so hmac state can't be reused there
+    try:
+        hmac.new(b"", digestmod="sha512").copy()
+        return True
+    except Exception:
+        return False
+
+
+_HMAC_CAN_COPY = _hmac_can_copy()
 
 HARDENED_INDEX = const(0x80000000)
 
+# opt-in derivation cache used by HDKey.derive, see set_derivation_cache()
+_derivation_cache = None
+
 
 class HDError(EmbitError):
     pass
@@ -40,6 +61,8 @@ class HDKey(EmbitKey):
         self.depth = depth
         self.fingerprint = fingerprint
         self._my_fingerprint = b""
+        # pre-keyed hmac with chain code, copied for every child
+        self._hmac = None
         self.child_number = child_number
         # check that base58[1:4] is "prv" or "pub"
         if self.is_private and self.to_base58()[1:4] != "prv":
@@ -57,16 +80,36 @@ class HDKey(EmbitKey):
 
     @classmethod
     def from_base58(cls, s: str):
+        cache = get_parse_cache()
+        if cache is not None:
+            return cache.parse(cls, s, cls._from_base58)
+        return cls._from_base58(s)
+
+    @classmethod
+    def _from_base58(cls, s: str):
         b = base58.decode_check(s)
         return cls.parse(b)
 
     @property
     def my_fingerprint(self) -> bytes:
         if not self._my_fingerprint:
-            sec = self.sec()
-            self._my_fingerprint = hashes.hash160(sec)[:4]
+            self._my_fingerprint = self.get_public_key().hash160()[:4]
         return self._my_fingerprint
 
+    def _child_hmac(self, data: bytes) -> bytes:
+        """HMAC-SHA512 of data keyed with the chain code"""
+        if not _HMAC_CAN_COPY:
+            return hmac.new(self.chain_code, data, digestmod="sha512").digest()
+        # chain code can be replaced, so we check that cached state is for current one
+        if self._hmac is None or self._hmac[0] is not self.chain_code:
+            self._hmac = (
+                self.chain_code,
+                hmac.new(self.chain_code, digestmod="sha512"),
+            )
+        h = self._hmac[1].copy()
+        h.update(data)
+        return h.digest()
+
     @property
     def is_private(self) -> bool:
         """checks if the HDKey is private or public"""
@@ -191,15 +234,36 @@ class HDKey(EmbitKey):
             hardened = True
         if hardened and not self.is_private:
             raise HDError("Can't do hardened with public key")
+        return self._child(index, hardened)
+
+    def derive_range(self, start: int, count: int, hardened: bool = False):
+        """
+        Derives `count` sibling HDKeys with indexes starting from `start`.
+        Parent sec, fingerprint and hmac state are computed only once
+        and indexes are checked for the whole range.
+        Returns a generator, so large ranges can be scanned without
+        keeping all the keys in memory.
+        """
+        if hardened and start < HARDENED_INDEX:
+            start += HARDENED_INDEX
+        if start < 0 or count < 0 or start + count - 1 > 0xFFFFFFFF:
+            raise HDError("Index should be less than 2^32")
+        if start + count > HARDENED_INDEX and not self.is_private:
+            raise HDError("Can't do hardened with public key")
+        # indexes are checked above, not on the first iteration
+        return self._derive_range(start, count)
+
+    def _derive_range(self, start: int, count: int):
+        for index in range(start, start + count):
+            yield self._child(index, index >= HARDENED_INDEX)
 
-        # we need pubkey for fingerprint anyways
-        sec = self.sec()
-        fingerprint = hashes.hash160(sec)[:4]
+    def _child(self, index: int, hardened: bool):
+        """Derives a child HDKey with already checked index"""
         if hardened:
             data = b"\x00" + self.key.serialize() + index.to_bytes(4, "big")
         else:
-            data = sec + index.to_bytes(4, "big")
-        raw = hmac.new(self.chain_code, data, digestmod="sha512").digest()
+            data = self.sec() + index.to_bytes(4, "big")
+        raw = self._child_hmac(data)
         secret = raw[:32]
         chain_code = raw[32:]
         if self.is_private:
@@ -210,20 +274,27 @@ class HDKey(EmbitKey):
             point = copy(self.key._point)
             point = secp256k1.ec_pubkey_add(point, secret)
             key = ec.PublicKey(point)
-        return HDKey(
-            key,
-            chain_code,
-            version=self.version,
-            depth=self.depth + 1,
-            fingerprint=fingerprint,
-            child_number=index,
-        )
+        # child inherits the version of the parent that was already checked,
+        # so we skip base58 version check in __init__ - it's the slowest part.
+        # Keep in sync with __init__.
+        child = HDKey.__new__(HDKey)
+        child.key = key
+        child.version = self.version
+        child.chain_code = chain_code
+        child.depth = self.depth + 1
+        child.fingerprint = self.my_fingerprint
+        child._my_fingerprint = b""
+        child._hmac = None
+        child.child_number = index
+        return child
 
     def derive(self, path):
         """path: int array or a string starting with m/"""
         if isinstance(path, str):
             # string of the form m/44h/0'/ind
             path = parse_path(path)
+        if _derivation_cache is not None and len(path) > 0:
+            return _derivation_cache.derive(self, path)
         child = self
         for idx in path:
             child = child.child(idx)
@@ -253,6 +324,110 @@ class HDKey(EmbitKey):
     def __hash__(self):
         return hash(self.serialize())
 
+    def __reduce__(self):
+        return type(self).parse, (self.serialize(),)
+
+    def __deepcopy__(self, memo):
+        # other attributes are immutable, only ec key needs a copy
+        from copy import deepcopy
+
+        res = type(self).__new__(type(self))
+        memo[id(self)] = res
+        res.__dict__.update(self.__dict__)
+        res.key = deepcopy(self.key, memo)
+        return res
+
+
+class DerivationCache:
+    """
+    Bounded LRU cache of derived HDKeys keyed by parent key and path prefix.
+    Every intermediate key of the path is cached, so deriving
+    m/84h/0h/0h/0/i for many i derives hardened part only once.
+    Cache keeps derived private keys in memory - call evict() or clear()
+    when they are not needed anymore.
+    derive() returns shallow copies, so changing attributes of returned keys
+    doesn't affect the cache. Cache can be shared between threads.
+    """
+
+    def __init__(self, size: int = 256):
+        if size <= 0:
+            raise HDError("Cache size should be positive")
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _get(self, key):
+        with self._lock:
+            child = self._cache.pop(key, None)
+            if child is not None:
+                # move to the end as most recently used
+                self._cache[key] = child
+            return child
+
+    def _put(self, key, child):
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = child
+            while len(self._cache) > self.size:
+                self._cache.pop(next(iter(self._cache)), None)
+
+    def derive(self, parent: HDKey, path) -> HDKey:
+        """Derives path from parent reusing the longest cached path prefix"""
+        # serialization covers everything children depend on: version, depth, keys
+        parent_id = parent.serialize()
+        path = tuple(path)
+        child = parent
+        start = 0
+        for i in range(len(path), 0, -1):
+            cached = self._get((parent_id, path[:i]))
+            if cached is not None:
+                child = cached
+                start = i
+                break
+        if start > 0:
+            self.hits += 1
+        else:
+            self.misses += 1
+        for i in range(start, len(path)):
+            child = child.child(path[i])
+            self._put((parent_id, path[: i + 1]), child)
+        if child is parent:
+            return child
+        # cached keys are shared, caller gets its own copy
+        res = HDKey.__new__(HDKey)
+        res.__dict__.update(child.__dict__)
+        return res
+
+    def evict(self, parent: HDKey):
+        """Removes all keys derived from parent"""
+        parent_id = parent.serialize()
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == parent_id]:
+                self._cache.pop(key, None)
+
+    def clear(self):
+        """Removes all cached keys"""
+        with self._lock:
+            self._cache.clear()
+
+
+def set_derivation_cache(cache=None):
+    """
+    Sets DerivationCache used by HDKey.derive (and so by descriptors and PSBT signing).
+    Cache is disabled by default, pass None to disable it again.
+    """
+    global _derivation_cache
+    _derivation_cache = cache
+
+
+def get_derivation_cache():
+    return _derivation_cache
+
 
 def detect_version(path, default="xprv", network=None) -> bytes:
     """
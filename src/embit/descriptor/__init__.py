@@ -1,3 +1,5 @@
 from . import miniscript
 from .descriptor import Descriptor
 from .arguments import Key
+from .compiled import CompiledDescriptor
+from .index import DescriptorIndex
@@ -3,7 +3,7 @@ from .base import DescriptorBase
 from .errors import ArgumentError
 from .. import bip32, ec, compact, hashes
 from ..bip32 import HARDENED_INDEX
-from ..misc import read_until
+from ..misc import read_until, get_parse_cache
 
 
 class KeyOrigin:
@@ -218,11 +218,13 @@ class Key(DescriptorBase):
         return [] if self.origin is None else self.origin.derivation
 
     @classmethod
-    def read_from(cls, s, taproot: bool = False):
+    def read_from(cls, s, taproot: bool = False, pubkey_cls=None):
         """
         Reads key argument from stream.
         If taproot is set to True - allows both x-only and sec pubkeys.
         If taproot is False - will raise when finds xonly pubkey.
+        pubkey_cls is used for bare public keys (ec.PublicKey by default),
+        pass ec.LazyPublicKey to postpone their parsing.
         """
         first = s.read(1)
         origin = None
@@ -259,7 +261,7 @@ class Key(DescriptorBase):
         if char is not None:
             s.seek(-1, 1)
         # parse key
-        k, xonly_repr = cls.parse_key(k, taproot)
+        k, xonly_repr = cls.parse_key(k, taproot, pubkey_cls)
         # parse derivation
         allow_hardened = isinstance(k, bip32.HDKey) and isinstance(k.key, ec.PrivateKey)
         derivation = AllowedDerivation.from_string(
@@ -268,15 +270,17 @@ class Key(DescriptorBase):
         return cls(k, origin, derivation, taproot, xonly_repr)
 
     @classmethod
-    def parse_key(cls, key: bytes, taproot: bool = False):
+    def parse_key(cls, key: bytes, taproot: bool = False, pubkey_cls=None):
+        if pubkey_cls is None:
+            pubkey_cls = ec.PublicKey
         # convert to string
         k = key.decode()
         if len(k) in [66, 130] and k[:2] in ["02", "03", "04"]:
             # bare public key
-            return ec.PublicKey.parse(unhexlify(k)), False
+            return pubkey_cls.parse(unhexlify(k)), False
         elif taproot and len(k) == 64:
             # x-only pubkey
-            return ec.PublicKey.parse(b"\x02" + unhexlify(k)), True
+            return pubkey_cls.parse(b"\x02" + unhexlify(k)), True
         elif k[1:4] in ["pub", "prv"]:
             # bip32 key
             return bip32.HDKey.from_base58(k), False
@@ -314,6 +318,9 @@ class Key(DescriptorBase):
     def xonly(self):
         return self.key.xonly()
 
+    def hash160(self):
+        return self.key.hash160()
+
     def taproot_tweak(self, h=b""):
         assert self.taproot
         return self.key.taproot_tweak(h)
@@ -370,7 +377,7 @@ class Key(DescriptorBase):
         if self.origin:
             origin = KeyOrigin(self.origin.fingerprint, self.origin.derivation + der)
         else:
-            origin = KeyOrigin(self.key.child(0).fingerprint, der)
+            origin = KeyOrigin(self.key.my_fingerprint, der)
         # empty derivation
         derivation = None
         return type(self)(k, origin, derivation, self.taproot)
@@ -418,8 +425,15 @@ class Key(DescriptorBase):
         return self.prefix + self.key
 
     @classmethod
-    def from_string(cls, s, taproot=False):
-        return cls.parse(s.encode(), taproot)
+    def from_string(cls, s, taproot=False, pubkey_cls=None):
+        cache = get_parse_cache()
+        if cache is not None:
+            return cache.parse(
+                cls,
+                (s, taproot, pubkey_cls),
+                lambda key: cls.parse(key[0].encode(), *key[1:]),
+            )
+        return cls.parse(s.encode(), taproot, pubkey_cls)
 
 
 class KeyHash(Key):
@@ -438,7 +452,7 @@ class KeyHash(Key):
         # TODO: should it be xonly?
         if self.taproot:
             return hashes.hash160(self.key.sec()[1:33])
-        return hashes.hash160(self.key.sec())
+        return self.key.hash160()
 
     def __len__(self):
         return 21  # <20:pkh>
@@ -453,7 +467,7 @@ class Number(DescriptorBase):
         self.num = num
 
     @classmethod
-    def read_from(cls, s, taproot=False):
+    def read_from(cls, s, taproot=False, pubkey_cls=None):
         num = 0
         char = s.read(1)
         while char in b"0123456789":
@@ -488,7 +502,7 @@ class Raw(DescriptorBase):
         self.raw = unhexlify(raw)
 
     @classmethod
-    def read_from(cls, s, taproot=False):
+    def read_from(cls, s, taproot=False, pubkey_cls=None):
         return cls(s.read(2 * cls.LEN).decode())
 
     def __str__(self):
@@ -1,5 +1,6 @@
 from io import BytesIO
-from ..base import EmbitBase
+from ..base import EmbitBase, EmbitError
+from ..misc import BufferReader
 
 
 class DescriptorBase(EmbitBase):
@@ -9,6 +10,15 @@ class DescriptorBase(EmbitBase):
     instead of ascii string.
     """
 
+    @classmethod
+    def parse(cls, s: bytes, *args, **kwargs):
+        # BufferReader finds delimiters without reading byte by byte
+        stream = BufferReader(s)
+        res = cls.read_from(stream, *args, **kwargs)
+        if len(stream.read(1)) > 0:
+            raise EmbitError("Unexpected extra bytes")
+        return res
+
     @classmethod
     def from_string(cls, s: str, *args, **kwargs):
         return cls.parse(s.encode(), *args, **kwargs)
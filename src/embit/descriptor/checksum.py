@@ -1,52 +1,92 @@
 from .errors import DescriptorError
 
+INPUT_CHARSET = (
+    "0123456789()[],'/*abcdefgh@:$%{}IJKLMNOPQRSTUVW"
+    'XYZ&+-.;<=>?!^_|~ijklmnopqrstuvwxyzABCDEFGH`#"\\ '
+)
+CHECKSUM_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+GENERATOR = [0xF5DEE51989, 0xA9FDCA3312, 0x1BAB10E32D, 0x3706B1677A, 0x644D626FFD]
+
+
+def _gen_table():
+    # xor of generator values for every combination of 5 top bits
+    table = []
+    for c0 in range(32):
+        c = 0
+        for i, g in enumerate(GENERATOR):
+            if c0 & (1 << i):
+                c ^= g
+        table.append(c)
+    return table
+
+
+_GEN_TABLE = _gen_table()
+# character -> (symbol, class)
+_CHAR_TABLE = {ch: (pos & 31, pos >> 5) for pos, ch in enumerate(INPUT_CHARSET)}
+
 
 def polymod(c: int, val: int) -> int:
-    c0 = c >> 35
-    c = ((c & 0x7FFFFFFFF) << 5) ^ val
-    if c0 & 1:
-        c ^= 0xF5DEE51989
-    if c0 & 2:
-        c ^= 0xA9FDCA3312
-    if c0 & 4:
-        c ^= 0x1BAB10E32D
-    if c0 & 8:
-        c ^= 0x3706B1677A
-    if c0 & 16:
-        c ^= 0x644D626FFD
-    return c
+    return ((c & 0x7FFFFFFFF) << 5) ^ val ^ _GEN_TABLE[c >> 35]
+
+
+class DescriptorChecksum:
+    """
+    Incremental descriptor checksum, similar to hashlib objects:
+    feed the descriptor in chunks with update(), get the result with checksum().
+    State can be saved with copy() and continued later.
+    """
+
+    def __init__(self, data: str = ""):
+        self._c = 1
+        self._cls = 0
+        self._clscount = 0
+        if data:
+            self.update(data)
+
+    def update(self, data: str):
+        c, cls, clscount = self._c, self._cls, self._clscount
+        gen = _GEN_TABLE
+        chars = _CHAR_TABLE
+        for ch in data:
+            try:
+                val, chcls = chars[ch]
+            except KeyError:
+                raise DescriptorError("Invalid character '%s' in the input string" % ch)
+            c = ((c & 0x7FFFFFFFF) << 5) ^ val ^ gen[c >> 35]
+            cls = cls * 3 + chcls
+            clscount += 1
+            if clscount == 3:
+                c = ((c & 0x7FFFFFFFF) << 5) ^ cls ^ gen[c >> 35]
+                cls = 0
+                clscount = 0
+        self._c, self._cls, self._clscount = c, cls, clscount
+        return self
+
+    def copy(self):
+        res = type(self)()
+        res._c, res._cls, res._clscount = self._c, self._cls, self._clscount
+        return res
+
+    def checksum(self) -> str:
+        """Returns checksum of the data fed so far, the state is not changed"""
+        c = self._c
+        if self._clscount > 0:
+            c = polymod(c, self._cls)
+        for j in range(8):
+            c = polymod(c, 0)
+        c ^= 1
+        return "".join([CHECKSUM_CHARSET[(c >> (5 * (7 - j))) & 31] for j in range(8)])
 
 
 def checksum(desc: str) -> str:
     """Calculate checksum of desciptor string"""
-    INPUT_CHARSET = (
-        "0123456789()[],'/*abcdefgh@:$%{}IJKLMNOPQRSTUVW"
-        'XYZ&+-.;<=>?!^_|~ijklmnopqrstuvwxyzABCDEFGH`#"\\ '
-    )
-    CHECKSUM_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
-
-    c = 1
-    cls = 0
-    clscount = 0
-    for ch in desc:
-        pos = INPUT_CHARSET.find(ch)
-        if pos == -1:
-            raise DescriptorError("Invalid character '%s' in the input string" % ch)
-        c = polymod(c, pos & 31)
-        cls = cls * 3 + (pos >> 5)
-        clscount += 1
-        if clscount == 3:
-            c = polymod(c, cls)
-            cls = 0
-            clscount = 0
-    if clscount > 0:
-        c = polymod(c, cls)
-    for j in range(0, 8):
-        c = polymod(c, 0)
-    c ^= 1
-
-    ret = [CHECKSUM_CHARSET[(c >> (5 * (7 - j))) & 31] for j in range(0, 8)]
-    return "".join(ret)
+    return DescriptorChecksum(desc).checksum()
+
+
+def checksums(descs) -> list:
+    """Calculate checksums of a list of descriptor strings"""
+    return [DescriptorChecksum(desc).checksum() for desc in descs]
 
 
 def add_checksum(desc: str) -> str:
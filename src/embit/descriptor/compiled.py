@@ -0,0 +1,243 @@
+"""
+Compiled descriptors for fast scriptPubKey generation.
+
+Descriptor.derive(idx) rebuilds the whole tree of keys and miniscripts
+and script_pubkey() compiles it again for every index.
+CompiledDescriptor compiles the script once with placeholder keys,
+remembers where the keys are and for every index only derives the keys
+and splices them into the script.
+"""
+from .. import script, hashes
+from ..hashes import tagged_hash
+from .errors import DescriptorError
+from .arguments import KeyHash
+from .miniscript import Miniscript, Sortedmulti, SortedmultiA
+from .taptree import TapLeaf
+
+
+class _SlotKey:
+    """Placeholder public key with unique sec used to find key positions in the script"""
+
+    def __init__(self, i: int):
+        self._sec = b"\x02" + hashes.sha256(b"embit key slot %d" % i)
+
+    def sec(self) -> bytes:
+        return self._sec
+
+    def hash160(self) -> bytes:
+        return hashes.hash160(self._sec)
+
+
+def _encode(arg, pub) -> bytes:
+    """Encoding of the public key as it appears in the compiled script"""
+    sec = pub.sec()
+    if arg.taproot:
+        sec = sec[1:33]
+    if isinstance(arg, KeyHash):
+        return hashes.hash160(sec)
+    return sec
+
+
+def _sorted_groups(ms):
+    """Returns lists of key arguments in sortedmulti fragments"""
+    groups = []
+    if isinstance(ms, (Sortedmulti, SortedmultiA)):
+        groups.append(list(ms.args[1:]))
+    for arg in ms.args:
+        if isinstance(arg, Miniscript):
+            groups += _sorted_groups(arg)
+    return groups
+
+
+class _KeySlot:
+    """Derives the public key of one descriptor key for any index"""
+
+    def __init__(self, key, branch_index=None):
+        self.parent = None
+        self.suffix = []
+        self.pub = None
+        der = key.allowed_derivation
+        if key.is_extended and der is not None and der.is_wildcard:
+            path = der.fill(0, branch_index=branch_index)
+            pos = der.indexes.index(None)
+            # everything before wildcard is derived only once
+            self.parent = key.key.derive(path[:pos])
+            self.suffix = path[pos + 1 :]
+        else:
+            self.pub = key.derive(0, branch_index).get_public_key()
+
+    def derive(self, idx: int):
+        if self.parent is None:
+            return self.pub
+        child = self.parent.child(idx)
+        if self.suffix:
+            child = child.derive(self.suffix)
+        return child.get_public_key()
+
+    def derive_range(self, start: int, count: int):
+        if self.parent is None:
+            return [self.pub] * count
+        res = []
+        for child in self.parent.derive_range(start, count):
+            if self.suffix:
+                child = child.derive(self.suffix)
+            res.append(child.get_public_key())
+        return res
+
+
+class _ScriptTemplate:
+    """Compiled miniscript as byte chunks with key slots"""
+
+    def __init__(self, ms, args):
+        # args are key arguments of the descriptor with keys replaced by _SlotKey
+        # key slots are indexes in args
+        compiled = ms.compile()
+        ids = [id(arg) for arg in args]
+        positions = []
+        for i, arg in enumerate(args):
+            if isinstance(arg.key, _SlotKey):
+                enc = _encode(arg, arg.key)
+                if compiled.count(enc) > 1:
+                    raise DescriptorError("Can't compile descriptor template")
+                offset = compiled.find(enc)
+                if offset >= 0:
+                    positions.append([offset, len(enc), i])
+        # keys in sortedmulti are sorted for every index,
+        # in the template slot is replaced by (group, rank)
+        self.groups = []
+        for group in _sorted_groups(ms):
+            slots = [ids.index(id(arg)) for arg in group]
+            pos = sorted([p for p in positions if p[2] in slots])
+            for rank, p in enumerate(pos):
+                p[2] = (len(self.groups), rank)
+            self.groups.append(slots)
+        self.chunks = []
+        start = 0
+        for offset, length, slot in sorted(positions):
+            self.chunks.append(compiled[start:offset])
+            self.chunks.append(slot)
+            start = offset + length
+        self.chunks.append(compiled[start:])
+
+    def fill(self, encs) -> bytes:
+        """Fills the template with encoded keys"""
+        groups = [sorted([encs[i] for i in slots]) for slots in self.groups]
+        res = []
+        for chunk in self.chunks:
+            if isinstance(chunk, bytes):
+                res.append(chunk)
+            elif isinstance(chunk, tuple):
+                res.append(groups[chunk[0]][chunk[1]])
+            else:
+                res.append(encs[chunk])
+        return b"".join(res)
+
+
+class CompiledDescriptor:
+    """
+    Descriptor compiled for one branch, generates scriptPubKeys for indexes
+    without rebuilding the descriptor.
+    """
+
+    def __init__(self, descriptor, branch_index=None):
+        self._check_descriptor(descriptor)
+        self.descriptor = descriptor
+        self.branch_index = branch_index
+        # we replace keys with placeholders in a copy of the descriptor,
+        # derive() keeps non-derivable keys so we make a copy by parsing
+        d = type(descriptor).from_string(str(descriptor))
+        d = d.derive(0, branch_index=branch_index)
+        keys = descriptor.keys
+        # raw hashes in pkh() are not keys
+        self._slots = [
+            None if isinstance(k.key, str) else _KeySlot(k, branch_index) for k in keys
+        ]
+        args = d.keys
+        for i, arg in enumerate(args):
+            if self._slots[i] is not None:
+                arg.key = _SlotKey(i)
+        self._args = args
+        self._miniscript = None
+        self._taptree = None
+        if d.miniscript is not None:
+            self._miniscript = _ScriptTemplate(d.miniscript, args)
+        if d.taproot and d.taptree:
+            self._taptree = self._compile_tree(d.taptree.tree, args)
+        self._key = None
+        if d.key is not None:
+            self._key = [id(arg) for arg in args].index(id(d.key))
+
+    def _check_descriptor(self, descriptor):
+        # blinding key is not compiled here, addresses would be unconfidential
+        if getattr(descriptor, "is_blinded", False):
+            raise DescriptorError(
+                "Blinded descriptors are not supported, use LCompiledDescriptor"
+            )
+
+    def _compile_tree(self, tree, args):
+        # subtrees without derivable keys are replaced by their hashes
+        if isinstance(tree, TapLeaf):
+            tpl = _ScriptTemplate(tree.miniscript, args)
+            if len(tpl.chunks) == 1:
+                return self._tree_hash((tree.version, tpl), None)
+            return (tree.version, tpl)
+        if not isinstance(tree, tuple):
+            tree = tree.tree
+            if isinstance(tree, TapLeaf):
+                return self._compile_tree(tree, args)
+        res = (self._compile_tree(tree[0], args), self._compile_tree(tree[1], args))
+        if isinstance(res[0], bytes) and isinstance(res[1], bytes):
+            return self._tree_hash(res, None)
+        return res
+
+    def _tree_hash(self, tree, encs) -> bytes:
+        if isinstance(tree, bytes):
+            return tree
+        if isinstance(tree[1], _ScriptTemplate):
+            version, tpl = tree
+            leaf = bytes([version]) + script.Script(tpl.fill(encs)).serialize()
+            return tagged_hash("TapLeaf", leaf)
+        left = self._tree_hash(tree[0], encs)
+        right = self._tree_hash(tree[1], encs)
+        if right < left:
+            left, right = right, left
+        return tagged_hash("TapBranch", left + right)
+
+    def _script_pubkey(self, pubs):
+        d = self.descriptor
+        encs = [
+            None if pub is None else _encode(arg, pub)
+            for arg, pub in zip(self._args, pubs)
+        ]
+        if d.taproot:
+            h = b"" if self._taptree is None else self._tree_hash(self._taptree, encs)
+            pub = pubs[self._key].taproot_tweak(h)
+            return script.Script(b"\x51\x20" + pub.xonly())
+        if self._miniscript is not None:
+            sc = script.Script(self._miniscript.fill(encs))
+            if d.wsh:
+                sc = script.p2wsh(sc)
+        elif d.wpkh:
+            sc = script.p2wpkh(pubs[self._key])
+        else:
+            return script.p2pkh(pubs[self._key])
+        if d.sh:
+            return script.p2sh(sc)
+        return sc
+
+    def script_pubkey(self, idx: int):
+        """Returns scriptPubKey for index idx"""
+        return self._script_pubkey(
+            [None if slot is None else slot.derive(idx) for slot in self._slots]
+        )
+
+    def address(self, idx: int, *args, **kwargs) -> str:
+        return self.script_pubkey(idx).address(*args, **kwargs)
+
+    def script_pubkeys(self, start: int, count: int) -> list:
+        """Returns scriptPubKeys for indexes in range [start, start+count)"""
+        columns = [
+            [None] * count if slot is None else slot.derive_range(start, count)
+            for slot in self._slots
+        ]
+        return [self._script_pubkey(pubs) for pubs in zip(*columns)]
@@ -1,7 +1,8 @@
-from io import BytesIO
 from .. import script
+from ..misc import BufferReader, get_parse_cache
 from ..networks import NETWORKS
 from .errors import DescriptorError
+from .checksum import checksum
 from .base import DescriptorBase
 from .miniscript import Miniscript, Multi, Sortedmulti
 from .arguments import Key
@@ -283,16 +284,36 @@ class Descriptor(DescriptorBase):
         return self.miniscript.keys
 
     @classmethod
-    def from_string(cls, desc):
-        s = BytesIO(desc.encode())
-        res = cls.read_from(s)
+    def from_string(cls, desc, pubkey_cls=None):
+        """
+        Parses descriptor from string.
+        pubkey_cls is used for bare public keys (ec.PublicKey by default),
+        pass ec.LazyPublicKey to postpone their parsing.
+        """
+        cache = get_parse_cache()
+        if cache is None:
+            return cls._from_string(desc, pubkey_cls)
+        # valid checksum is not a part of the cache key
+        if "#" in desc:
+            body, chk = desc.split("#", 1)
+            try:
+                if checksum(body) == chk:
+                    desc = body
+            except DescriptorError:
+                pass
+        return cache.parse(cls, (desc, pubkey_cls), lambda key: cls._from_string(*key))
+
+    @classmethod
+    def _from_string(cls, desc, pubkey_cls=None):
+        s = BufferReader(desc)
+        res = cls.read_from(s, pubkey_cls)
         left = s.read()
         if len(left) > 0 and not left.startswith(b"#"):
             raise DescriptorError("Unexpected characters after descriptor: %r" % left)
         return res
 
     @classmethod
-    def read_from(cls, s):
+    def read_from(cls, s, pubkey_cls=None):
         # starts with sh(wsh()), sh() or wsh()
         start = s.read(7)
         sh = False
@@ -332,7 +353,7 @@ class Descriptor(DescriptorBase):
         # taproot always has a key, and may have taptree miniscript
         if taproot:
             miniscript = None
-            key = Key.read_from(s, taproot=True)
+            key = Key.read_from(s, taproot=True, pubkey_cls=pubkey_cls)
             nbrackets = 1
             c = s.read(1)
             # TODO: should it be ok to pass just taptree without a key?
@@ -340,15 +361,15 @@ class Descriptor(DescriptorBase):
             if c != b",":
                 s.seek(-1, 1)
             else:
-                taptree = TapTree.read_from(s)
+                taptree = TapTree.read_from(s, pubkey_cls)
         elif is_miniscript:
-            miniscript = Miniscript.read_from(s)
+            miniscript = Miniscript.read_from(s, pubkey_cls=pubkey_cls)
             key = None
             nbrackets = int(sh) + int(wsh)
         # single key for sure
         else:
             miniscript = None
-            key = Key.read_from(s, taproot=taproot)
+            key = Key.read_from(s, taproot=taproot, pubkey_cls=pubkey_cls)
             nbrackets = 1 + int(sh)
         end = s.read(nbrackets)
         if end != b")" * nbrackets:
@@ -382,3 +403,17 @@ class Descriptor(DescriptorBase):
         if self.sh:
             res = "sh(%s)" % res
         return res
+
+    def __reduce__(self):
+        # pickle as a string instead of a tree of keys and miniscripts
+        return type(self).from_string, (self.to_string(),)
+
+    def __deepcopy__(self, memo):
+        # copy the tree, not the string from __reduce__
+        from copy import deepcopy
+
+        res = type(self).__new__(type(self))
+        memo[id(self)] = res
+        for k, v in self.__dict__.items():
+            setattr(res, k, deepcopy(v, memo))
+        return res
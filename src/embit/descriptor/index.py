@@ -0,0 +1,69 @@
+"""
+Reverse index from scriptPubKey to derivation index of the descriptor.
+"""
+from .compiled import CompiledDescriptor
+
+
+class DescriptorIndex:
+    """
+    Keeps scriptPubKeys of all branches of the descriptor up to `gap` indexes
+    ahead of the last used one in a dict, so checking if a script belongs
+    to the descriptor is a single lookup.
+    Index extends itself when a script close to the edge is found.
+    """
+
+    def __init__(self, descriptor, gap: int = 20):
+        self.descriptor = descriptor
+        self.gap = gap
+        # descriptors without wildcard have only one script per branch
+        self.is_wildcard = descriptor.is_wildcard
+        self._compiled = [
+            CompiledDescriptor(descriptor, branch_index)
+            for branch_index in range(descriptor.num_branches)
+        ]
+        # number of derived scripts per branch
+        self._derived = [0] * len(self._compiled)
+        self._index = {}
+        for branch_index in range(len(self._compiled)):
+            self.extend(branch_index, gap if self.is_wildcard else 1)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, script_pubkey):
+        return self.lookup(script_pubkey) is not None
+
+    def extend(self, branch_index: int, count: int):
+        """Derives `count` more scripts for the branch"""
+        if not self.is_wildcard and self._derived[branch_index] > 0:
+            return
+        start = self._derived[branch_index]
+        scripts = self._compiled[branch_index].script_pubkeys(start, count)
+        for i, sc in enumerate(scripts):
+            # first match wins, like in Descriptor.check_derivation
+            self._index.setdefault(sc.data, (start + i, branch_index))
+        self._derived[branch_index] = start + count
+
+    def lookup(self, script_pubkey):
+        """
+        Returns a tuple (idx, branch_index) if script_pubkey
+        belongs to the descriptor, None otherwise.
+        script_pubkey can be a Script or raw bytes.
+        """
+        data = getattr(script_pubkey, "data", script_pubkey)
+        res = self._index.get(data)
+        if res is not None and self.is_wildcard:
+            idx, branch_index = res
+            missing = idx + 1 + self.gap - self._derived[branch_index]
+            if missing > 0:
+                self.extend(branch_index, missing)
+        return res
+
+    def owns(self, psbt_scope) -> bool:
+        """
+        Checks if psbt input or output belongs to the descriptor.
+        Unlike Descriptor.owns() works without bip32 derivations in the scope.
+        """
+        if psbt_scope.script_pubkey is None:
+            return False
+        return self.lookup(psbt_scope.script_pubkey) is not None
@@ -5,17 +5,41 @@ from .arguments import Key, KeyHash, Number, Raw32, Raw20
 
 
 class Miniscript(DescriptorBase):
+    # Nodes are treated as immutable, so compiled script, length, type
+    # and properties are computed once and cached in the node.
+    # Compiled script and length depend on key encoding,
+    # TapTree resets them with _reset_compiled() when it makes keys taproot.
+    # derive(), to_public() and branch() reuse subtrees without keys
+    # and only rebuild nodes with keys.
+    _compiled = None
+    _len = None
+    _type = None
+    _properties = None
+    # set by the parent node when the subtree is verified
+    _verified = False
+
     def __init__(self, *args, **kwargs):
         self.args = args
         self.taproot = kwargs.get("taproot", False)
 
     def compile(self):
-        return self.inner_compile()
+        if self._compiled is None:
+            self._compiled = self.inner_compile()
+        return self._compiled
+
+    def _reset_compiled(self):
+        """Drops compiled script and length cached in the subtree"""
+        self._compiled = None
+        self._len = None
+        for arg in self.args:
+            if isinstance(arg, Miniscript):
+                arg._reset_compiled()
 
     def verify(self):
         for arg in self.args:
-            if isinstance(arg, Miniscript):
+            if isinstance(arg, Miniscript) and not arg._verified:
                 arg.verify()
+                arg._verified = True
 
     @property
     def keys(self):
@@ -24,36 +48,57 @@ class Miniscript(DescriptorBase):
             [k for k in self.args if isinstance(k, Key) or isinstance(k, KeyHash)],
         )
 
+    def _replace_args(self, args):
+        """Returns a node with the same structure and new arguments"""
+        if all([new is old for new, old in zip(args, self.args)]):
+            return self
+        res = type(self)(*args, taproot=self.taproot)
+        # type, properties and validity don't depend on keys
+        res._type = self._type
+        res._properties = self._properties
+        res._verified = self._verified
+        return res
+
     def derive(self, idx, branch_index=None):
         args = [
             arg.derive(idx, branch_index) if hasattr(arg, "derive") else arg
             for arg in self.args
         ]
-        return type(self)(*args, taproot=self.taproot)
+        return self._replace_args(args)
 
     def to_public(self):
         args = [
             arg.to_public() if hasattr(arg, "to_public") else arg for arg in self.args
         ]
-        return type(self)(*args, taproot=self.taproot)
+        return self._replace_args(args)
 
     def branch(self, branch_index):
         args = [
             arg.branch(branch_index) if hasattr(arg, "branch") else arg
             for arg in self.args
         ]
-        return type(self)(*args, taproot=self.taproot)
+        return self._replace_args(args)
 
     @property
     def properties(self):
+        if self._properties is None:
+            self._properties = self.inner_properties()
+        return self._properties
+
+    def inner_properties(self):
         return self.PROPS
 
     @property
     def type(self):
+        if self._type is None:
+            self._type = self.inner_type()
+        return self._type
+
+    def inner_type(self):
         return self.TYPE
 
     @classmethod
-    def read_from(cls, s, taproot=False):
+    def read_from(cls, s, taproot=False, pubkey_cls=None):
         op, char = read_until(s, b"(")
         op = op.decode()
         wrappers = ""
@@ -65,7 +110,7 @@ class Miniscript(DescriptorBase):
             raise MiniscriptError("Unknown operator '%s'" % op)
         # number of arguments, classes of args, compile fn, type, validity checker
         MiniscriptCls = OPERATORS[OPERATOR_NAMES.index(op)]
-        args = MiniscriptCls.read_arguments(s, taproot=taproot)
+        args = MiniscriptCls.read_arguments(s, taproot=taproot, pubkey_cls=pubkey_cls)
         miniscript = MiniscriptCls(*args, taproot=taproot)
         for w in reversed(wrappers):
             if w not in WRAPPER_NAMES:
@@ -75,18 +120,20 @@ class Miniscript(DescriptorBase):
         return miniscript
 
     @classmethod
-    def read_arguments(cls, s, taproot=False):
+    def read_arguments(cls, s, taproot=False, pubkey_cls=None):
         args = []
         if cls.NARGS is None:
             if type(cls.ARGCLS) == tuple:
                 firstcls, nextcls = cls.ARGCLS
             else:
                 firstcls, nextcls = cls.ARGCLS, cls.ARGCLS
-            args.append(firstcls.read_from(s, taproot=taproot))
+            args.append(firstcls.read_from(s, taproot=taproot, pubkey_cls=pubkey_cls))
             while True:
                 char = s.read(1)
                 if char == b",":
-                    args.append(nextcls.read_from(s, taproot=taproot))
+                    args.append(
+                        nextcls.read_from(s, taproot=taproot, pubkey_cls=pubkey_cls)
+                    )
                 elif char == b")":
                     break
                 else:
@@ -95,7 +142,9 @@ class Miniscript(DescriptorBase):
                     )
         else:
             for i in range(cls.NARGS):
-                args.append(cls.ARGCLS.read_from(s, taproot=taproot))
+                args.append(
+                    cls.ARGCLS.read_from(s, taproot=taproot, pubkey_cls=pubkey_cls)
+                )
                 if i < cls.NARGS - 1:
                     char = s.read(1)
                     if char != b",":
@@ -109,6 +158,11 @@ class Miniscript(DescriptorBase):
         return type(self).NAME + "(" + ",".join([str(arg) for arg in self.args]) + ")"
 
     def __len__(self):
+        if self._len is None:
+            self._len = self.inner_len()
+        return self._len
+
+    def inner_len(self):
         """Length of the compiled script, override this if you know the length"""
         return len(self.compile())
 
@@ -142,7 +196,7 @@ class PkK(OneArg):
     def inner_compile(self):
         return self.carg
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args()
 
 
@@ -156,7 +210,7 @@ class PkH(OneArg):
     def inner_compile(self):
         return b"\x76\xa9" + self.carg + b"\x88"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 3
 
 
@@ -177,7 +231,7 @@ class Older(OneArg):
                 "%s should have an argument in range [1, 0x80000000)" % self.NAME
             )
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 1
 
 
@@ -199,7 +253,7 @@ class Sha256(OneArg):
     def inner_compile(self):
         return b"\x82" + Number(32).compile() + b"\x88\xa8" + self.carg + b"\x87"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 6
 
 
@@ -234,8 +288,7 @@ class AndOr(Miniscript):
     NARGS = 3
     ARGCLS = Miniscript
 
-    @property
-    def type(self):
+    def inner_type(self):
         # same as Y/Z
         return self.args[1].type
 
@@ -252,8 +305,7 @@ class AndOr(Miniscript):
         if self.args[1].type not in "BKV":
             raise MiniscriptError("andor: Y and Z should be B K or V")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # props: z=zXzYzZ; o=zXoYoZ or oXzYzZ; u=uYuZ; d=dZ
         props = ""
         px, py, pz = [arg.properties for arg in self.args]
@@ -279,7 +331,7 @@ class AndOr(Miniscript):
             + b"\x68"
         )
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 3
 
 
@@ -292,7 +344,7 @@ class AndV(Miniscript):
     def inner_compile(self):
         return self.args[0].compile() + self.args[1].compile()
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args()
 
     def verify(self):
@@ -303,13 +355,11 @@ class AndV(Miniscript):
         if self.args[1].type not in "BKV":
             raise MiniscriptError("and_v: Y should be B K or V")
 
-    @property
-    def type(self):
+    def inner_type(self):
         # same as Y
         return self.args[1].type
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # z=zXzY; o=zXoY or zYoX; n=nX or zXnY; u=uY
         px, py = [arg.properties for arg in self.args]
         props = ""
@@ -334,7 +384,7 @@ class AndB(Miniscript):
     def inner_compile(self):
         return self.args[0].compile() + self.args[1].compile() + b"\x9a"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 1
 
     def verify(self):
@@ -345,8 +395,7 @@ class AndB(Miniscript):
         if self.args[1].type != "W":
             raise MiniscriptError("and_b: Y should be W")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # z=zXzY; o=zXoY or zYoX; n=nX or zXnY; d=dXdY; u
         px, py = [arg.properties for arg in self.args]
         props = ""
@@ -379,11 +428,10 @@ class AndN(Miniscript):
             + b"\x68"
         )
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 4
 
-    @property
-    def type(self):
+    def inner_type(self):
         # same as Y/Z
         return self.args[1].type
 
@@ -398,8 +446,7 @@ class AndN(Miniscript):
         if self.args[1].type != "B":
             raise MiniscriptError("and_n: Y should be B")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # props: z=zXzYzZ; o=zXoYoZ or oXzYzZ; u=uYuZ; d=dZ
         props = ""
         px, py = [arg.properties for arg in self.args]
@@ -427,7 +474,7 @@ class OrB(Miniscript):
     def inner_compile(self):
         return self.args[0].compile() + self.args[1].compile() + b"\x9b"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 1
 
     def verify(self):
@@ -442,8 +489,7 @@ class OrB(Miniscript):
         if "d" not in self.args[1].properties:
             raise MiniscriptError("or_b: Z should be d")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # z=zXzZ; o=zXoZ or zZoX; d; u
         props = ""
         px, pz = [arg.properties for arg in self.args]
@@ -465,7 +511,7 @@ class OrC(Miniscript):
     def inner_compile(self):
         return self.args[0].compile() + b"\x64" + self.args[1].compile() + b"\x68"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 2
 
     def verify(self):
@@ -479,8 +525,7 @@ class OrC(Miniscript):
         if "d" not in px or "u" not in px:
             raise MiniscriptError("or_c: X should be du")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # z=zXzZ; o=oXzZ
         props = ""
         px, pz = [arg.properties for arg in self.args]
@@ -501,7 +546,7 @@ class OrD(Miniscript):
     def inner_compile(self):
         return self.args[0].compile() + b"\x73\x64" + self.args[1].compile() + b"\x68"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 3
 
     def verify(self):
@@ -515,8 +560,7 @@ class OrD(Miniscript):
         if "d" not in px or "u" not in px:
             raise MiniscriptError("or_d: X should be du")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # z=zXzZ; o=oXzZ; d=dZ; u=uZ
         props = ""
         px, pz = [arg.properties for arg in self.args]
@@ -546,7 +590,7 @@ class OrI(Miniscript):
             + b"\x68"
         )
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 3
 
     def verify(self):
@@ -557,12 +601,10 @@ class OrI(Miniscript):
         if self.args[0].type not in "BKV":
             raise MiniscriptError("or_i: X and Z should be B K or V")
 
-    @property
-    def type(self):
+    def inner_type(self):
         return self.args[0].type
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # o=zXzZ; u=uXuZ; d=dX or dZ
         props = ""
         px, pz = [arg.properties for arg in self.args]
@@ -590,7 +632,7 @@ class Thresh(Miniscript):
             + b"\x87"
         )
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + len(self.args) - 1
 
     def verify(self):
@@ -613,8 +655,7 @@ class Thresh(Miniscript):
             if "d" not in p or "u" not in p:
                 raise MiniscriptError("thresh: X%d should be du" % (i + 1))
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # z=all are z; o=all are z except one is o; d; u
         props = ""
         parr = [arg.properties for arg in self.args[1:]]
@@ -651,7 +692,7 @@ class Multi(Miniscript):
             + b"\xae"
         )
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 2
 
     def verify(self):
@@ -689,7 +730,7 @@ class MultiA(Multi):
             + b"\x9c"
         )
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + len(self.args)
 
 
@@ -718,7 +759,7 @@ class Pk(OneArg):
     def inner_compile(self):
         return self.carg + b"\xac"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 1
 
 
@@ -732,7 +773,7 @@ class Pkh(OneArg):
     def inner_compile(self):
         return b"\x76\xa9" + self.carg + b"\x88\xac"
 
-    def __len__(self):
+    def inner_len(self):
         return self.len_args() + 4
 
     # TODO: 0, 1 - they are without brackets, so it should be different...
@@ -788,7 +829,7 @@ class A(Wrapper):
     def inner_compile(self):
         return b"\x6b" + self.carg + b"\x6c"
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 2
 
     def verify(self):
@@ -796,8 +837,7 @@ class A(Wrapper):
         if self.arg.type != "B":
             raise MiniscriptError("a: X should be B")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         props = ""
         px = self.arg.properties
         if "d" in px:
@@ -814,7 +854,7 @@ class S(Wrapper):
     def inner_compile(self):
         return b"\x7c" + self.carg
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 1
 
     def verify(self):
@@ -824,8 +864,7 @@ class S(Wrapper):
         if "o" not in self.arg.properties:
             raise MiniscriptError("s: X should be o")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         props = ""
         px = self.arg.properties
         if "d" in px:
@@ -842,7 +881,7 @@ class C(Wrapper):
     def inner_compile(self):
         return self.carg + b"\xac"
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 1
 
     def verify(self):
@@ -850,8 +889,7 @@ class C(Wrapper):
         if self.arg.type != "K":
             raise MiniscriptError("c: X should be K")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         props = ""
         px = self.arg.properties
         for p in ["o", "n", "d"]:
@@ -868,11 +906,10 @@ class T(Wrapper):
     def inner_compile(self):
         return self.carg + Number(1).compile()
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 1
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # z=zXzY; o=zXoY or zYoX; n=nX or zXnY; u=uY
         px = self.arg.properties
         py = "zu"
@@ -895,7 +932,7 @@ class D(Wrapper):
     def inner_compile(self):
         return b"\x76\x63" + self.carg + b"\x68"
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 3
 
     def verify(self):
@@ -905,8 +942,7 @@ class D(Wrapper):
         if "z" not in self.arg.properties:
             raise MiniscriptError("d: X should be z")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # https://github.com/bitcoin/bitcoin/pull/24906
         if self.taproot:
             props = "ndu"
@@ -933,8 +969,7 @@ class V(Wrapper):
         if self.arg.type != "B":
             raise MiniscriptError("v: X should be B")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         props = ""
         px = self.arg.properties
         for p in ["z", "o", "n"]:
@@ -957,8 +992,7 @@ class J(Wrapper):
         if "n" not in self.arg.properties:
             raise MiniscriptError("j: X should be n")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         props = "nd"
         px = self.arg.properties
         for p in ["o", "u"]:
@@ -974,7 +1008,7 @@ class N(Wrapper):
     def inner_compile(self):
         return self.carg + b"\x92"
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 1
 
     def verify(self):
@@ -982,8 +1016,7 @@ class N(Wrapper):
         if self.arg.type != "B":
             raise MiniscriptError("n: X should be B")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         props = "u"
         px = self.arg.properties
         for p in ["z", "o", "n", "d"]:
@@ -999,7 +1032,7 @@ class L(Wrapper):
     def inner_compile(self):
         return b"\x63" + Number(0).compile() + b"\x67" + self.carg + b"\x68"
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 4
 
     def verify(self):
@@ -1008,8 +1041,7 @@ class L(Wrapper):
         if self.arg.type != "B":
             raise MiniscriptError("or_i: X and Z should be the same type")
 
-    @property
-    def properties(self):
+    def inner_properties(self):
         # o=zXzZ; u=uXuZ; d=dX or dZ
         props = "d"
         pz = self.arg.properties
@@ -1025,7 +1057,7 @@ class U(L):
     def inner_compile(self):
         return b"\x63" + self.carg + b"\x67" + Number(0).compile() + b"\x68"
 
-    def __len__(self):
+    def inner_len(self):
         return len(self.arg) + 4
 
 
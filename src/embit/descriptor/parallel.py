@@ -0,0 +1,83 @@
+"""
+Parallel derivation of scriptPubKeys and addresses for descriptors.
+Derivation is CPU-bound, so work is split between processes, not threads.
+Descriptors are sent to workers as strings, parsed and compiled once per process.
+Not available on MicroPython.
+"""
+from ..networks import NETWORKS
+from .descriptor import Descriptor
+from .compiled import CompiledDescriptor
+
+# compiled descriptors in worker process: (class, string, branch) -> CompiledDescriptor
+_worker_descriptors = {}
+
+
+def _get_compiled(cls, desc: str, branch_index):
+    key = (cls, desc, branch_index)
+    if key not in _worker_descriptors:
+        d = cls.from_string(desc)
+        _worker_descriptors[key] = CompiledDescriptor(d, branch_index)
+    return _worker_descriptors[key]
+
+
+def _derive_chunk(cls, desc: str, indexes: range, branch_index, network):
+    """Worker function: derives scriptPubKeys and addresses for a range of indexes"""
+    c = _get_compiled(cls, desc, branch_index)
+    if indexes.step == 1:
+        scripts = c.script_pubkeys(indexes.start, len(indexes))
+    else:
+        scripts = [c.script_pubkey(idx) for idx in indexes]
+    return [(sc, sc.address(network)) for sc in scripts]
+
+
+def derive_script_pubkeys(
+    desc,
+    indexes,
+    workers=None,
+    branch_index=None,
+    network=NETWORKS["main"],
+    chunk_size=None,
+):
+    """
+    Derives scriptPubKeys and addresses of the descriptor for all indexes.
+    `desc` - Descriptor or descriptor string.
+    `indexes` - range of indexes to derive, i.e. range(0, 1000).
+    `workers` - number of processes, by default number of CPUs.
+                If workers=1 derivation happens in the current process.
+    `chunk_size` - number of indexes sent to a worker at once,
+                   by default the range is split in 4 chunks per worker.
+    Returns a list of (scriptPubKey, address) tuples in the order of indexes.
+    """
+    if isinstance(desc, str):
+        desc = Descriptor.from_string(desc)
+    if not isinstance(indexes, range):
+        raise ValueError("Indexes should be a range")
+    # we only need public keys, no need to send private keys to other processes
+    if any(k.is_private for k in desc.keys):
+        desc = desc.to_public()
+    cls = type(desc)
+    s = desc.to_string()
+    if workers == 1 or len(indexes) == 0:
+        return _derive_chunk(cls, s, indexes, branch_index, network)
+
+    from concurrent.futures import ProcessPoolExecutor
+    import os
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(indexes) // (workers * 4)))
+    chunks = [indexes[i : i + chunk_size] for i in range(0, len(indexes), chunk_size)]
+    workers = min(workers, len(chunks))
+    res = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(
+            _derive_chunk,
+            [cls] * len(chunks),
+            [s] * len(chunks),
+            chunks,
+            [branch_index] * len(chunks),
+            [network] * len(chunks),
+        ):
+            res += part
+    return res
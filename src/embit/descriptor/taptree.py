@@ -9,13 +9,14 @@ class TapLeaf(DescriptorBase):
     def __init__(self, miniscript=None, version=0xC0):
         self.miniscript = miniscript
         self.version = version
+        self._hash = None
 
     def __str__(self):
         return str(self.miniscript)
 
     @classmethod
-    def read_from(cls, s):
-        ms = Miniscript.read_from(s, taproot=True)
+    def read_from(cls, s, pubkey_cls=None):
+        ms = Miniscript.read_from(s, taproot=True, pubkey_cls=pubkey_cls)
         return cls(ms)
 
     def serialize(self):
@@ -23,43 +24,50 @@ class TapLeaf(DescriptorBase):
             return b""
         return bytes([self.version]) + Script(self.miniscript.compile()).serialize()
 
+    def leaf_hash(self) -> bytes:
+        if self._hash is None:
+            self._hash = tagged_hash("TapLeaf", self.serialize())
+        return self._hash
+
     @property
     def keys(self):
         return self.miniscript.keys
 
+    def _replace_miniscript(self, miniscript):
+        # leafs without changed keys are reused with their cached hashes
+        if miniscript is self.miniscript:
+            return self
+        return type(self)(miniscript, self.version)
+
     def derive(self, *args, **kwargs):
         if self.miniscript is None:
             return type(self)(None, version=self.version)
-        return type(self)(
-            self.miniscript.derive(*args, **kwargs),
-            self.version,
-        )
+        return self._replace_miniscript(self.miniscript.derive(*args, **kwargs))
 
     def branch(self, *args, **kwargs):
         if self.miniscript is None:
             return type(self)(None, version=self.version)
-        return type(self)(
-            self.miniscript.branch(*args, **kwargs),
-            self.version,
-        )
+        return self._replace_miniscript(self.miniscript.branch(*args, **kwargs))
 
     def to_public(self, *args, **kwargs):
         if self.miniscript is None:
             return type(self)(None, version=self.version)
-        return type(self)(
-            self.miniscript.to_public(*args, **kwargs),
-            self.version,
-        )
+        return self._replace_miniscript(self.miniscript.to_public(*args, **kwargs))
 
 
 def _tweak_helper(tree):
+    """
+    Returns a tuple ([(leaf, merkle path)], merkle root) of the tree.
+    Result is cached in TapTree nodes.
+    """
     # https://github.com/bitcoin/bips/blob/master/bip-0341.mediawiki#constructing-and-spending-taproot-outputs
     if isinstance(tree, TapTree):
-        tree = tree.tree
+        if tree._merkle is None:
+            tree._merkle = _tweak_helper(tree.tree)
+        return tree._merkle
     if isinstance(tree, TapLeaf):
         # one leaf on this branch
-        h = tagged_hash("TapLeaf", tree.serialize())
-        return ([(tree, b"")], h)
+        return ([(tree, b"")], tree.leaf_hash())
     left, left_h = _tweak_helper(tree[0])
     right, right_h = _tweak_helper(tree[1])
     ret = [(leaf, c + right_h) for leaf, c in left] + [
@@ -74,9 +82,22 @@ class TapTree(DescriptorBase):
     def __init__(self, tree=None):
         """tree can be None, TapLeaf or a tuple (taptree, taptree)"""
         self.tree = tree
-        # make sure all keys are taproot
-        for k in self.keys:
-            k.taproot = True
+        # cached result of _tweak_helper
+        self._merkle = None
+        # make sure all keys are taproot,
+        # subtrees already did it for their keys in their constructors
+        leafs = [tree] if isinstance(tree, TapLeaf) else (tree or [])
+        for leaf in leafs:
+            if isinstance(leaf, TapLeaf):
+                changed = False
+                for k in leaf.keys:
+                    if not k.taproot:
+                        k.taproot = True
+                        changed = True
+                # key encoding changed, drop memo compiled with old keys
+                if changed:
+                    leaf.miniscript._reset_compiled()
+                    leaf._hash = None
 
     def __bool__(self):
         return bool(self.tree)
@@ -84,9 +105,33 @@ class TapTree(DescriptorBase):
     def tweak(self):
         if self.tree is None:
             return b""
-        _, h = _tweak_helper(self.tree)
+        _, h = _tweak_helper(self)
         return h
 
+    def merkle_paths(self):
+        """Returns a list of tuples (leaf, merkle path) for all leafs of the tree"""
+        if self.tree is None:
+            return []
+        leafs, _ = _tweak_helper(self)
+        return leafs
+
+    def control_blocks(self, internal_key):
+        """
+        Returns a list of tuples (leaf, control block) for all leafs of the tree.
+        internal_key is the untweaked key, i.e. PublicKey or descriptor Key.
+        """
+        if self.tree is None:
+            return []
+        if hasattr(internal_key, "get_public_key"):
+            internal_key = internal_key.get_public_key()
+        leafs, h = _tweak_helper(self)
+        # parity of the output key
+        parity = internal_key._taproot_tweak_sec(h)[0] & 1
+        x = internal_key.xonly()
+        return [
+            (leaf, bytes([leaf.version | parity]) + x + path) for leaf, path in leafs
+        ]
+
     @property
     def keys(self):
         if self.tree is None:
@@ -97,48 +142,61 @@ class TapTree(DescriptorBase):
         return left.keys + right.keys
 
     @classmethod
-    def read_from(cls, s):
+    def read_from(cls, s, pubkey_cls=None):
         c = s.read(1)
         if len(c) == 0:
             return cls()
         if c == b"{":  # more than one miniscript
-            left = cls.read_from(s)
+            left = cls.read_from(s, pubkey_cls)
             c = s.read(1)
             if c == b"}":
                 return left
             if c != b",":
                 raise MiniscriptError("Invalid taptree syntax: expected ','")
-            right = cls.read_from(s)
+            right = cls.read_from(s, pubkey_cls)
             if s.read(1) != b"}":
                 raise MiniscriptError("Invalid taptree syntax: expected '}'")
             return cls((left, right))
         s.seek(-1, 1)
-        ms = TapLeaf.read_from(s)
+        ms = TapLeaf.read_from(s, pubkey_cls)
         return cls(ms)
 
+    def _replace_tree(self, tree):
+        # subtrees without changed keys are reused with their cached hashes
+        if isinstance(tree, TapLeaf):
+            if tree is self.tree:
+                return self
+        elif tree[0] is self.tree[0] and tree[1] is self.tree[1]:
+            return self
+        return type(self)(tree)
+
     def derive(self, *args, **kwargs):
         if self.tree is None:
             return type(self)(None)
         if isinstance(self.tree, TapLeaf):
-            return type(self)(self.tree.derive(*args, **kwargs))
+            return self._replace_tree(self.tree.derive(*args, **kwargs))
         left, right = self.tree
-        return type(self)((left.derive(*args, **kwargs), right.derive(*args, **kwargs)))
+        return self._replace_tree(
+            (left.derive(*args, **kwargs), right.derive(*args, **kwargs))
+        )
 
     def branch(self, *args, **kwargs):
         if self.tree is None:
             return type(self)(None)
         if isinstance(self.tree, TapLeaf):
-            return type(self)(self.tree.branch(*args, **kwargs))
+            return self._replace_tree(self.tree.branch(*args, **kwargs))
         left, right = self.tree
-        return type(self)((left.branch(*args, **kwargs), right.branch(*args, **kwargs)))
+        return self._replace_tree(
+            (left.branch(*args, **kwargs), right.branch(*args, **kwargs))
+        )
 
     def to_public(self, *args, **kwargs):
         if self.tree is None:
             return type(self)(None)
         if isinstance(self.tree, TapLeaf):
-            return type(self)(self.tree.to_public(*args, **kwargs))
+            return self._replace_tree(self.tree.to_public(*args, **kwargs))
         left, right = self.tree
-        return type(self)(
+        return self._replace_tree(
             (left.to_public(*args, **kwargs), right.to_public(*args, **kwargs))
         )
 
@@ -38,12 +38,32 @@ class SchnorrSig(EmbitBase):
 
 
 class PublicKey(EmbitKey):
+    # serializations are cached as keys are used as dict keys and sorted a lot
+    __slots__ = ("_point", "_compressed", "_sec", "_xonly_sec", "_hash160")
+
     def __init__(self, point: bytes, compressed: bool = True):
         self._point = point
-        self.compressed = compressed
+        self._compressed = compressed
+        self._clear_cache()
 
-    @classmethod
-    def read_from(cls, stream):
+    def _clear_cache(self):
+        self._sec = None
+        self._xonly_sec = None
+        self._hash160 = None
+
+    @property
+    def compressed(self) -> bool:
+        return self._compressed
+
+    @compressed.setter
+    def compressed(self, compressed: bool):
+        if compressed != self._compressed:
+            self._clear_cache()
+        self._compressed = compressed
+
+    @staticmethod
+    def _read_sec(stream) -> bytes:
+        """Reads sec-encoded public key from the stream without parsing it"""
         b = stream.read(1)
         if b not in [b"\x02", b"\x03", b"\x04"]:
             raise ECError("Invalid public key")
@@ -51,6 +71,11 @@ class PublicKey(EmbitKey):
             b += stream.read(64)
         else:
             b += stream.read(32)
+        return b
+
+    @classmethod
+    def read_from(cls, stream):
+        b = cls._read_sec(stream)
         try:
             point = secp256k1.ec_pubkey_parse(b)
         except Exception as e:
@@ -60,22 +85,39 @@ class PublicKey(EmbitKey):
 
     def sec(self) -> bytes:
         """Sec representation of the key"""
-        flag = secp256k1.EC_COMPRESSED if self.compressed else secp256k1.EC_UNCOMPRESSED
-        return secp256k1.ec_pubkey_serialize(self._point, flag)
+        if self._sec is None:
+            flag = (
+                secp256k1.EC_COMPRESSED
+                if self._compressed
+                else secp256k1.EC_UNCOMPRESSED
+            )
+            self._sec = secp256k1.ec_pubkey_serialize(self._point, flag)
+        return self._sec
 
     def xonly(self) -> bytes:
-        return self.sec()[1:33]
+        if self._xonly_sec is None:
+            self._xonly_sec = self.sec()[1:33]
+        return self._xonly_sec
+
+    def hash160(self) -> bytes:
+        """hash160 of the sec representation of the key"""
+        if self._hash160 is None:
+            self._hash160 = hashes.hash160(self.sec())
+        return self._hash160
 
     def taproot_tweak(self, h=b""):
         """Returns a tweaked public key"""
+        return PublicKey.from_xonly(self._taproot_tweak_sec(h)[1:33])
+
+    def _taproot_tweak_sec(self, h=b"") -> bytes:
+        """Returns sec of the tweaked key, first byte defines parity of the key"""
         x = self.xonly()
         tweak = hashes.tagged_hash("TapTweak", x + h)
         if not secp256k1.ec_seckey_verify(tweak):
             raise EmbitError("Tweak is too large")
         point = secp256k1.ec_pubkey_parse(b"\x02" + x)
         pub = secp256k1.ec_pubkey_add(point, tweak)
-        sec = secp256k1.ec_pubkey_serialize(pub)
-        return PublicKey.from_xonly(sec[1:33])
+        return secp256k1.ec_pubkey_serialize(pub)
 
     def write_to(self, stream) -> int:
         return stream.write(self.sec())
@@ -122,7 +164,61 @@ class PublicKey(EmbitKey):
         return self.sec() == other.sec()
 
     def __hash__(self):
-        return hash(self._point)
+        return hash(self.sec())
+
+    def __reduce__(self):
+        # pickle as sec instead of internal point structure
+        return type(self).parse, (self.sec(),)
+
+    def __deepcopy__(self, memo):
+        # point is never modified in place, so the copy reuses it without parsing
+        return type(self)(self._point, self._compressed)
+
+
+class LazyPublicKey(PublicKey):
+    """
+    Public key that keeps raw sec encoding and parses the point
+    only when it is actually needed (verification, tweaks, child derivation).
+    Serialization, hashing and comparison don't touch the point,
+    so invalid points are detected only on first use of the point.
+    """
+
+    __slots__ = ("_raw", "_parsed")
+
+    def __init__(self, sec: bytes):
+        self._raw = sec
+        self._parsed = None
+        self._compressed = sec[0] != 0x04
+        self._clear_cache()
+
+    def sec(self) -> bytes:
+        # raw encoding can be reused if compression flag didn't change
+        if self._sec is None and self._compressed == (self._raw[0] != 0x04):
+            self._sec = self._raw
+        return super().sec()
+
+    @property
+    def _point(self):
+        if self._parsed is None:
+            try:
+                self._parsed = secp256k1.ec_pubkey_parse(self._raw)
+            except Exception as e:
+                raise ECError(str(e))
+        return self._parsed
+
+    @classmethod
+    def read_from(cls, stream):
+        b = cls._read_sec(stream)
+        if len(b) != (65 if b[0] == 0x04 else 33):
+            raise ECError("Invalid public key")
+        return cls(b)
+
+    def __deepcopy__(self, memo):
+        # copy stays lazy, parsed point is reused if we have it
+        res = type(self)(self._raw)
+        res._parsed = self._parsed
+        res.compressed = self._compressed
+        return res
 
 
 class PrivateKey(EmbitKey):
@@ -135,6 +231,11 @@ class PrivateKey(EmbitKey):
         self.compressed = compressed
         self._secret = secret
         self.network = network
+        # public key and secp keypair struct are created on first use
+        self._pubkey = None
+        self._keypair = None
+        # last taproot tweak as (h, tweaked key), keys are often tweaked repeatedly
+        self._taproot_tweaked = None
 
     def wif(self, network=None) -> str:
         """Export private key as Wallet Import Format string.
@@ -162,6 +263,8 @@ class PrivateKey(EmbitKey):
 
     def taproot_tweak(self, h=b""):
         """Returns a tweaked private key"""
+        if self._taproot_tweaked is not None and self._taproot_tweaked[0] == h:
+            return self._taproot_tweaked[1]
         sec = self.sec()
         negate = sec[0] != 0x02
         x = sec[1:33]
@@ -176,6 +279,7 @@ class PrivateKey(EmbitKey):
         pk = PrivateKey(res)
         if pk.sec()[0] == 0x03:
             pk = PrivateKey(secp256k1.ec_privkey_negate(res))
+        self._taproot_tweaked = (h, pk)
         return pk
 
     @classmethod
@@ -207,7 +311,12 @@ class PrivateKey(EmbitKey):
         return cls.from_wif(s)
 
     def get_public_key(self) -> PublicKey:
-        return PublicKey(secp256k1.ec_pubkey_create(self._secret), self.compressed)
+        # cached public key is reused unless compressed flag doesn't match anymore
+        if self._pubkey is None or self._pubkey.compressed != self.compressed:
+            self._pubkey = PublicKey(
+                secp256k1.ec_pubkey_create(self._secret), self.compressed
+            )
+        return self._pubkey
 
     def to_public(self) -> PublicKey:
         """Alias to get_public_key for API consistency"""
@@ -229,8 +338,14 @@ class PrivateKey(EmbitKey):
                     break
         return sig
 
+    def keypair(self) -> bytes:
+        """Returns secp keypair struct, it is cached to speed up schnorr signing"""
+        if self._keypair is None:
+            self._keypair = secp256k1.keypair_create(self._secret)
+        return self._keypair
+
     def schnorr_sign(self, msg_hash) -> SchnorrSig:
-        return SchnorrSig(secp256k1.schnorrsig_sign(msg_hash, self._secret))
+        return SchnorrSig(secp256k1.schnorrsig_sign(msg_hash, self.keypair()))
 
     def verify(self, sig, msg_hash) -> bool:
         return self.get_public_key().verify(sig, msg_hash)
@@ -255,6 +370,46 @@ class PrivateKey(EmbitKey):
     def is_private(self) -> bool:
         return True
 
+    def __reduce__(self):
+        # cached public key and keypair are recomputed on first use
+        return type(self), (bytes(self._secret), self.compressed, self.network)
+
+
+def _unpack_bitmap(bitmap, n):
+    return [bool((bitmap[i >> 3] >> (i & 7)) & 1) for i in range(n)]
+
+
+def verify_batch(items) -> list:
+    """
+    Verifies a list of (sig, msg_hash, pubkey) tuples with ECDSA signatures.
+    Returns a list of bools, one for every tuple.
+    """
+    items = list(items)
+    if not hasattr(secp256k1, "ecdsa_verify_batch"):
+        return [pub.verify(sig, msg_hash) for sig, msg_hash, pub in items]
+    bitmap = secp256k1.ecdsa_verify_batch(
+        b"".join([sig._sig for sig, _, _ in items]),
+        b"".join([msg_hash for _, msg_hash, _ in items]),
+        b"".join([pub._point for _, _, pub in items]),
+    )
+    return _unpack_bitmap(bitmap, len(items))
+
+
+def schnorr_verify_batch(items) -> list:
+    """
+    Verifies a list of (sig, msg_hash, pubkey) tuples with Schnorr signatures.
+    Returns a list of bools, one for every tuple.
+    """
+    items = list(items)
+    if not hasattr(secp256k1, "schnorrsig_verify_batch"):
+        return [pub.schnorr_verify(sig, msg_hash) for sig, msg_hash, pub in items]
+    bitmap = secp256k1.schnorrsig_verify_batch(
+        b"".join([sig._sig for sig, _, _ in items]),
+        b"".join([msg_hash for _, msg_hash, _ in items]),
+        b"".join([pub._xonly() for _, _, pub in items]),
+    )
+    return _unpack_bitmap(bitmap, len(items))
+
 
 # Nothing up my sleeve point for no-internal-key taproot
 # see https://github.com/bitcoin/bips/blob/master/bip-0341.mediawiki#constructing-and-spending-taproot-outputs
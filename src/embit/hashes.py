@@ -8,9 +8,12 @@ try:
     def ripemd160(msg: bytes) -> bytes:
         return hashlib.new("ripemd160", msg).digest()
 
+    def _ripemd160_many(msgs) -> list:
+        return [hashlib.new("ripemd160", msg).digest() for msg in msgs]
+
 except:
     # otherwise use pure python implementation
-    from .util.py_ripemd160 import ripemd160
+    from .util.py_ripemd160 import ripemd160, ripemd160_many as _ripemd160_many
 
 
 def double_sha256(msg: bytes) -> bytes:
@@ -18,24 +21,78 @@ def double_sha256(msg: bytes) -> bytes:
     return hashlib.sha256(hashlib.sha256(msg).digest()).digest()
 
 
+def double_sha256_many(msgs) -> list:
+    """sha256(sha256(msg)) of every message in the list"""
+    sha = hashlib.sha256
+    return [sha(sha(msg).digest()).digest() for msg in msgs]
+
+
+class DoubleSha256:
+    """
+    Streaming sha256(sha256(data)).
+    Has a stream-like write() method, so objects can serialize
+    directly into it with obj.write_to(h) without intermediate bytes.
+    """
+
+    def __init__(self, data: bytes = b""):
+        self._h = hashlib.sha256(data)
+        self.update = self._h.update
+
+    def write(self, data: bytes) -> int:
+        self.update(data)
+        return len(data)
+
+    def digest(self) -> bytes:
+        # on micropython hash can't be updated after digest()
+        return hashlib.sha256(self._h.digest()).digest()
+
+
 def hash160(msg: bytes) -> bytes:
     """ripemd160(sha256(msg)) -> bytes"""
     return ripemd160(hashlib.sha256(msg).digest())
 
 
+def hash160_many(msgs) -> list:
+    """hash160 of every message in the list, faster than calling hash160 in a loop"""
+    sha = hashlib.sha256
+    return _ripemd160_many([sha(msg).digest() for msg in msgs])
+
+
 def sha256(msg: bytes) -> bytes:
     """one-line sha256(msg) -> bytes"""
     return hashlib.sha256(msg).digest()
 
 
+# sha256 objects with sha256(tag)+sha256(tag) prefix already digested.
+# Cloning them with copy() is cheaper than hashing the tag and the 64-byte prefix
+# on every call. MicroPython hashes can't be copied, there we keep the prefix.
+_CAN_COPY = hasattr(hashlib.sha256(), "copy")
+_tagged_midstates = {}
+
+
+def _tagged_midstate(tag: str):
+    """Returns cached sha256 midstate or prefix for the tag"""
+    midstate = _tagged_midstates.get(tag)
+    if midstate is None:
+        hashtag = hashlib.sha256(tag.encode()).digest()
+        midstate = hashtag + hashtag
+        if _CAN_COPY:
+            midstate = hashlib.sha256(midstate)
+        _tagged_midstates[tag] = midstate
+    return midstate
+
+
 def tagged_hash(tag: str, data: bytes) -> bytes:
     """BIP-Schnorr tag-specific key derivation"""
-    hashtag = hashlib.sha256(tag.encode()).digest()
-    return hashlib.sha256(hashtag + hashtag + data).digest()
+    return tagged_hash_init(tag, data).digest()
 
 
 def tagged_hash_init(tag: str, data: bytes = b""):
     """Prepares a tagged hash function to digest extra data"""
-    hashtag = hashlib.sha256(tag.encode()).digest()
-    h = hashlib.sha256(hashtag + hashtag + data)
+    midstate = _tagged_midstate(tag)
+    if not _CAN_COPY:
+        return hashlib.sha256(midstate + data)
+    h = midstate.copy()
+    if data:
+        h.update(data)
     return h
@@ -3,6 +3,7 @@ from ..descriptor.descriptor import Descriptor
 from ..descriptor.base import DescriptorBase
 from ..descriptor.errors import DescriptorError
 from ..descriptor.arguments import Key
+from ..descriptor.compiled import CompiledDescriptor, _KeySlot
 from .networks import NETWORKS
 from .addresses import address
 from . import slip77
@@ -52,12 +53,12 @@ class LDescriptor(Descriptor):
         return d
 
     @classmethod
-    def read_from(cls, s):
+    def read_from(cls, s, pubkey_cls=None):
         # starts with blinded(K,...) or directly with sh(wsh()), sh() or wsh()
         start = s.read(8)
         if not start.startswith(b"blinded("):
             s.seek(-8, 1)
-            d = Descriptor.read_from(s)
+            d = Descriptor.read_from(s, pubkey_cls)
             return cls(
                 d.miniscript,
                 sh=d.sh,
@@ -71,7 +72,7 @@ class LDescriptor(Descriptor):
         blinding_key = BlindingKey.read_from(s)
         if s.read(1) != b",":
             raise DescriptorError("Missing bitcoin descriptor")
-        d = Descriptor.read_from(s)
+        d = Descriptor.read_from(s, pubkey_cls)
         if s.read(1) != b")":
             raise DescriptorError("Missing ending bracket")
         if not blinding_key.slip77:
@@ -98,6 +99,46 @@ class LDescriptor(Descriptor):
         return res
 
 
+class LCompiledDescriptor(CompiledDescriptor):
+    """
+    CompiledDescriptor for liquid descriptors.
+    Blinding key is compiled as well, so addresses are confidential
+    for blinded descriptors.
+    """
+
+    def __init__(self, descriptor, branch_index=None):
+        super().__init__(descriptor, branch_index)
+        self._blinding_key = descriptor.blinding_key
+        self._blinding_slot = None
+        bkey = self._blinding_key
+        if bkey is not None and not bkey.slip77 and isinstance(bkey.key, Key):
+            self._blinding_slot = _KeySlot(bkey.key, branch_index)
+
+    def _check_descriptor(self, descriptor):
+        pass
+
+    def blinding_pubkey(self, idx: int, sc=None):
+        """Returns blinding public key for index idx, None if not blinded"""
+        bkey = self._blinding_key
+        if bkey is None:
+            return None
+        if sc is None:
+            sc = self.script_pubkey(idx)
+        if self._blinding_slot is not None:
+            # public key is enough to get blinding pubkey for the address
+            bkey = BlindingKey(self._blinding_slot.derive(idx))
+        elif not bkey.slip77:
+            bkey = bkey.derive(idx, self.branch_index)
+        key = bkey.get_blinding_key(sc)
+        if key.is_private:
+            key = key.get_public_key()
+        return key
+
+    def address(self, idx: int, network=NETWORKS["liquidv1"]) -> str:
+        sc = self.script_pubkey(idx)
+        return address(sc, self.blinding_pubkey(idx, sc), network)
+
+
 class BlindingKey(DescriptorBase):
     def __init__(self, key, slip77=False):
         self.key = key
@@ -231,24 +231,22 @@ class LTransaction(Transaction):
         return res
 
     def hash(self):
-        h = hashlib.sha256()
-        h.update(self.version.to_bytes(4, "little"))
-        h.update(b"\x00")
-        h.update(compact.to_bytes(len(self.vin)))
+        # inputs and outputs are serialized directly into the hash
+        h = hashes.DoubleSha256(self.version.to_bytes(4, "little"))
+        h.write(b"\x00")
+        h.write(compact.to_bytes(len(self.vin)))
         for inp in self.vin:
-            h.update(inp.serialize())
-        h.update(compact.to_bytes(len(self.vout)))
+            inp.write_to(h)
+        h.write(compact.to_bytes(len(self.vout)))
         for out in self.vout:
-            h.update(out.serialize())
-        h.update(self.locktime.to_bytes(4, "little"))
-        hsh = hashlib.sha256(h.digest()).digest()
-        return hsh
+            out.write_to(h)
+        h.write(self.locktime.to_bytes(4, "little"))
+        return h.digest()
 
     @classmethod
     def read_vout(cls, stream, idx):
         """Returns a tuple TransactionOutput, tx_hash without storing the whole tx in memory"""
-        h = hashlib.sha256()
-        h.update(stream.read(4))
+        h = hashes.DoubleSha256(stream.read(4))
         has_witness = False
         flag = stream.read(1)
         if flag == b"\x01":
@@ -258,7 +256,7 @@ class LTransaction(Transaction):
         h.update(compact.to_bytes(num_vin))
         for i in range(num_vin):
             txin = LTransactionInput.read_from(stream)
-            h.update(txin.serialize())
+            txin.write_to(h)
         num_vout = compact.read_from(stream)
         h.update(compact.to_bytes(num_vout))
         if idx >= num_vout or idx < 0:
@@ -270,14 +268,14 @@ class LTransaction(Transaction):
             vout = LTransactionOutput.read_from(stream)
             if idx == i:
                 res = vout
-            h.update(vout.serialize())
+            vout.write_to(h)
         h.update(stream.read(4))
         if has_witness:
             for i in range(num_vin):
                 TxInWitness.read_from(stream)
             for i in range(num_vout):
                 TxOutWitness.read_from(stream)
-        return res, hashlib.sha256(h.digest()).digest()
+        return res, h.digest()
 
     @classmethod
     def read_from(cls, stream):
@@ -12,6 +12,12 @@ else:
         return x
 
 
+try:
+    from threading import Lock
+except ImportError:
+    # MicroPython
+    from _thread import allocate_lock as Lock
+
 try:
     # if urandom is available from os module:
     from os import urandom as urandom
@@ -51,6 +57,56 @@ def copy(a: bytes) -> bytes:
     return a[:1] + a[1:]
 
 
+class BufferReader:
+    """
+    Minimal read-only stream over bytes for text parsers (i.e. descriptors).
+    Keeps position in the buffer, so read_until() can search the buffer
+    instead of reading byte by byte.
+    """
+
+    def __init__(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        self._data = bytes(data)
+        self._pos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        start = self._pos
+        if n is None or n < 0:
+            self._pos = len(self._data)
+        else:
+            self._pos = min(start + n, len(self._data))
+        return self._data[start : self._pos]
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += len(self._data)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def read_until(self, chars=b",)(#"):
+        data = self._data
+        start = self._pos
+        end = len(data)
+        found = False
+        # every found char narrows the search for the next ones
+        for i in range(len(chars)):
+            idx = data.find(chars[i : i + 1], start, end)
+            if idx >= 0:
+                end = idx
+                found = True
+        if not found:
+            self._pos = end
+            return data[start:end], None
+        self._pos = end + 1
+        return data[start:end], data[end : end + 1]
+
+
 def read_until(s, chars=b",)(#"):
     """Read from stream until one of `char` characters.
     By default `chars=,)(#`.
@@ -59,6 +115,8 @@ def read_until(s, chars=b",)(#"):
     where result is bytes read from the stream until char,
     char contains this character or None if the end of stream reached.
     """
+    if isinstance(s, BufferReader):
+        return s.read_until(chars)
     res = b""
     chunk = b""
     while True:
@@ -68,3 +126,83 @@ def read_until(s, chars=b",)(#"):
         if chunk in chars:
             return res, chunk
         res += chunk
+
+
+class ParseCache:
+    """
+    Bounded LRU cache of parsed objects keyed by class and canonical string.
+    Cache keeps its own copy of every object and returns a new copy on every hit,
+    so changing parsed objects doesn't affect the cache.
+    Cache can be shared between threads.
+    Enable it with set_parse_cache(ParseCache()).
+    """
+
+    def __init__(self, size: int = 1024):
+        if size <= 0:
+            raise ValueError("Cache size should be positive")
+        from collections import OrderedDict
+
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def parse(self, cls, key, fn):
+        """Returns a copy of cached object for (cls, key) or parses it with fn(key)"""
+        from copy import deepcopy
+
+        k = (cls, key)
+        with self._lock:
+            obj = self._cache.pop(k, None)
+            if obj is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                # move to the end as most recently used
+                self._cache[k] = obj
+        # cached objects are never changed, so they are copied without the lock
+        if obj is not None:
+            return deepcopy(obj)
+        # fn may use the cache too, so it runs without the lock.
+        # fn may raise, invalid strings are not cached
+        res = fn(key)
+        obj = deepcopy(res)
+        with self._lock:
+            self._cache.pop(k, None)
+            self._cache[k] = obj
+            while len(self._cache) > self.size:
+                self._cache.pop(next(iter(self._cache)), None)
+        return res
+
+    def clear(self):
+        """Removes all cached objects and resets statistics"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# opt-in parse cache for descriptors and extended keys, see set_parse_cache()
+_parse_cache = None
+
+
+def set_parse_cache(cache=None):
+    """
+    Sets ParseCache used by Descriptor.from_string, Key.from_string
+    and HDKey.from_base58. Cache is disabled by default, pass None to disable it.
+    """
+    global _parse_cache
+    _parse_cache = cache
+
+
+def get_parse_cache():
+    return _parse_cache
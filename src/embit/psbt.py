@@ -40,6 +40,13 @@ def skip_string(stream) -> int:
     return len(compact.to_bytes(l)) + l
 
 
+def _from_state(cls, state: dict):
+    """Restores pickled PSBT without parsing"""
+    obj = cls.__new__(cls)
+    obj.__dict__.update(state)
+    return obj
+
+
 class DerivationPath(EmbitBase):
     def __init__(self, fingerprint: bytes, derivation: list):
         self.fingerprint = fingerprint
@@ -117,8 +124,16 @@ class InputScope(PSBTScope):
     TX_CLS = Transaction
     TXOUT_CLS = TransactionOutput
 
-    def __init__(self, unknown: dict = {}, vin=None, compress=CompressMode.KEEP_ALL):
+    def __init__(
+        self,
+        unknown: dict = {},
+        vin=None,
+        compress=CompressMode.KEEP_ALL,
+        lazy_keys=False,
+    ):
         self.compress = compress
+        # lazy keys are parsed only when the point is needed
+        self._pubkey_cls = ec.LazyPublicKey if lazy_keys else ec.PublicKey
         self.txid = None
         self.vout = None
         self.sequence = None
@@ -280,7 +295,7 @@ class InputScope(PSBTScope):
             # we don't need this key for signing
             if self.compress:
                 return
-            pub = ec.PublicKey.parse(k[1:])
+            pub = self._pubkey_cls.parse(k[1:])
             if pub in self.partial_sigs:
                 raise PSBTError("Duplicated partial sig")
             else:
@@ -314,7 +329,7 @@ class InputScope(PSBTScope):
 
         # PSBT_IN_BIP32_DERIVATION
         elif k[0] == 0x06:
-            pub = ec.PublicKey.parse(k[1:])
+            pub = self._pubkey_cls.parse(k[1:])
             if pub in self.bip32_derivations:
                 raise PSBTError("Duplicated derivation path")
             else:
@@ -355,7 +370,7 @@ class InputScope(PSBTScope):
         elif k[0] == 0x14:
             if len(k) != 65:
                 raise PSBTError("Invalid key length")
-            pub = ec.PublicKey.from_xonly(k[1:33])
+            pub = self._pubkey_cls.from_xonly(k[1:33])
             leaf = k[33:]
             if (pub, leaf) in self.taproot_sigs:
                 raise PSBTError("Duplicated taproot sig")
@@ -370,7 +385,7 @@ class InputScope(PSBTScope):
 
         # PSBT_IN_TAP_BIP32_DERIVATION
         elif k[0] == 0x16:
-            pub = ec.PublicKey.from_xonly(k[1:])
+            pub = self._pubkey_cls.from_xonly(k[1:])
             if pub not in self.taproot_bip32_derivations:
                 b = BytesIO(v)
                 num_leaf_hashes = compact.read_from(b)
@@ -382,7 +397,7 @@ class InputScope(PSBTScope):
 
         # PSBT_IN_TAP_INTERNAL_KEY
         elif k[0] == 0x17:
-            self.taproot_internal_key = ec.PublicKey.from_xonly(v)
+            self.taproot_internal_key = self._pubkey_cls.from_xonly(v)
 
         # PSBT_IN_TAP_MERKLE_ROOT
         elif k[0] == 0x18:
@@ -476,8 +491,15 @@ class InputScope(PSBTScope):
 
 
 class OutputScope(PSBTScope):
-    def __init__(self, unknown: dict = {}, vout=None, compress=CompressMode.KEEP_ALL):
+    def __init__(
+        self,
+        unknown: dict = {},
+        vout=None,
+        compress=CompressMode.KEEP_ALL,
+        lazy_keys=False,
+    ):
         self.compress = compress
+        self._pubkey_cls = ec.LazyPublicKey if lazy_keys else ec.PublicKey
         self.value = None
         self.script_pubkey = None
         if vout is not None:
@@ -541,7 +563,7 @@ class OutputScope(PSBTScope):
                 raise PSBTError("Duplicated witness script")
         # bip32 derivation
         elif k[0] == 0x02:
-            pub = ec.PublicKey.parse(k[1:])
+            pub = self._pubkey_cls.parse(k[1:])
             if pub in self.bip32_derivations:
                 raise PSBTError("Duplicated derivation path")
             else:
@@ -554,11 +576,11 @@ class OutputScope(PSBTScope):
 
         # PSBT_OUT_TAP_INTERNAL_KEY
         elif k[0] == 0x05:
-            self.taproot_internal_key = ec.PublicKey.from_xonly(v)
+            self.taproot_internal_key = self._pubkey_cls.from_xonly(v)
 
         # PSBT_OUT_TAP_BIP32_DERIVATION
         elif k[0] == 0x07:
-            pub = ec.PublicKey.from_xonly(k[1:])
+            pub = self._pubkey_cls.from_xonly(k[1:])
             if pub not in self.taproot_bip32_derivations:
                 b = BytesIO(v)
                 num_leaf_hashes = compact.read_from(b)
@@ -729,10 +751,18 @@ class PSBT(EmbitBase):
             r += out.write_to(stream, version=self.version)
         return r
 
+    def __reduce__(self):
+        # compressed scopes keep verified utxos that are not serialized,
+        # lazy scopes parse keys differently, so we pickle their state as is
+        for scope in self.inputs + self.outputs:
+            if scope.compress or scope._pubkey_cls is not ec.PublicKey:
+                return _from_state, (type(self), self.__dict__)
+        return type(self).parse, (self.serialize(),)
+
     @classmethod
-    def from_base64(cls, b64, compress=CompressMode.KEEP_ALL):
+    def from_base64(cls, b64, compress=CompressMode.KEEP_ALL, lazy_keys=False):
         raw = a2b_base64(b64)
-        return cls.parse(raw, compress=compress)
+        return cls.parse(raw, compress=compress, lazy_keys=lazy_keys)
 
     def to_base64(self):
         return b2a_base64(self.serialize()).strip().decode()
@@ -744,18 +774,20 @@ class PSBT(EmbitBase):
             return hexlify(self.serialize()).decode()
 
     @classmethod
-    def from_string(cls, s, compress=CompressMode.KEEP_ALL):
+    def from_string(cls, s, compress=CompressMode.KEEP_ALL, lazy_keys=False):
         if s.startswith(hexlify(cls.MAGIC).decode()):
-            return cls.parse(unhexlify(s), compress=compress)
+            return cls.parse(unhexlify(s), compress=compress, lazy_keys=lazy_keys)
         else:
-            return cls.from_base64(s, compress=compress)
+            return cls.from_base64(s, compress=compress, lazy_keys=lazy_keys)
 
     @classmethod
-    def read_from(cls, stream, compress=CompressMode.KEEP_ALL):
+    def read_from(cls, stream, compress=CompressMode.KEEP_ALL, lazy_keys=False):
         """
         Compress flag allows to load and verify non_witness_utxo
         without storing them in memory and save the utxo internally for signing.
         This helps against out-of-memory errors.
+        With lazy_keys public keys in scopes are kept in sec encoding
+        and parsed only when the point is needed.
         """
         tx = None
         unknown = {}
@@ -790,12 +822,12 @@ class PSBT(EmbitBase):
         # input scopes
         for i, vin in enumerate(psbt.tx.vin):
             psbt.inputs[i] = cls.PSBTIN_CLS.read_from(
-                stream, compress=compress, vin=vin
+                stream, compress=compress, vin=vin, lazy_keys=lazy_keys
             )
         # output scopes
         for i, vout in enumerate(psbt.tx.vout):
             psbt.outputs[i] = cls.PSBTOUT_CLS.read_from(
-                stream, compress=compress, vout=vout
+                stream, compress=compress, vout=vout, lazy_keys=lazy_keys
             )
         return psbt
 
@@ -949,7 +981,7 @@ class PSBT(EmbitBase):
 
         rootpub = root.get_public_key()
         sec = rootpub.sec()
-        pkh = hashes.hash160(sec)
+        pkh = rootpub.hash160()
 
         counter = 0
         for i, inp in enumerate(self.inputs):
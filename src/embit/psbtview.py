@@ -302,17 +302,22 @@ class PSBTView:
             n -= 1
         return off
 
-    def input(self, i, compress=None):
-        """Reads, parses and returns PSBT InputScope #i"""
+    def input(self, i, compress=None, lazy_keys=False):
+        """
+        Reads, parses and returns PSBT InputScope #i.
+        With lazy_keys public keys are parsed only when the point is needed.
+        """
         if compress is None:
             compress = self.compress
         if i < 0 or i >= self.num_inputs:
             raise PSBTError("Invalid input index")
         vin = self.tx.vin(i) if self.tx else None
         self.seek_to_scope(i)
-        return self.PSBTIN_CLS.read_from(self.stream, vin=vin, compress=compress)
+        return self.PSBTIN_CLS.read_from(
+            self.stream, vin=vin, compress=compress, lazy_keys=lazy_keys
+        )
 
-    def output(self, i, compress=None):
+    def output(self, i, compress=None, lazy_keys=False):
         """Reads, parses and returns PSBT OutputScope #i"""
         if compress is None:
             compress = self.compress
@@ -320,7 +325,9 @@ class PSBTView:
             raise PSBTError("Invalid output index")
         vout = self.tx.vout(i) if self.tx else None
         self.seek_to_scope(self.num_inputs + i)
-        return self.PSBTOUT_CLS.read_from(self.stream, vout=vout, compress=compress)
+        return self.PSBTOUT_CLS.read_from(
+            self.stream, vout=vout, compress=compress, lazy_keys=lazy_keys
+        )
 
     # compress is not used here, but may be used by subclasses (liquid)
     def vin(self, i, compress=None):
@@ -713,7 +720,7 @@ class PSBTView:
 
         rootpub = root.get_public_key()
         sec = rootpub.sec()
-        pkh = hashes.hash160(sec)
+        pkh = rootpub.hash160()
 
         inp = self.input(i)
         if extra_scope_data is not None:
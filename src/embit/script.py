@@ -123,7 +123,7 @@ class Witness(EmbitBase):
 
 def p2pkh(pubkey):
     """Return Pay-To-Pubkey-Hash ScriptPubkey"""
-    return Script(b"\x76\xa9\x14" + hashes.hash160(pubkey.sec()) + b"\x88\xac")
+    return Script(b"\x76\xa9\x14" + pubkey.hash160() + b"\x88\xac")
 
 
 def p2sh(script):
@@ -133,7 +133,7 @@ def p2sh(script):
 
 def p2wpkh(pubkey):
     """Return Pay-To-Witness-Pubkey-Hash ScriptPubkey"""
-    return Script(b"\x00\x14" + hashes.hash160(pubkey.sec()))
+    return Script(b"\x00\x14" + pubkey.hash160())
 
 
 def p2wsh(script):
@@ -47,6 +47,69 @@ def hash_script_pubkeys(script_pubkeys):
     return h.digest()
 
 
+def _read_compact(raw, pos: int):
+    """Reads compact int from raw bytes at pos, returns value and next position"""
+    if pos >= len(raw):
+        raise TransactionError("Transaction is truncated")
+    i = raw[pos]
+    if i < 0xFD:
+        return i, pos + 1
+    end = pos + 1 + 2 ** (i - 0xFC)
+    if end > len(raw):
+        raise TransactionError("Transaction is truncated")
+    return int.from_bytes(raw[pos + 1 : end], "little"), end
+
+
+def _check_raw_tx(raw) -> bool:
+    """
+    Checks that raw bytes are exactly one transaction without parsing it.
+    Returns True if transaction has witness.
+    """
+    num_vin, pos = _read_compact(raw, 4)
+    # zero number of inputs is a segwit marker
+    is_segwit = num_vin == 0
+    if is_segwit:
+        if pos >= len(raw) or raw[pos] != 0x01:
+            raise TransactionError("Invalid segwit marker")
+        num_vin, pos = _read_compact(raw, pos + 1)
+    for i in range(num_vin):
+        # outpoint, script_sig, sequence
+        l, pos = _read_compact(raw, pos + 36)
+        pos += l + 4
+    num_vout, pos = _read_compact(raw, pos)
+    for i in range(num_vout):
+        # amount, script_pubkey
+        l, pos = _read_compact(raw, pos + 8)
+        pos += l
+    if is_segwit:
+        for i in range(num_vin):
+            num_items, pos = _read_compact(raw, pos)
+            for j in range(num_items):
+                l, pos = _read_compact(raw, pos)
+                pos += l
+    # locktime
+    if pos + 4 != len(raw):
+        raise TransactionError("Invalid transaction length")
+    return is_segwit
+
+
+def txids(txs) -> list:
+    """
+    Returns txids of a list of transactions.
+    Transactions can be Transaction objects or raw bytes,
+    raw transactions without witness are hashed without parsing.
+    """
+    res = []
+    for tx in txs:
+        if isinstance(tx, (bytes, bytearray)):
+            if not _check_raw_tx(tx):
+                res.append(bytes(reversed(hashes.double_sha256(tx))))
+                continue
+            tx = Transaction.parse(tx)
+        res.append(tx.txid())
+    return res
+
+
 # API similar to bitcoin-cli decoderawtransaction
 
 
@@ -92,17 +155,16 @@ class Transaction(EmbitBase):
         return res
 
     def hash(self):
-        h = hashlib.sha256()
-        h.update(self.version.to_bytes(4, "little"))
-        h.update(compact.to_bytes(len(self.vin)))
+        # inputs and outputs are serialized directly into the hash
+        h = hashes.DoubleSha256(self.version.to_bytes(4, "little"))
+        h.write(compact.to_bytes(len(self.vin)))
         for inp in self.vin:
-            h.update(inp.serialize())
-        h.update(compact.to_bytes(len(self.vout)))
+            inp.write_to(h)
+        h.write(compact.to_bytes(len(self.vout)))
         for out in self.vout:
-            h.update(out.serialize())
-        h.update(self.locktime.to_bytes(4, "little"))
-        hsh = hashlib.sha256(h.digest()).digest()
-        return hsh
+            out.write_to(h)
+        h.write(self.locktime.to_bytes(4, "little"))
+        return h.digest()
 
     def txid(self):
         return bytes(reversed(self.hash()))
@@ -110,8 +172,7 @@ class Transaction(EmbitBase):
     @classmethod
     def read_vout(cls, stream, idx):
         """Returns a tuple TransactionOutput, tx_hash without storing the whole tx in memory"""
-        h = hashlib.sha256()
-        h.update(stream.read(4))
+        h = hashes.DoubleSha256(stream.read(4))
         num_vin = compact.read_from(stream)
         # if num_vin is zero it is a segwit transaction
         is_segwit = num_vin == 0
@@ -123,7 +184,7 @@ class Transaction(EmbitBase):
         h.update(compact.to_bytes(num_vin))
         for i in range(num_vin):
             txin = TransactionInput.read_from(stream)
-            h.update(txin.serialize())
+            txin.write_to(h)
         num_vout = compact.read_from(stream)
         h.update(compact.to_bytes(num_vout))
         if idx >= num_vout or idx < 0:
@@ -135,12 +196,18 @@ class Transaction(EmbitBase):
             vout = TransactionOutput.read_from(stream)
             if idx == i:
                 res = vout
-            h.update(vout.serialize())
+            vout.write_to(h)
         if is_segwit:
             for i in range(num_vin):
                 Witness.read_from(stream)
         h.update(stream.read(4))
-        return res, hashlib.sha256(h.digest()).digest()
+        return res, h.digest()
+
+    def __reduce__(self):
+        # transaction without inputs can't be parsed back - zero inputs is a segwit marker
+        if len(self.vin) == 0:
+            return type(self), (self.version, [], self.vout, self.locktime)
+        return type(self).parse, (self.serialize(),)
 
     @classmethod
     def read_from(cls, stream):
@@ -368,9 +435,8 @@ class TransactionInput(EmbitBase):
         res = stream.write(bytes(reversed(self.txid)))
         res += stream.write(self.vout.to_bytes(4, "little"))
         if script_sig is None:
-            res += stream.write(self.script_sig.serialize())
-        else:
-            res += stream.write(script_sig.serialize())
+            script_sig = self.script_sig
+        res += script_sig.write_to(stream)
         res += stream.write(sequence.to_bytes(4, "little"))
         return res
 
@@ -390,7 +456,7 @@ class TransactionOutput(EmbitBase):
 
     def write_to(self, stream):
         res = stream.write(self.value.to_bytes(8, "little"))
-        res += stream.write(self.script_pubkey.serialize())
+        res += self.script_pubkey.write_to(stream)
         return res
 
     @classmethod
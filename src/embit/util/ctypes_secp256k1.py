@@ -19,18 +19,6 @@ from ctypes import (
     POINTER,
 )
 
-_lock = threading.Lock()
-
-
-# @locked decorator
-def locked(func):
-    def wrapper(*args, **kwargs):
-        with _lock:
-            return func(*args, **kwargs)
-
-    return wrapper
-
-
 # Flags to pass to context_create.
 CONTEXT_VERIFY = 0b0100000001
 CONTEXT_SIGN = 0b1000000001
@@ -48,6 +36,32 @@ def _copy(a: bytes) -> bytes:
     return a[:1] + a[1:]
 
 
+def _address(b: bytes) -> int:
+    """Address of the internal buffer of the bytes object"""
+    return cast(c_char_p(b), c_void_p).value
+
+
+def _verify_batch(verify, context, sigs, msgs, pubs):
+    """
+    Calls verify for every (sig, msg, pub) from packed buffers.
+    Returns a bitmap with bit i set if signature i is valid.
+    """
+    sigs, msgs, pubs = bytes(sigs), bytes(msgs), bytes(pubs)
+    n = len(sigs) // 64
+    if len(sigs) != 64 * n or len(msgs) != 32 * n or len(pubs) != 64 * n:
+        raise ValueError(
+            "Buffers should contain 64-byte sigs, 32-byte msgs and 64-byte pubkeys"
+        )
+    res = bytearray((n + 7) // 8)
+    if n == 0:
+        return bytes(res)
+    sig_ptr, msg_ptr, pub_ptr = _address(sigs), _address(msgs), _address(pubs)
+    for i in range(n):
+        if verify(context, sig_ptr + 64 * i, msg_ptr + 32 * i, pub_ptr + 64 * i):
+            res[i >> 3] |= 1 << (i & 7)
+    return bytes(res)
+
+
 def _find_library():
     library_path = None
     extension = ""
@@ -79,7 +93,6 @@ def _find_library():
     return library_path
 
 
-@locked
 def _init(flags=(CONTEXT_SIGN | CONTEXT_VERIFY)):
     library_path = _find_library()
     # meh, can't find library
@@ -93,6 +106,9 @@ def _init(flags=(CONTEXT_SIGN | CONTEXT_VERIFY)):
     secp256k1.secp256k1_context_create.argtypes = [c_uint]
     secp256k1.secp256k1_context_create.restype = c_void_p
 
+    secp256k1.secp256k1_context_destroy.argtypes = [c_void_p]
+    secp256k1.secp256k1_context_destroy.restype = None
+
     secp256k1.secp256k1_context_randomize.argtypes = [c_void_p, c_char_p]
     secp256k1.secp256k1_context_randomize.restype = c_int
 
@@ -175,6 +191,11 @@ def _init(flags=(CONTEXT_SIGN | CONTEXT_VERIFY)):
     secp256k1.secp256k1_ecdsa_verify.argtypes = [c_void_p, c_char_p, c_char_p, c_char_p]
     secp256k1.secp256k1_ecdsa_verify.restype = c_int
 
+    # same function taking raw addresses, used for batch verification
+    secp256k1.ecdsa_verify_ptr = secp256k1["secp256k1_ecdsa_verify"]
+    secp256k1.ecdsa_verify_ptr.argtypes = [c_void_p, c_void_p, c_void_p, c_void_p]
+    secp256k1.ecdsa_verify_ptr.restype = c_int
+
     secp256k1.secp256k1_ec_pubkey_combine.argtypes = [
         c_void_p,
         c_char_p,
@@ -215,6 +236,15 @@ def _init(flags=(CONTEXT_SIGN | CONTEXT_VERIFY)):
         ]
         secp256k1.secp256k1_schnorrsig_verify.restype = c_int
 
+        secp256k1.schnorrsig_verify_ptr = secp256k1["secp256k1_schnorrsig_verify"]
+        secp256k1.schnorrsig_verify_ptr.argtypes = [
+            c_void_p,  # ctx
+            c_void_p,  # sig
+            c_void_p,  # msg
+            c_void_p,  # pubkey
+        ]
+        secp256k1.schnorrsig_verify_ptr.restype = c_int
+
         secp256k1.secp256k1_schnorrsig_sign.argtypes = [
             c_void_p,  # ctx
             c_char_p,  # sig
@@ -479,18 +509,60 @@ def _init(flags=(CONTEXT_SIGN | CONTEXT_VERIFY)):
 
 _secp = _init()
 
+# every thread gets its own randomized context,
+# so calls from different threads don't need to wait for each other
+_local = threading.local()
+
+
+class _Context:
+    """Owns a secp256k1 context and destroys it when the thread is gone"""
+
+    def __init__(self, flags=(CONTEXT_SIGN | CONTEXT_VERIFY)):
+        self.ptr = _secp.secp256k1_context_create(flags)
+        if not self.ptr:
+            raise RuntimeError("Failed to create context")
+        if _secp.secp256k1_context_randomize(self.ptr, os.urandom(32)) == 0:
+            raise RuntimeError("Failed to randomize context")
+
+    def __del__(self):
+        # module globals can be already gone on interpreter shutdown
+        if self.ptr and _secp is not None:
+            _secp.secp256k1_context_destroy(self.ptr)
+            self.ptr = None
+
+
+def get_context():
+    """Returns a context that belongs to the current thread"""
+    ctx = getattr(_local, "ctx", None)
+    if ctx is None:
+        ctx = _Context()
+        _local.ctx = ctx
+    return ctx.ptr
+
+
+# @contextual decorator
+def contextual(func):
+    """Uses the context of the current thread if context is not provided"""
+
+    def wrapper(*args, context=None, **kwargs):
+        if context is None:
+            context = get_context()
+        return func(*args, context=context, **kwargs)
+
+    return wrapper
+
 
 # bindings equal to ones in micropython
-@locked
-def context_randomize(seed, context=_secp.ctx):
+@contextual
+def context_randomize(seed, context=None):
     if len(seed) != 32:
         raise ValueError("Seed should be 32 bytes long")
     if _secp.secp256k1_context_randomize(context, seed) == 0:
         raise RuntimeError("Failed to randomize context")
 
 
-@locked
-def ec_pubkey_create(secret, context=_secp.ctx):
+@contextual
+def ec_pubkey_create(secret, context=None):
     if len(secret) != 32:
         raise ValueError("Private key should be 32 bytes long")
     pub = bytes(64)
@@ -500,8 +572,13 @@ def ec_pubkey_create(secret, context=_secp.ctx):
     return pub
 
 
-@locked
-def ec_pubkey_parse(sec, context=_secp.ctx):
+@contextual
+def ec_pubkey_create_batch(secrets, context=None):
+    return [ec_pubkey_create(secret, context=context) for secret in secrets]
+
+
+@contextual
+def ec_pubkey_parse(sec, context=None):
     if len(sec) != 33 and len(sec) != 65:
         raise ValueError("Serialized pubkey should be 33 or 65 bytes long")
     if len(sec) == 33:
@@ -517,8 +594,8 @@ def ec_pubkey_parse(sec, context=_secp.ctx):
     return pub
 
 
-@locked
-def ec_pubkey_serialize(pubkey, flag=EC_COMPRESSED, context=_secp.ctx):
+@contextual
+def ec_pubkey_serialize(pubkey, flag=EC_COMPRESSED, context=None):
     if len(pubkey) != 64:
         raise ValueError("Pubkey should be 64 bytes long")
     if flag not in [EC_COMPRESSED, EC_UNCOMPRESSED]:
@@ -531,8 +608,13 @@ def ec_pubkey_serialize(pubkey, flag=EC_COMPRESSED, context=_secp.ctx):
     return sec
 
 
-@locked
-def ecdsa_signature_parse_compact(compact_sig, context=_secp.ctx):
+@contextual
+def ec_pubkey_serialize_batch(pubkeys, flag=EC_COMPRESSED, context=None):
+    return [ec_pubkey_serialize(pubkey, flag, context=context) for pubkey in pubkeys]
+
+
+@contextual
+def ecdsa_signature_parse_compact(compact_sig, context=None):
     if len(compact_sig) != 64:
         raise ValueError("Compact signature should be 64 bytes long")
     sig = bytes(64)
@@ -542,8 +624,8 @@ def ecdsa_signature_parse_compact(compact_sig, context=_secp.ctx):
     return sig
 
 
-@locked
-def ecdsa_signature_parse_der(der, context=_secp.ctx):
+@contextual
+def ecdsa_signature_parse_der(der, context=None):
     sig = bytes(64)
     r = _secp.secp256k1_ecdsa_signature_parse_der(context, sig, der, len(der))
     if r == 0:
@@ -551,8 +633,8 @@ def ecdsa_signature_parse_der(der, context=_secp.ctx):
     return sig
 
 
-@locked
-def ecdsa_signature_serialize_der(sig, context=_secp.ctx):
+@contextual
+def ecdsa_signature_serialize_der(sig, context=None):
     if len(sig) != 64:
         raise ValueError("Signature should be 64 bytes long")
     der = bytes(78)  # max
@@ -563,8 +645,8 @@ def ecdsa_signature_serialize_der(sig, context=_secp.ctx):
     return der[: sz.value]
 
 
-@locked
-def ecdsa_signature_serialize_compact(sig, context=_secp.ctx):
+@contextual
+def ecdsa_signature_serialize_compact(sig, context=None):
     if len(sig) != 64:
         raise ValueError("Signature should be 64 bytes long")
     ser = bytes(64)
@@ -574,8 +656,8 @@ def ecdsa_signature_serialize_compact(sig, context=_secp.ctx):
     return ser
 
 
-@locked
-def ecdsa_signature_normalize(sig, context=_secp.ctx):
+@contextual
+def ecdsa_signature_normalize(sig, context=None):
     if len(sig) != 64:
         raise ValueError("Signature should be 64 bytes long")
     sig2 = bytes(64)
@@ -583,8 +665,8 @@ def ecdsa_signature_normalize(sig, context=_secp.ctx):
     return sig2
 
 
-@locked
-def ecdsa_verify(sig, msg, pub, context=_secp.ctx):
+@contextual
+def ecdsa_verify(sig, msg, pub, context=None):
     if len(sig) != 64:
         raise ValueError("Signature should be 64 bytes long")
     if len(msg) != 32:
@@ -595,8 +677,19 @@ def ecdsa_verify(sig, msg, pub, context=_secp.ctx):
     return bool(r)
 
 
-@locked
-def ecdsa_sign(msg, secret, nonce_function=None, extra_data=None, context=_secp.ctx):
+@contextual
+def ecdsa_verify_batch(sigs, msgs, pubs, context=None):
+    """
+    Verifies n signatures in one call.
+    sigs, msgs and pubs are packed buffers of n 64-byte signatures,
+    32-byte messages and 64-byte pubkeys.
+    Returns a bitmap with bit i set if signature i is valid.
+    """
+    return _verify_batch(_secp.ecdsa_verify_ptr, context, sigs, msgs, pubs)
+
+
+@contextual
+def ecdsa_sign(msg, secret, nonce_function=None, extra_data=None, context=None):
     if len(msg) != 32:
         raise ValueError("Message should be 32 bytes long")
     if len(secret) != 32:
@@ -612,15 +705,15 @@ def ecdsa_sign(msg, secret, nonce_function=None, extra_data=None, context=_secp.
     return sig
 
 
-@locked
-def ec_seckey_verify(secret, context=_secp.ctx):
+@contextual
+def ec_seckey_verify(secret, context=None):
     if len(secret) != 32:
         raise ValueError("Secret should be 32 bytes long")
     return bool(_secp.secp256k1_ec_seckey_verify(context, secret))
 
 
-@locked
-def ec_privkey_negate(secret, context=_secp.ctx):
+@contextual
+def ec_privkey_negate(secret, context=None):
     if len(secret) != 32:
         raise ValueError("Secret should be 32 bytes long")
     b = _copy(secret)
@@ -628,8 +721,8 @@ def ec_privkey_negate(secret, context=_secp.ctx):
     return b
 
 
-@locked
-def ec_pubkey_negate(pubkey, context=_secp.ctx):
+@contextual
+def ec_pubkey_negate(pubkey, context=None):
     if len(pubkey) != 64:
         raise ValueError("Pubkey should be a 64-byte structure")
     pub = _copy(pubkey)
@@ -639,8 +732,8 @@ def ec_pubkey_negate(pubkey, context=_secp.ctx):
     return pub
 
 
-@locked
-def ec_privkey_tweak_add(secret, tweak, context=_secp.ctx):
+@contextual
+def ec_privkey_tweak_add(secret, tweak, context=None):
     if len(secret) != 32 or len(tweak) != 32:
         raise ValueError("Secret and tweak should both be 32 bytes long")
     t = _copy(tweak)
@@ -649,8 +742,8 @@ def ec_privkey_tweak_add(secret, tweak, context=_secp.ctx):
     return None
 
 
-@locked
-def ec_pubkey_tweak_add(pub, tweak, context=_secp.ctx):
+@contextual
+def ec_pubkey_tweak_add(pub, tweak, context=None):
     if len(pub) != 64:
         raise ValueError("Public key should be 64 bytes long")
     if len(tweak) != 32:
@@ -661,8 +754,8 @@ def ec_pubkey_tweak_add(pub, tweak, context=_secp.ctx):
     return None
 
 
-@locked
-def ec_privkey_add(secret, tweak, context=_secp.ctx):
+@contextual
+def ec_privkey_add(secret, tweak, context=None):
     if len(secret) != 32 or len(tweak) != 32:
         raise ValueError("Secret and tweak should both be 32 bytes long")
     # ugly copy that works in mpy and py
@@ -673,8 +766,8 @@ def ec_privkey_add(secret, tweak, context=_secp.ctx):
     return s
 
 
-@locked
-def ec_pubkey_add(pub, tweak, context=_secp.ctx):
+@contextual
+def ec_pubkey_add(pub, tweak, context=None):
     if len(pub) != 64:
         raise ValueError("Public key should be 64 bytes long")
     if len(tweak) != 32:
@@ -685,16 +778,16 @@ def ec_pubkey_add(pub, tweak, context=_secp.ctx):
     return p
 
 
-@locked
-def ec_privkey_tweak_mul(secret, tweak, context=_secp.ctx):
+@contextual
+def ec_privkey_tweak_mul(secret, tweak, context=None):
     if len(secret) != 32 or len(tweak) != 32:
         raise ValueError("Secret and tweak should both be 32 bytes long")
     if _secp.secp256k1_ec_privkey_tweak_mul(context, secret, tweak) == 0:
         raise ValueError("Failed to tweak the secret")
 
 
-@locked
-def ec_pubkey_tweak_mul(pub, tweak, context=_secp.ctx):
+@contextual
+def ec_pubkey_tweak_mul(pub, tweak, context=None):
     if len(pub) != 64:
         raise ValueError("Public key should be 64 bytes long")
     if len(tweak) != 32:
@@ -703,8 +796,8 @@ def ec_pubkey_tweak_mul(pub, tweak, context=_secp.ctx):
         raise ValueError("Failed to tweak the public key")
 
 
-@locked
-def ec_pubkey_combine(*args, context=_secp.ctx):
+@contextual
+def ec_pubkey_combine(*args, context=None):
     pub = bytes(64)
     pubkeys = (c_char_p * len(args))(*args)
     r = _secp.secp256k1_ec_pubkey_combine(context, pub, pubkeys, len(args))
@@ -714,8 +807,8 @@ def ec_pubkey_combine(*args, context=_secp.ctx):
 
 
 # ecdh
-@locked
-def ecdh(pubkey, scalar, hashfn=None, data=None, context=_secp.ctx):
+@contextual
+def ecdh(pubkey, scalar, hashfn=None, data=None, context=None):
     if not len(pubkey) == 64:
         raise ValueError("Pubkey should be 64 bytes long")
     if not len(scalar) == 32:
@@ -746,8 +839,8 @@ def ecdh(pubkey, scalar, hashfn=None, data=None, context=_secp.ctx):
 
 
 # schnorrsig
-@locked
-def xonly_pubkey_from_pubkey(pubkey, context=_secp.ctx):
+@contextual
+def xonly_pubkey_from_pubkey(pubkey, context=None):
     if len(pubkey) != 64:
         raise ValueError("Pubkey should be 64 bytes long")
     pointer = POINTER(c_int)
@@ -759,8 +852,8 @@ def xonly_pubkey_from_pubkey(pubkey, context=_secp.ctx):
     return xonly_pub, bool(parity.contents.value)
 
 
-@locked
-def schnorrsig_verify(sig, msg, pubkey, context=_secp.ctx):
+@contextual
+def schnorrsig_verify(sig, msg, pubkey, context=None):
     assert len(sig) == 64
     assert len(msg) == 32
     assert len(pubkey) == 64
@@ -768,8 +861,19 @@ def schnorrsig_verify(sig, msg, pubkey, context=_secp.ctx):
     return bool(res)
 
 
-@locked
-def keypair_create(secret, context=_secp.ctx):
+@contextual
+def schnorrsig_verify_batch(sigs, msgs, pubkeys, context=None):
+    """
+    Verifies n schnorr signatures in one call.
+    sigs, msgs and pubkeys are packed buffers of n 64-byte signatures,
+    32-byte messages and 64-byte xonly pubkeys.
+    Returns a bitmap with bit i set if signature i is valid.
+    """
+    return _verify_batch(_secp.schnorrsig_verify_ptr, context, sigs, msgs, pubkeys)
+
+
+@contextual
+def keypair_create(secret, context=None):
     assert len(secret) == 32
     keypair = bytes(96)
     r = _secp.secp256k1_keypair_create(context, keypair, secret)
@@ -778,27 +882,24 @@ def keypair_create(secret, context=_secp.ctx):
     return keypair
 
 
-# not @locked because it uses keypair_create inside
-def schnorrsig_sign(
-    msg, keypair, nonce_function=None, extra_data=None, context=_secp.ctx
-):
+@contextual
+def schnorrsig_sign(msg, keypair, nonce_function=None, extra_data=None, context=None):
     assert len(msg) == 32
     if len(keypair) == 32:
         keypair = keypair_create(keypair, context=context)
-    with _lock:
-        assert len(keypair) == 96
-        sig = bytes(64)
-        r = _secp.secp256k1_schnorrsig_sign(
-            context, sig, msg, keypair, nonce_function, extra_data
-        )
-        if r == 0:
-            raise ValueError("Failed to sign")
-        return sig
+    assert len(keypair) == 96
+    sig = bytes(64)
+    r = _secp.secp256k1_schnorrsig_sign(
+        context, sig, msg, keypair, nonce_function, extra_data
+    )
+    if r == 0:
+        raise ValueError("Failed to sign")
+    return sig
 
 
 # recoverable
-@locked
-def ecdsa_sign_recoverable(msg, secret, context=_secp.ctx):
+@contextual
+def ecdsa_sign_recoverable(msg, secret, context=None):
     if len(msg) != 32:
         raise ValueError("Message should be 32 bytes long")
     if len(secret) != 32:
@@ -810,8 +911,8 @@ def ecdsa_sign_recoverable(msg, secret, context=_secp.ctx):
     return sig
 
 
-@locked
-def ecdsa_recoverable_signature_serialize_compact(sig, context=_secp.ctx):
+@contextual
+def ecdsa_recoverable_signature_serialize_compact(sig, context=None):
     if len(sig) != 65:
         raise ValueError("Recoverable signature should be 65 bytes long")
     ser = bytes(64)
@@ -824,8 +925,8 @@ def ecdsa_recoverable_signature_serialize_compact(sig, context=_secp.ctx):
     return ser, idx[0]
 
 
-@locked
-def ecdsa_recoverable_signature_parse_compact(compact_sig, recid, context=_secp.ctx):
+@contextual
+def ecdsa_recoverable_signature_parse_compact(compact_sig, recid, context=None):
     if len(compact_sig) != 64:
         raise ValueError("Signature should be 64 bytes long")
     sig = bytes(65)
@@ -837,8 +938,8 @@ def ecdsa_recoverable_signature_parse_compact(compact_sig, recid, context=_secp.
     return sig
 
 
-@locked
-def ecdsa_recoverable_signature_convert(sigin, context=_secp.ctx):
+@contextual
+def ecdsa_recoverable_signature_convert(sigin, context=None):
     if len(sigin) != 65:
         raise ValueError("Recoverable signature should be 65 bytes long")
     sig = bytes(64)
@@ -848,8 +949,8 @@ def ecdsa_recoverable_signature_convert(sigin, context=_secp.ctx):
     return sig
 
 
-@locked
-def ecdsa_recover(sig, msghash, context=_secp.ctx):
+@contextual
+def ecdsa_recover(sig, msghash, context=None):
     if len(sig) != 65:
         raise ValueError("Recoverable signature should be 65 bytes long")
     if len(msghash) != 32:
@@ -864,8 +965,8 @@ def ecdsa_recover(sig, msghash, context=_secp.ctx):
 # zkp modules
 
 
-@locked
-def pedersen_commitment_parse(inp, context=_secp.ctx):
+@contextual
+def pedersen_commitment_parse(inp, context=None):
     if len(inp) != 33:
         raise ValueError("Serialized commitment should be 33 bytes long")
     commit = bytes(64)
@@ -875,8 +976,8 @@ def pedersen_commitment_parse(inp, context=_secp.ctx):
     return commit
 
 
-@locked
-def pedersen_commitment_serialize(commit, context=_secp.ctx):
+@contextual
+def pedersen_commitment_serialize(commit, context=None):
     if len(commit) != 64:
         raise ValueError("Commitment should be 64 bytes long")
     sec = bytes(33)
@@ -886,8 +987,8 @@ def pedersen_commitment_serialize(commit, context=_secp.ctx):
     return sec
 
 
-@locked
-def pedersen_commit(vbf, value, gen, context=_secp.ctx):
+@contextual
+def pedersen_commit(vbf, value, gen, context=None):
     if len(gen) != 64:
         raise ValueError("Generator should be 64 bytes long")
     if len(vbf) != 32:
@@ -899,12 +1000,11 @@ def pedersen_commit(vbf, value, gen, context=_secp.ctx):
     return commit
 
 
-@locked
-def pedersen_blind_generator_blind_sum(
-    values, gens, vbfs, num_inputs, context=_secp.ctx
-):
+@contextual
+def pedersen_blind_generator_blind_sum(values, gens, vbfs, num_inputs, context=None):
     vals = (c_uint64 * len(values))(*values)
-    vbf = bytes(vbfs[-1])
+    # bytes(b) returns the same object, but we write into it
+    vbf = _copy(vbfs[-1])
     p = c_char_p(vbf)  # obtain a pointer of various types
     address = cast(p, c_void_p).value
 
@@ -920,8 +1020,8 @@ def pedersen_blind_generator_blind_sum(
     return res
 
 
-@locked
-def pedersen_verify_tally(ins, outs, context=_secp.ctx):
+@contextual
+def pedersen_verify_tally(ins, outs, context=None):
     in_ptr = (c_char_p * len(ins))(*ins)
     out_ptr = (c_char_p * len(outs))(*outs)
     res = _secp.secp256k1_pedersen_verify_tally(
@@ -931,8 +1031,8 @@ def pedersen_verify_tally(ins, outs, context=_secp.ctx):
 
 
 # generator
-@locked
-def generator_parse(inp, context=_secp.ctx):
+@contextual
+def generator_parse(inp, context=None):
     if len(inp) != 33:
         raise ValueError("Serialized generator should be 33 bytes long")
     gen = bytes(64)
@@ -942,8 +1042,8 @@ def generator_parse(inp, context=_secp.ctx):
     return gen
 
 
-@locked
-def generator_generate(asset, context=_secp.ctx):
+@contextual
+def generator_generate(asset, context=None):
     if len(asset) != 32:
         raise ValueError("Asset should be 32 bytes long")
     gen = bytes(64)
@@ -953,8 +1053,8 @@ def generator_generate(asset, context=_secp.ctx):
     return gen
 
 
-@locked
-def generator_generate_blinded(asset, abf, context=_secp.ctx):
+@contextual
+def generator_generate_blinded(asset, abf, context=None):
     if len(asset) != 32:
         raise ValueError("Asset should be 32 bytes long")
     if len(abf) != 32:
@@ -966,8 +1066,8 @@ def generator_generate_blinded(asset, abf, context=_secp.ctx):
     return gen
 
 
-@locked
-def generator_serialize(generator, context=_secp.ctx):
+@contextual
+def generator_serialize(generator, context=None):
     if len(generator) != 64:
         raise ValueError("Generator should be 64 bytes long")
     sec = bytes(33)
@@ -977,7 +1077,7 @@ def generator_serialize(generator, context=_secp.ctx):
 
 
 # rangeproof
-@locked
+@contextual
 def rangeproof_rewind(
     proof,
     nonce,
@@ -985,7 +1085,7 @@ def rangeproof_rewind(
     script_pubkey,
     generator,
     message_length=64,
-    context=_secp.ctx,
+    context=None,
 ):
     if len(generator) != 64:
         raise ValueError("Generator should be 64 bytes long")
@@ -996,10 +1096,12 @@ def rangeproof_rewind(
 
     pointer = POINTER(c_uint64)
 
-    msg = b"\x00" * message_length
+    # output buffers must be fresh objects:
+    # b"\x00" * 32 is a constant shared between all the calls
+    msg = bytes(message_length)
     msglen = pointer(c_uint64(len(msg)))
 
-    vbf_out = b"\x00" * 32
+    vbf_out = bytes(32)
     value_out = pointer(c_uint64(0))
     min_value = pointer(c_uint64(0))
     max_value = pointer(c_uint64(0))
@@ -1033,10 +1135,8 @@ def rangeproof_rewind(
 # rangeproof
 
 
-@locked
-def rangeproof_verify(
-    proof, value_commitment, script_pubkey, generator, context=_secp.ctx
-):
+@contextual
+def rangeproof_verify(proof, value_commitment, script_pubkey, generator, context=None):
     if len(generator) != 64:
         raise ValueError("Generator should be 64 bytes long")
     if len(value_commitment) != 64:
@@ -1061,7 +1161,7 @@ def rangeproof_verify(
     return min_value.contents.value, max_value.contents.value
 
 
-@locked
+@contextual
 def rangeproof_sign(
     nonce,
     value,
@@ -1073,7 +1173,7 @@ def rangeproof_sign(
     min_value=1,
     exp=0,
     min_bits=52,
-    context=_secp.ctx,
+    context=None,
 ):
     if value == 0:
         min_value = 0
@@ -1110,8 +1210,8 @@ def rangeproof_sign(
     return bytes(proof[: prooflen.contents.value])
 
 
-@locked
-def musig_pubkey_combine(*args, context=_secp.ctx):
+@contextual
+def musig_pubkey_combine(*args, context=None):
     pub = bytes(64)
     # TODO: strange that behaviour is different from pubkey_combine...
     pubkeys = b"".join(args)  # (c_char_p * len(args))(*args)
@@ -1124,9 +1224,9 @@ def musig_pubkey_combine(*args, context=_secp.ctx):
 
 
 # surjection proof
-@locked
+@contextual
 def surjectionproof_initialize(
-    in_tags, out_tag, seed, tags_to_use=None, iterations=100, context=_secp.ctx
+    in_tags, out_tag, seed, tags_to_use=None, iterations=100, context=None
 ):
     if tags_to_use is None:
         tags_to_use = min(3, len(in_tags))
@@ -1152,9 +1252,9 @@ def surjectionproof_initialize(
     return proof, input_index.contents.value
 
 
-@locked
+@contextual
 def surjectionproof_generate(
-    proof, in_idx, in_tags, out_tag, in_abf, out_abf, context=_secp.ctx
+    proof, in_idx, in_tags, out_tag, in_abf, out_abf, context=None
 ):
     res = _secp.secp256k1_surjectionproof_generate(
         context,
@@ -1171,16 +1271,16 @@ def surjectionproof_generate(
     return proof
 
 
-@locked
-def surjectionproof_verify(proof, in_tags, out_tag, context=_secp.ctx):
+@contextual
+def surjectionproof_verify(proof, in_tags, out_tag, context=None):
     res = _secp.secp256k1_surjectionproof_verify(
         context, proof, b"".join(in_tags), len(in_tags), out_tag
     )
     return bool(res)
 
 
-@locked
-def surjectionproof_serialize(proof, context=_secp.ctx):
+@contextual
+def surjectionproof_serialize(proof, context=None):
     s = _secp.secp256k1_surjectionproof_serialized_size(context, proof)
     b = bytes(s)
     pointer = POINTER(c_size_t)
@@ -1191,8 +1291,8 @@ def surjectionproof_serialize(proof, context=_secp.ctx):
     return b
 
 
-@locked
-def surjectionproof_parse(proof, context=_secp.ctx):
+@contextual
+def surjectionproof_parse(proof, context=None):
     parsed_proof = bytes(4 + 8 + 256 // 8 + 32 * 257)
     res = _secp.secp256k1_surjectionproof_parse(
         context, parsed_proof, proof, len(proof)
@@ -6,12 +6,14 @@ import random
 import hmac
 import hashlib
 
+# hashes may import this module while it is being initialized,
+# so tagged_hash is looked up at call time
+from .. import hashes
+
 
 def TaggedHash(tag, data):
-    ss = hashlib.sha256(tag.encode("utf-8")).digest()
-    ss += ss
-    ss += data
-    return hashlib.sha256(ss).digest()
+    # uses cached midstates of the tags
+    return hashes.tagged_hash(tag, data)
 
 
 def modinv(a, n):
@@ -78,12 +80,40 @@ def modsqrt(a, p):
     return None
 
 
+def wnaf(n, w):
+    """Width-w non-adjacent form of a non-negative n, least significant digit first"""
+    res = []
+    full = 1 << w
+    half = 1 << (w - 1)
+    while n:
+        if n & 1:
+            d = n & (full - 1)
+            if d >= half:
+                d -= full
+            n -= d
+        else:
+            d = 0
+        res.append(d)
+        n >>= 1
+    return res
+
+
+# number of points when EllipticCurve.mul switches from Strauss to Pippenger
+PIPPENGER_THRESHOLD = 128
+
+
 class EllipticCurve:
-    def __init__(self, p, a, b):
-        """Initialize elliptic curve y^2 = x^3 + a*x + b over GF(p)."""
+    def __init__(self, p, a, b, glv=None):
+        """Initialize elliptic curve y^2 = x^3 + a*x + b over GF(p).
+
+        glv is an optional (order, beta, lambda, a1, b1, a2, b2) tuple
+        describing the endomorphism lambda * (x, y) = (beta * x, y)
+        and the lattice basis (a1, b1), (a2, b2) used to split scalars.
+        """
         self.p = p
         self.a = a % p
         self.b = b % p
+        self.glv = glv
 
     def affine(self, p1):
         """Convert a Jacobian point tuple p1 to affine form, or None if at infinity.
@@ -92,11 +122,38 @@ class EllipticCurve:
         x1, y1, z1 = p1
         if z1 == 0:
             return None
+        if z1 == 1:
+            return p1
         inv = modinv(z1, self.p)
         inv_2 = (inv**2) % self.p
         inv_3 = (inv_2 * inv) % self.p
         return ((inv_2 * x1) % self.p, (inv_3 * y1) % self.p, 1)
 
+    def affine_batch(self, points):
+        """Convert a list of Jacobian point tuples to affine form with a single inversion.
+
+        Uses Montgomery's trick. Points at infinity are converted to None."""
+        # prefix[i] is a product of all non-zero z before point i
+        prefix = []
+        acc = 1
+        for x1, y1, z1 in points:
+            prefix.append(acc)
+            if z1 != 0:
+                acc = (acc * z1) % self.p
+        inv = modinv(acc, self.p)
+        res = [None] * len(points)
+        for i in range(len(points) - 1, -1, -1):
+            x1, y1, z1 = points[i]
+            if z1 == 0:
+                continue
+            # inv is 1/(z_0 * ... * z_i) here
+            zinv = (inv * prefix[i]) % self.p
+            inv = (inv * z1) % self.p
+            zinv_2 = (zinv**2) % self.p
+            zinv_3 = (zinv_2 * zinv) % self.p
+            res[i] = ((zinv_2 * x1) % self.p, (zinv_3 * y1) % self.p, 1)
+        return res
+
     def has_even_y(self, p1):
         """Whether the point p1 has an even Y coordinate when expressed in affine coordinates."""
         return not (p1[2] == 0 or self.affine(p1)[1] & 1)
@@ -230,29 +287,184 @@ class EllipticCurve:
         z3 = (h * z1 * z2) % self.p
         return (x3, y3, z3)
 
+    def split_scalar(self, n):
+        """Split scalar n to (n1, n2) of about half length, n = n1 + n2 * lambda
+
+        n1 and n2 can be negative. Requires GLV parameters of the curve.
+        """
+        order, beta, lam, a1, b1, a2, b2 = self.glv
+        n = n % order
+        # rounded divisions
+        c1 = (b2 * n + order // 2) // order
+        c2 = (-b1 * n + order // 2) // order
+        n1 = n - c1 * a1 - c2 * a2
+        n2 = -c1 * b1 - c2 * b2
+        return n1, n2
+
+    def endomorphism(self, p1):
+        """Compute lambda * p1 for a Jacobian tuple p1, only one multiplication"""
+        x1, y1, z1 = p1
+        return ((self.glv[1] * x1) % self.p, y1, z1)
+
+    def mul_glv(self, ps):
+        """Replace every (point, scalar) pair by two pairs with half-length scalars"""
+        res = []
+        for p, n in ps:
+            n1, n2 = self.split_scalar(n)
+            p2 = self.endomorphism(p)
+            if n1 < 0:
+                p, n1 = self.negate(p), -n1
+            if n2 < 0:
+                p2, n2 = self.negate(p2), -n2
+            res += [(p, n1), (p2, n2)]
+        return res
+
     def mul(self, ps):
         """Compute a (multi) point multiplication
 
         ps is a list of (Jacobian tuple, scalar) pairs.
+        Uses interleaved wNAF for a few points and the bucket method for many,
+        scalars are split in halves if the curve has an efficient endomorphism.
         """
+        if self.glv is not None:
+            ps = self.mul_glv(ps)
+        if len(ps) < PIPPENGER_THRESHOLD:
+            return self.mul_strauss(ps)
+        return self.mul_pippenger(ps)
+
+    def mul_strauss(self, ps, w=5):
+        """Compute a (multi) point multiplication with interleaved wNAF (Strauss)
+
+        ps is a list of (Jacobian tuple, scalar) pairs.
+        """
+        tables = []
+        nafs = []
+        for p, n in ps:
+            if n == 0 or p[2] == 0:
+                continue
+            # odd multiples p, 3p, 5p, ... (2**(w-1) - 1)p
+            p2 = self.double(p)
+            table = [p]
+            for i in range((1 << (w - 2)) - 1):
+                table.append(self.add(table[-1], p2))
+            tables.append(table)
+            nafs.append(wnaf(n, w))
         r = (0, 1, 0)
-        for i in range(255, -1, -1):
+        if not nafs:
+            return r
+        for i in range(max(len(naf) for naf in nafs) - 1, -1, -1):
             r = self.double(r)
+            for table, naf in zip(tables, nafs):
+                if i >= len(naf):
+                    continue
+                d = naf[i]
+                if d > 0:
+                    r = self.add(r, table[d >> 1])
+                elif d < 0:
+                    r = self.add(r, self.negate(table[(-d) >> 1]))
+        return r
+
+    def mul_pippenger(self, ps):
+        """Compute a (multi) point multiplication with the bucket method (Pippenger)
+
+        ps is a list of (Jacobian tuple, scalar) pairs.
+        """
+        ps = [(p, n) for p, n in ps if n != 0 and p[2] != 0]
+        r = (0, 1, 0)
+        if not ps:
+            return r
+        # window size grows with the number of points
+        c = max(2, len(ps).bit_length() - 3)
+        mask = (1 << c) - 1
+        bits = max(n.bit_length() for _, n in ps)
+        for shift in range(((bits - 1) // c) * c, -1, -c):
+            for i in range(c):
+                r = self.double(r)
+            # buckets[j] is a sum of all points with window equal to j + 1
+            buckets = [None] * mask
             for p, n in ps:
-                if (n >> i) & 1:
-                    r = self.add(r, p)
+                d = (n >> shift) & mask
+                if d:
+                    b = buckets[d - 1]
+                    buckets[d - 1] = p if b is None else self.add(b, p)
+            # sum((j + 1) * buckets[j]) using running sums
+            running = (0, 1, 0)
+            acc = (0, 1, 0)
+            for b in reversed(buckets):
+                if b is not None:
+                    running = self.add(running, b)
+                acc = self.add(acc, running)
+            r = self.add(r, acc)
+        return r
+
+    def precompute(self, p1, w=4):
+        """Precompute a table for fixed-base multiplication by an affine point p1.
+
+        table[i][j] is the affine point (j + 1) * 2**(w*i) * p1, so n * p1
+        is a sum of one table point per w-bit window of n, without doublings.
+        """
+        points = []
+        base = p1
+        size = 2**w - 1
+        for i in range((256 + w - 1) // w):
+            row = [base]
+            for j in range(size - 1):
+                row.append(self.add(row[-1], base))
+            points += row
+            # 2**w * base
+            base = self.add(row[-1], base)
+        # one inversion for the whole table
+        points = self.affine_batch(points)
+        return [points[i : i + size] for i in range(0, len(points), size)]
+
+    def mul_fixed(self, table, n):
+        """Compute n * p1 where table is the result of precompute(p1).
+
+        n should be less than 2**256.
+        """
+        mask = len(table[0])
+        w = mask.bit_length()
+        r = (0, 1, 0)
+        i = 0
+        while n:
+            d = n & mask
+            if d:
+                r = self.add_mixed(r, table[i][d - 1])
+            n >>= w
+            i += 1
         return r
 
 
 SECP256K1_FIELD_SIZE = 2**256 - 2**32 - 977
-SECP256K1 = EllipticCurve(SECP256K1_FIELD_SIZE, 0, 7)
+SECP256K1_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+SECP256K1_ORDER_HALF = SECP256K1_ORDER // 2
+# GLV endomorphism parameters, see secp256k1/src/scalar_impl.h
+SECP256K1_GLV = (
+    SECP256K1_ORDER,
+    0x7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE,  # beta
+    0x5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72,  # lambda
+    0x3086D221A7D46BCDE86C90E49284EB15,  # a1
+    -0xE4437ED6010E88286F547FA90ABFE4C3,  # b1
+    0x114CA50F7A8E2F3F657C1108D9D44CFD8,  # a2
+    0x3086D221A7D46BCDE86C90E49284EB15,  # b2
+)
+SECP256K1 = EllipticCurve(SECP256K1_FIELD_SIZE, 0, 7, glv=SECP256K1_GLV)
 SECP256K1_G = (
     0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
     0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
     1,
 )
-SECP256K1_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
-SECP256K1_ORDER_HALF = SECP256K1_ORDER // 2
+
+# fixed-base table for the generator, built on first use
+_SECP256K1_G_TABLE = None
+
+
+def mul_generator(n):
+    """Compute n * G using precomputed table of multiples of G"""
+    global _SECP256K1_G_TABLE
+    if _SECP256K1_G_TABLE is None:
+        _SECP256K1_G_TABLE = SECP256K1.precompute(SECP256K1_G)
+    return SECP256K1.mul_fixed(_SECP256K1_G_TABLE, n % SECP256K1_ORDER)
 
 
 class ECPubKey:
@@ -359,7 +571,9 @@ class ECPubKey:
         w = modinv(s, SECP256K1_ORDER)
         u1 = z * w % SECP256K1_ORDER
         u2 = r * w % SECP256K1_ORDER
-        R = SECP256K1.affine(SECP256K1.mul([(SECP256K1_G, u1), (self.p, u2)]))
+        R = SECP256K1.affine(
+            SECP256K1.add(mul_generator(u1), SECP256K1.mul([(self.p, u2)]))
+        )
         if R is None or (R[0] % SECP256K1_ORDER) != r:
             return False
         return True
@@ -406,7 +620,7 @@ class ECKey:
         """Compute an ECPubKey object for this secret key."""
         assert self.valid
         ret = ECPubKey()
-        p = SECP256K1.mul([(SECP256K1_G, self.secret)])
+        p = mul_generator(self.secret)
         ret.p = p
         ret.valid = True
         ret.compressed = self.compressed
@@ -422,7 +636,7 @@ class ECKey:
         if nonce_function is None:
             nonce_function = deterministic_k
         k = nonce_function(self.secret, z, extra_data=extra_data)
-        R = SECP256K1.affine(SECP256K1.mul([(SECP256K1_G, k)]))
+        R = SECP256K1.affine(mul_generator(k))
         r = R[0] % SECP256K1_ORDER
         s = (modinv(k, SECP256K1_ORDER) * (z + self.secret * r)) % SECP256K1_ORDER
         if low_s and s > SECP256K1_ORDER_HALF:
@@ -474,7 +688,7 @@ def compute_xonly_pubkey(key):
     x = int.from_bytes(key, "big")
     if x == 0 or x >= SECP256K1_ORDER:
         return (None, None)
-    P = SECP256K1.affine(SECP256K1.mul([(SECP256K1_G, x)]))
+    P = SECP256K1.affine(mul_generator(x))
     return (P[0].to_bytes(32, "big"), not SECP256K1.has_even_y(P))
 
 
@@ -487,7 +701,7 @@ def tweak_add_privkey(key, tweak):
     x = int.from_bytes(key, "big")
     if x == 0 or x >= SECP256K1_ORDER:
         return None
-    if not SECP256K1.has_even_y(SECP256K1.mul([(SECP256K1_G, x)])):
+    if not SECP256K1.has_even_y(mul_generator(x)):
         x = SECP256K1_ORDER - x
     t = int.from_bytes(tweak, "big")
     if t >= SECP256K1_ORDER:
@@ -513,7 +727,7 @@ def tweak_add_pubkey(key, tweak):
     t = int.from_bytes(tweak, "big")
     if t >= SECP256K1_ORDER:
         return None
-    Q = SECP256K1.affine(SECP256K1.mul([(SECP256K1_G, t), (P, 1)]))
+    Q = SECP256K1.affine(SECP256K1.add(mul_generator(t), P))
     if Q is None:
         return None
     return (Q[0].to_bytes(32, "big"), not SECP256K1.has_even_y(Q))
@@ -545,7 +759,7 @@ def verify_schnorr(key, sig, msg):
         int.from_bytes(TaggedHash("BIP0340/challenge", sig[0:32] + key + msg), "big")
         % SECP256K1_ORDER
     )
-    R = SECP256K1.mul([(SECP256K1_G, s), (P, SECP256K1_ORDER - e)])
+    R = SECP256K1.add(mul_generator(s), SECP256K1.mul([(P, SECP256K1_ORDER - e)]))
     if not SECP256K1.has_even_y(R):
         return False
     if ((r * R[2] * R[2]) % SECP256K1_FIELD_SIZE) != R[0]:
@@ -553,8 +767,66 @@ def verify_schnorr(key, sig, msg):
     return True
 
 
-def sign_schnorr(key, msg, aux=None, flip_p=False, flip_r=False):
-    """Create a Schnorr signature (see BIP 340)."""
+def verify_schnorr_batch(keys, sigs, msgs):
+    """Verify a batch of Schnorr signatures at once (see BIP 340, Batch Verification).
+    - keys, sigs and msgs are lists of 32-byte xonly pubkeys,
+      64-byte signatures and 32-byte messages.
+
+    Returns True only if all the signatures are valid.
+    """
+    assert len(keys) == len(sigs) == len(msgs)
+    # randomizers are derived from all the inputs of the batch
+    seed = hashlib.sha256(b"".join(keys) + b"".join(sigs) + b"".join(msgs)).digest()
+    s_sum = 0
+    ps = []
+    for i in range(len(keys)):
+        key, sig, msg = keys[i], sigs[i], msgs[i]
+        assert len(key) == 32
+        assert len(msg) == 32
+        assert len(sig) == 64
+        x_coord = int.from_bytes(key, "big")
+        if x_coord == 0 or x_coord >= SECP256K1_FIELD_SIZE:
+            return False
+        P = SECP256K1.lift_x(x_coord)
+        if P is None:
+            return False
+        r = int.from_bytes(sig[0:32], "big")
+        if r >= SECP256K1_FIELD_SIZE:
+            return False
+        R = SECP256K1.lift_x(r)
+        if R is None:
+            return False
+        s = int.from_bytes(sig[32:64], "big")
+        if s >= SECP256K1_ORDER:
+            return False
+        e = (
+            int.from_bytes(
+                TaggedHash("BIP0340/challenge", sig[0:32] + key + msg), "big"
+            )
+            % SECP256K1_ORDER
+        )
+        if i == 0:
+            a = 1
+        else:
+            a = (
+                int.from_bytes(
+                    TaggedHash("BIP0340/batch", seed + i.to_bytes(4, "big")), "big"
+                )
+                % (SECP256K1_ORDER - 1)
+                + 1
+            )
+        s_sum = (s_sum + a * s) % SECP256K1_ORDER
+        ps.append((R, a))
+        ps.append((P, (a * e) % SECP256K1_ORDER))
+    # sum(a*s)*G == sum(a*R) + sum(a*e*P)
+    Q = SECP256K1.add(mul_generator(SECP256K1_ORDER - s_sum), SECP256K1.mul(ps))
+    return Q[2] == 0
+
+
+def sign_schnorr(key, msg, aux=None, flip_p=False, flip_r=False, pubkey=None):
+    """Create a Schnorr signature (see BIP 340).
+
+    pubkey is an optional precomputed affine point of the key."""
 
     assert len(key) == 32
     assert len(msg) == 32
@@ -564,7 +836,7 @@ def sign_schnorr(key, msg, aux=None, flip_p=False, flip_r=False):
     sec = int.from_bytes(key, "big")
     if sec == 0 or sec >= SECP256K1_ORDER:
         return None
-    P = SECP256K1.affine(SECP256K1.mul([(SECP256K1_G, sec)]))
+    P = pubkey or SECP256K1.affine(mul_generator(sec))
     if SECP256K1.has_even_y(P) == flip_p:
         sec = SECP256K1_ORDER - sec
     if aux is not None:
@@ -580,7 +852,7 @@ def sign_schnorr(key, msg, aux=None, flip_p=False, flip_r=False):
         % SECP256K1_ORDER
     )
     assert kp != 0
-    R = SECP256K1.affine(SECP256K1.mul([(SECP256K1_G, kp)]))
+    R = SECP256K1.affine(mul_generator(kp))
     k = kp if SECP256K1.has_even_y(R) != flip_r else SECP256K1_ORDER - kp
     e = (
         int.from_bytes(
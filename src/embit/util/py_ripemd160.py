@@ -1,7 +1,14 @@
 # Copyright (c) 2021 Pieter Wuille
 # Distributed under the MIT software license, see the accompanying
 # file COPYING or http://www.opensource.org/licenses/mit-license.php.
-"""Pure Python RIPEMD160 implementation."""
+"""
+Pure Python RIPEMD160 implementation.
+Rounds of the compression function are unrolled from the tables below
+with constants, rotations and message indexes inlined.
+"""
+from struct import pack, unpack
+
+# Tables from the specification, compress() has them inlined.
 
 # Message schedule indexes for the left path.
 ML = [
@@ -346,54 +353,527 @@ KL = [0, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E]
 KR = [0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0]
 
 
-def fi(x, y, z, i):
-    """The f1, f2, f3, f4, and f5 functions from the specification."""
-    if i == 0:
-        return x ^ y ^ z
-    elif i == 1:
-        return (x & y) | (~x & z)
-    elif i == 2:
-        return (x | ~y) ^ z
-    elif i == 3:
-        return (x & z) | (y & ~z)
-    elif i == 4:
-        return x ^ (y | ~z)
-    else:
-        assert False
-
-
-def rol(x, i):
-    """Rotate the bottom 32 bits of x left by i bits."""
-    return ((x << i) | ((x & 0xFFFFFFFF) >> (32 - i))) & 0xFFFFFFFF
-
-
 def compress(h0, h1, h2, h3, h4, block):
     """Compress state (h0, h1, h2, h3, h4) with block."""
-    # Left path variables.
+    # Message words.
+    (x0, x1, x2, x3, x4, x5, x6, x7, x8, x9, x10, x11, x12, x13, x14, x15) = unpack(
+        "<16I", block
+    )
+    # Left path.
     al, bl, cl, dl, el = h0, h1, h2, h3, h4
-    # Right path variables.
+    # Round 1, f1.
+    al = (al + (bl ^ cl ^ dl) + x0) & 0xFFFFFFFF
+    al = (((al << 11) | (al >> 21)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (al ^ bl ^ cl) + x1) & 0xFFFFFFFF
+    el = (((el << 14) | (el >> 18)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (el ^ al ^ bl) + x2) & 0xFFFFFFFF
+    dl = (((dl << 15) | (dl >> 17)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (dl ^ el ^ al) + x3) & 0xFFFFFFFF
+    cl = (((cl << 12) | (cl >> 20)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (cl ^ dl ^ el) + x4) & 0xFFFFFFFF
+    bl = (((bl << 5) | (bl >> 27)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (bl ^ cl ^ dl) + x5) & 0xFFFFFFFF
+    al = (((al << 8) | (al >> 24)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (al ^ bl ^ cl) + x6) & 0xFFFFFFFF
+    el = (((el << 7) | (el >> 25)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (el ^ al ^ bl) + x7) & 0xFFFFFFFF
+    dl = (((dl << 9) | (dl >> 23)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (dl ^ el ^ al) + x8) & 0xFFFFFFFF
+    cl = (((cl << 11) | (cl >> 21)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (cl ^ dl ^ el) + x9) & 0xFFFFFFFF
+    bl = (((bl << 13) | (bl >> 19)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (bl ^ cl ^ dl) + x10) & 0xFFFFFFFF
+    al = (((al << 14) | (al >> 18)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (al ^ bl ^ cl) + x11) & 0xFFFFFFFF
+    el = (((el << 15) | (el >> 17)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (el ^ al ^ bl) + x12) & 0xFFFFFFFF
+    dl = (((dl << 6) | (dl >> 26)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (dl ^ el ^ al) + x13) & 0xFFFFFFFF
+    cl = (((cl << 7) | (cl >> 25)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (cl ^ dl ^ el) + x14) & 0xFFFFFFFF
+    bl = (((bl << 9) | (bl >> 23)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (bl ^ cl ^ dl) + x15) & 0xFFFFFFFF
+    al = (((al << 8) | (al >> 24)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    # Round 2, f2.
+    el = (el + (cl ^ (al & (bl ^ cl))) + x7 + 0x5A827999) & 0xFFFFFFFF
+    el = (((el << 7) | (el >> 25)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (bl ^ (el & (al ^ bl))) + x4 + 0x5A827999) & 0xFFFFFFFF
+    dl = (((dl << 6) | (dl >> 26)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (al ^ (dl & (el ^ al))) + x13 + 0x5A827999) & 0xFFFFFFFF
+    cl = (((cl << 8) | (cl >> 24)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (el ^ (cl & (dl ^ el))) + x1 + 0x5A827999) & 0xFFFFFFFF
+    bl = (((bl << 13) | (bl >> 19)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (dl ^ (bl & (cl ^ dl))) + x10 + 0x5A827999) & 0xFFFFFFFF
+    al = (((al << 11) | (al >> 21)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (cl ^ (al & (bl ^ cl))) + x6 + 0x5A827999) & 0xFFFFFFFF
+    el = (((el << 9) | (el >> 23)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (bl ^ (el & (al ^ bl))) + x15 + 0x5A827999) & 0xFFFFFFFF
+    dl = (((dl << 7) | (dl >> 25)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (al ^ (dl & (el ^ al))) + x3 + 0x5A827999) & 0xFFFFFFFF
+    cl = (((cl << 15) | (cl >> 17)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (el ^ (cl & (dl ^ el))) + x12 + 0x5A827999) & 0xFFFFFFFF
+    bl = (((bl << 7) | (bl >> 25)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (dl ^ (bl & (cl ^ dl))) + x0 + 0x5A827999) & 0xFFFFFFFF
+    al = (((al << 12) | (al >> 20)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (cl ^ (al & (bl ^ cl))) + x9 + 0x5A827999) & 0xFFFFFFFF
+    el = (((el << 15) | (el >> 17)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (bl ^ (el & (al ^ bl))) + x5 + 0x5A827999) & 0xFFFFFFFF
+    dl = (((dl << 9) | (dl >> 23)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (al ^ (dl & (el ^ al))) + x2 + 0x5A827999) & 0xFFFFFFFF
+    cl = (((cl << 11) | (cl >> 21)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (el ^ (cl & (dl ^ el))) + x14 + 0x5A827999) & 0xFFFFFFFF
+    bl = (((bl << 7) | (bl >> 25)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (dl ^ (bl & (cl ^ dl))) + x11 + 0x5A827999) & 0xFFFFFFFF
+    al = (((al << 13) | (al >> 19)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (cl ^ (al & (bl ^ cl))) + x8 + 0x5A827999) & 0xFFFFFFFF
+    el = (((el << 12) | (el >> 20)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    # Round 3, f3.
+    dl = (dl + ((el | ~al) ^ bl) + x3 + 0x6ED9EBA1) & 0xFFFFFFFF
+    dl = (((dl << 11) | (dl >> 21)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + ((dl | ~el) ^ al) + x10 + 0x6ED9EBA1) & 0xFFFFFFFF
+    cl = (((cl << 13) | (cl >> 19)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + ((cl | ~dl) ^ el) + x14 + 0x6ED9EBA1) & 0xFFFFFFFF
+    bl = (((bl << 6) | (bl >> 26)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + ((bl | ~cl) ^ dl) + x4 + 0x6ED9EBA1) & 0xFFFFFFFF
+    al = (((al << 7) | (al >> 25)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + ((al | ~bl) ^ cl) + x9 + 0x6ED9EBA1) & 0xFFFFFFFF
+    el = (((el << 14) | (el >> 18)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + ((el | ~al) ^ bl) + x15 + 0x6ED9EBA1) & 0xFFFFFFFF
+    dl = (((dl << 9) | (dl >> 23)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + ((dl | ~el) ^ al) + x8 + 0x6ED9EBA1) & 0xFFFFFFFF
+    cl = (((cl << 13) | (cl >> 19)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + ((cl | ~dl) ^ el) + x1 + 0x6ED9EBA1) & 0xFFFFFFFF
+    bl = (((bl << 15) | (bl >> 17)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + ((bl | ~cl) ^ dl) + x2 + 0x6ED9EBA1) & 0xFFFFFFFF
+    al = (((al << 14) | (al >> 18)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + ((al | ~bl) ^ cl) + x7 + 0x6ED9EBA1) & 0xFFFFFFFF
+    el = (((el << 8) | (el >> 24)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + ((el | ~al) ^ bl) + x0 + 0x6ED9EBA1) & 0xFFFFFFFF
+    dl = (((dl << 13) | (dl >> 19)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + ((dl | ~el) ^ al) + x6 + 0x6ED9EBA1) & 0xFFFFFFFF
+    cl = (((cl << 6) | (cl >> 26)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + ((cl | ~dl) ^ el) + x13 + 0x6ED9EBA1) & 0xFFFFFFFF
+    bl = (((bl << 5) | (bl >> 27)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + ((bl | ~cl) ^ dl) + x11 + 0x6ED9EBA1) & 0xFFFFFFFF
+    al = (((al << 12) | (al >> 20)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + ((al | ~bl) ^ cl) + x5 + 0x6ED9EBA1) & 0xFFFFFFFF
+    el = (((el << 7) | (el >> 25)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + ((el | ~al) ^ bl) + x12 + 0x6ED9EBA1) & 0xFFFFFFFF
+    dl = (((dl << 5) | (dl >> 27)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    # Round 4, f4.
+    cl = (cl + (el ^ (al & (dl ^ el))) + x1 + 0x8F1BBCDC) & 0xFFFFFFFF
+    cl = (((cl << 11) | (cl >> 21)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (dl ^ (el & (cl ^ dl))) + x9 + 0x8F1BBCDC) & 0xFFFFFFFF
+    bl = (((bl << 12) | (bl >> 20)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (cl ^ (dl & (bl ^ cl))) + x11 + 0x8F1BBCDC) & 0xFFFFFFFF
+    al = (((al << 14) | (al >> 18)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (bl ^ (cl & (al ^ bl))) + x10 + 0x8F1BBCDC) & 0xFFFFFFFF
+    el = (((el << 15) | (el >> 17)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (al ^ (bl & (el ^ al))) + x0 + 0x8F1BBCDC) & 0xFFFFFFFF
+    dl = (((dl << 14) | (dl >> 18)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (el ^ (al & (dl ^ el))) + x8 + 0x8F1BBCDC) & 0xFFFFFFFF
+    cl = (((cl << 15) | (cl >> 17)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (dl ^ (el & (cl ^ dl))) + x12 + 0x8F1BBCDC) & 0xFFFFFFFF
+    bl = (((bl << 9) | (bl >> 23)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (cl ^ (dl & (bl ^ cl))) + x4 + 0x8F1BBCDC) & 0xFFFFFFFF
+    al = (((al << 8) | (al >> 24)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (bl ^ (cl & (al ^ bl))) + x13 + 0x8F1BBCDC) & 0xFFFFFFFF
+    el = (((el << 9) | (el >> 23)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (al ^ (bl & (el ^ al))) + x3 + 0x8F1BBCDC) & 0xFFFFFFFF
+    dl = (((dl << 14) | (dl >> 18)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (el ^ (al & (dl ^ el))) + x7 + 0x8F1BBCDC) & 0xFFFFFFFF
+    cl = (((cl << 5) | (cl >> 27)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (dl ^ (el & (cl ^ dl))) + x15 + 0x8F1BBCDC) & 0xFFFFFFFF
+    bl = (((bl << 6) | (bl >> 26)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (cl ^ (dl & (bl ^ cl))) + x14 + 0x8F1BBCDC) & 0xFFFFFFFF
+    al = (((al << 8) | (al >> 24)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (bl ^ (cl & (al ^ bl))) + x5 + 0x8F1BBCDC) & 0xFFFFFFFF
+    el = (((el << 6) | (el >> 26)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (al ^ (bl & (el ^ al))) + x6 + 0x8F1BBCDC) & 0xFFFFFFFF
+    dl = (((dl << 5) | (dl >> 27)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (el ^ (al & (dl ^ el))) + x2 + 0x8F1BBCDC) & 0xFFFFFFFF
+    cl = (((cl << 12) | (cl >> 20)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    # Round 5, f5.
+    bl = (bl + (cl ^ (dl | ~el)) + x4 + 0xA953FD4E) & 0xFFFFFFFF
+    bl = (((bl << 9) | (bl >> 23)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (bl ^ (cl | ~dl)) + x0 + 0xA953FD4E) & 0xFFFFFFFF
+    al = (((al << 15) | (al >> 17)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (al ^ (bl | ~cl)) + x5 + 0xA953FD4E) & 0xFFFFFFFF
+    el = (((el << 5) | (el >> 27)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (el ^ (al | ~bl)) + x9 + 0xA953FD4E) & 0xFFFFFFFF
+    dl = (((dl << 11) | (dl >> 21)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (dl ^ (el | ~al)) + x7 + 0xA953FD4E) & 0xFFFFFFFF
+    cl = (((cl << 6) | (cl >> 26)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (cl ^ (dl | ~el)) + x12 + 0xA953FD4E) & 0xFFFFFFFF
+    bl = (((bl << 8) | (bl >> 24)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (bl ^ (cl | ~dl)) + x2 + 0xA953FD4E) & 0xFFFFFFFF
+    al = (((al << 13) | (al >> 19)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (al ^ (bl | ~cl)) + x10 + 0xA953FD4E) & 0xFFFFFFFF
+    el = (((el << 12) | (el >> 20)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (el ^ (al | ~bl)) + x14 + 0xA953FD4E) & 0xFFFFFFFF
+    dl = (((dl << 5) | (dl >> 27)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (dl ^ (el | ~al)) + x1 + 0xA953FD4E) & 0xFFFFFFFF
+    cl = (((cl << 12) | (cl >> 20)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (cl ^ (dl | ~el)) + x3 + 0xA953FD4E) & 0xFFFFFFFF
+    bl = (((bl << 13) | (bl >> 19)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    al = (al + (bl ^ (cl | ~dl)) + x8 + 0xA953FD4E) & 0xFFFFFFFF
+    al = (((al << 14) | (al >> 18)) + el) & 0xFFFFFFFF
+    cl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+    el = (el + (al ^ (bl | ~cl)) + x11 + 0xA953FD4E) & 0xFFFFFFFF
+    el = (((el << 11) | (el >> 21)) + dl) & 0xFFFFFFFF
+    bl = ((bl << 10) | (bl >> 22)) & 0xFFFFFFFF
+    dl = (dl + (el ^ (al | ~bl)) + x6 + 0xA953FD4E) & 0xFFFFFFFF
+    dl = (((dl << 8) | (dl >> 24)) + cl) & 0xFFFFFFFF
+    al = ((al << 10) | (al >> 22)) & 0xFFFFFFFF
+    cl = (cl + (dl ^ (el | ~al)) + x15 + 0xA953FD4E) & 0xFFFFFFFF
+    cl = (((cl << 5) | (cl >> 27)) + bl) & 0xFFFFFFFF
+    el = ((el << 10) | (el >> 22)) & 0xFFFFFFFF
+    bl = (bl + (cl ^ (dl | ~el)) + x13 + 0xA953FD4E) & 0xFFFFFFFF
+    bl = (((bl << 6) | (bl >> 26)) + al) & 0xFFFFFFFF
+    dl = ((dl << 10) | (dl >> 22)) & 0xFFFFFFFF
+    # Right path.
     ar, br, cr, dr, er = h0, h1, h2, h3, h4
-    # Message variables.
-    x = [int.from_bytes(block[4 * i : 4 * (i + 1)], "little") for i in range(16)]
+    # Round 1, f5.
+    ar = (ar + (br ^ (cr | ~dr)) + x5 + 0x50A28BE6) & 0xFFFFFFFF
+    ar = (((ar << 8) | (ar >> 24)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (ar ^ (br | ~cr)) + x14 + 0x50A28BE6) & 0xFFFFFFFF
+    er = (((er << 9) | (er >> 23)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (er ^ (ar | ~br)) + x7 + 0x50A28BE6) & 0xFFFFFFFF
+    dr = (((dr << 9) | (dr >> 23)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (dr ^ (er | ~ar)) + x0 + 0x50A28BE6) & 0xFFFFFFFF
+    cr = (((cr << 11) | (cr >> 21)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (cr ^ (dr | ~er)) + x9 + 0x50A28BE6) & 0xFFFFFFFF
+    br = (((br << 13) | (br >> 19)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (br ^ (cr | ~dr)) + x2 + 0x50A28BE6) & 0xFFFFFFFF
+    ar = (((ar << 15) | (ar >> 17)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (ar ^ (br | ~cr)) + x11 + 0x50A28BE6) & 0xFFFFFFFF
+    er = (((er << 15) | (er >> 17)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (er ^ (ar | ~br)) + x4 + 0x50A28BE6) & 0xFFFFFFFF
+    dr = (((dr << 5) | (dr >> 27)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (dr ^ (er | ~ar)) + x13 + 0x50A28BE6) & 0xFFFFFFFF
+    cr = (((cr << 7) | (cr >> 25)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (cr ^ (dr | ~er)) + x6 + 0x50A28BE6) & 0xFFFFFFFF
+    br = (((br << 7) | (br >> 25)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (br ^ (cr | ~dr)) + x15 + 0x50A28BE6) & 0xFFFFFFFF
+    ar = (((ar << 8) | (ar >> 24)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (ar ^ (br | ~cr)) + x8 + 0x50A28BE6) & 0xFFFFFFFF
+    er = (((er << 11) | (er >> 21)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (er ^ (ar | ~br)) + x1 + 0x50A28BE6) & 0xFFFFFFFF
+    dr = (((dr << 14) | (dr >> 18)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (dr ^ (er | ~ar)) + x10 + 0x50A28BE6) & 0xFFFFFFFF
+    cr = (((cr << 14) | (cr >> 18)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (cr ^ (dr | ~er)) + x3 + 0x50A28BE6) & 0xFFFFFFFF
+    br = (((br << 12) | (br >> 20)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (br ^ (cr | ~dr)) + x12 + 0x50A28BE6) & 0xFFFFFFFF
+    ar = (((ar << 6) | (ar >> 26)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    # Round 2, f4.
+    er = (er + (br ^ (cr & (ar ^ br))) + x6 + 0x5C4DD124) & 0xFFFFFFFF
+    er = (((er << 9) | (er >> 23)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (ar ^ (br & (er ^ ar))) + x11 + 0x5C4DD124) & 0xFFFFFFFF
+    dr = (((dr << 13) | (dr >> 19)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (er ^ (ar & (dr ^ er))) + x3 + 0x5C4DD124) & 0xFFFFFFFF
+    cr = (((cr << 15) | (cr >> 17)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (dr ^ (er & (cr ^ dr))) + x7 + 0x5C4DD124) & 0xFFFFFFFF
+    br = (((br << 7) | (br >> 25)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (cr ^ (dr & (br ^ cr))) + x0 + 0x5C4DD124) & 0xFFFFFFFF
+    ar = (((ar << 12) | (ar >> 20)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (br ^ (cr & (ar ^ br))) + x13 + 0x5C4DD124) & 0xFFFFFFFF
+    er = (((er << 8) | (er >> 24)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (ar ^ (br & (er ^ ar))) + x5 + 0x5C4DD124) & 0xFFFFFFFF
+    dr = (((dr << 9) | (dr >> 23)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (er ^ (ar & (dr ^ er))) + x10 + 0x5C4DD124) & 0xFFFFFFFF
+    cr = (((cr << 11) | (cr >> 21)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (dr ^ (er & (cr ^ dr))) + x14 + 0x5C4DD124) & 0xFFFFFFFF
+    br = (((br << 7) | (br >> 25)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (cr ^ (dr & (br ^ cr))) + x15 + 0x5C4DD124) & 0xFFFFFFFF
+    ar = (((ar << 7) | (ar >> 25)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (br ^ (cr & (ar ^ br))) + x8 + 0x5C4DD124) & 0xFFFFFFFF
+    er = (((er << 12) | (er >> 20)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (ar ^ (br & (er ^ ar))) + x12 + 0x5C4DD124) & 0xFFFFFFFF
+    dr = (((dr << 7) | (dr >> 25)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (er ^ (ar & (dr ^ er))) + x4 + 0x5C4DD124) & 0xFFFFFFFF
+    cr = (((cr << 6) | (cr >> 26)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (dr ^ (er & (cr ^ dr))) + x9 + 0x5C4DD124) & 0xFFFFFFFF
+    br = (((br << 15) | (br >> 17)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (cr ^ (dr & (br ^ cr))) + x1 + 0x5C4DD124) & 0xFFFFFFFF
+    ar = (((ar << 13) | (ar >> 19)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (br ^ (cr & (ar ^ br))) + x2 + 0x5C4DD124) & 0xFFFFFFFF
+    er = (((er << 11) | (er >> 21)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    # Round 3, f3.
+    dr = (dr + ((er | ~ar) ^ br) + x15 + 0x6D703EF3) & 0xFFFFFFFF
+    dr = (((dr << 9) | (dr >> 23)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + ((dr | ~er) ^ ar) + x5 + 0x6D703EF3) & 0xFFFFFFFF
+    cr = (((cr << 7) | (cr >> 25)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + ((cr | ~dr) ^ er) + x1 + 0x6D703EF3) & 0xFFFFFFFF
+    br = (((br << 15) | (br >> 17)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + ((br | ~cr) ^ dr) + x3 + 0x6D703EF3) & 0xFFFFFFFF
+    ar = (((ar << 11) | (ar >> 21)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + ((ar | ~br) ^ cr) + x7 + 0x6D703EF3) & 0xFFFFFFFF
+    er = (((er << 8) | (er >> 24)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + ((er | ~ar) ^ br) + x14 + 0x6D703EF3) & 0xFFFFFFFF
+    dr = (((dr << 6) | (dr >> 26)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + ((dr | ~er) ^ ar) + x6 + 0x6D703EF3) & 0xFFFFFFFF
+    cr = (((cr << 6) | (cr >> 26)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + ((cr | ~dr) ^ er) + x9 + 0x6D703EF3) & 0xFFFFFFFF
+    br = (((br << 14) | (br >> 18)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + ((br | ~cr) ^ dr) + x11 + 0x6D703EF3) & 0xFFFFFFFF
+    ar = (((ar << 12) | (ar >> 20)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + ((ar | ~br) ^ cr) + x8 + 0x6D703EF3) & 0xFFFFFFFF
+    er = (((er << 13) | (er >> 19)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + ((er | ~ar) ^ br) + x12 + 0x6D703EF3) & 0xFFFFFFFF
+    dr = (((dr << 5) | (dr >> 27)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + ((dr | ~er) ^ ar) + x2 + 0x6D703EF3) & 0xFFFFFFFF
+    cr = (((cr << 14) | (cr >> 18)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + ((cr | ~dr) ^ er) + x10 + 0x6D703EF3) & 0xFFFFFFFF
+    br = (((br << 13) | (br >> 19)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + ((br | ~cr) ^ dr) + x0 + 0x6D703EF3) & 0xFFFFFFFF
+    ar = (((ar << 13) | (ar >> 19)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + ((ar | ~br) ^ cr) + x4 + 0x6D703EF3) & 0xFFFFFFFF
+    er = (((er << 7) | (er >> 25)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + ((er | ~ar) ^ br) + x13 + 0x6D703EF3) & 0xFFFFFFFF
+    dr = (((dr << 5) | (dr >> 27)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    # Round 4, f2.
+    cr = (cr + (ar ^ (dr & (er ^ ar))) + x8 + 0x7A6D76E9) & 0xFFFFFFFF
+    cr = (((cr << 15) | (cr >> 17)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (er ^ (cr & (dr ^ er))) + x6 + 0x7A6D76E9) & 0xFFFFFFFF
+    br = (((br << 5) | (br >> 27)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (dr ^ (br & (cr ^ dr))) + x4 + 0x7A6D76E9) & 0xFFFFFFFF
+    ar = (((ar << 8) | (ar >> 24)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (cr ^ (ar & (br ^ cr))) + x1 + 0x7A6D76E9) & 0xFFFFFFFF
+    er = (((er << 11) | (er >> 21)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (br ^ (er & (ar ^ br))) + x3 + 0x7A6D76E9) & 0xFFFFFFFF
+    dr = (((dr << 14) | (dr >> 18)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (ar ^ (dr & (er ^ ar))) + x11 + 0x7A6D76E9) & 0xFFFFFFFF
+    cr = (((cr << 14) | (cr >> 18)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (er ^ (cr & (dr ^ er))) + x15 + 0x7A6D76E9) & 0xFFFFFFFF
+    br = (((br << 6) | (br >> 26)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (dr ^ (br & (cr ^ dr))) + x0 + 0x7A6D76E9) & 0xFFFFFFFF
+    ar = (((ar << 14) | (ar >> 18)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (cr ^ (ar & (br ^ cr))) + x5 + 0x7A6D76E9) & 0xFFFFFFFF
+    er = (((er << 6) | (er >> 26)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (br ^ (er & (ar ^ br))) + x12 + 0x7A6D76E9) & 0xFFFFFFFF
+    dr = (((dr << 9) | (dr >> 23)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (ar ^ (dr & (er ^ ar))) + x2 + 0x7A6D76E9) & 0xFFFFFFFF
+    cr = (((cr << 12) | (cr >> 20)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (er ^ (cr & (dr ^ er))) + x13 + 0x7A6D76E9) & 0xFFFFFFFF
+    br = (((br << 9) | (br >> 23)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (dr ^ (br & (cr ^ dr))) + x9 + 0x7A6D76E9) & 0xFFFFFFFF
+    ar = (((ar << 12) | (ar >> 20)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (cr ^ (ar & (br ^ cr))) + x7 + 0x7A6D76E9) & 0xFFFFFFFF
+    er = (((er << 5) | (er >> 27)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (br ^ (er & (ar ^ br))) + x10 + 0x7A6D76E9) & 0xFFFFFFFF
+    dr = (((dr << 15) | (dr >> 17)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (ar ^ (dr & (er ^ ar))) + x14 + 0x7A6D76E9) & 0xFFFFFFFF
+    cr = (((cr << 8) | (cr >> 24)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    # Round 5, f1.
+    br = (br + (cr ^ dr ^ er) + x12) & 0xFFFFFFFF
+    br = (((br << 8) | (br >> 24)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (br ^ cr ^ dr) + x15) & 0xFFFFFFFF
+    ar = (((ar << 5) | (ar >> 27)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (ar ^ br ^ cr) + x10) & 0xFFFFFFFF
+    er = (((er << 12) | (er >> 20)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (er ^ ar ^ br) + x4) & 0xFFFFFFFF
+    dr = (((dr << 9) | (dr >> 23)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (dr ^ er ^ ar) + x1) & 0xFFFFFFFF
+    cr = (((cr << 12) | (cr >> 20)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (cr ^ dr ^ er) + x5) & 0xFFFFFFFF
+    br = (((br << 5) | (br >> 27)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (br ^ cr ^ dr) + x8) & 0xFFFFFFFF
+    ar = (((ar << 14) | (ar >> 18)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (ar ^ br ^ cr) + x7) & 0xFFFFFFFF
+    er = (((er << 6) | (er >> 26)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (er ^ ar ^ br) + x6) & 0xFFFFFFFF
+    dr = (((dr << 8) | (dr >> 24)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (dr ^ er ^ ar) + x2) & 0xFFFFFFFF
+    cr = (((cr << 13) | (cr >> 19)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (cr ^ dr ^ er) + x13) & 0xFFFFFFFF
+    br = (((br << 6) | (br >> 26)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    ar = (ar + (br ^ cr ^ dr) + x14) & 0xFFFFFFFF
+    ar = (((ar << 5) | (ar >> 27)) + er) & 0xFFFFFFFF
+    cr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+    er = (er + (ar ^ br ^ cr) + x0) & 0xFFFFFFFF
+    er = (((er << 15) | (er >> 17)) + dr) & 0xFFFFFFFF
+    br = ((br << 10) | (br >> 22)) & 0xFFFFFFFF
+    dr = (dr + (er ^ ar ^ br) + x3) & 0xFFFFFFFF
+    dr = (((dr << 13) | (dr >> 19)) + cr) & 0xFFFFFFFF
+    ar = ((ar << 10) | (ar >> 22)) & 0xFFFFFFFF
+    cr = (cr + (dr ^ er ^ ar) + x9) & 0xFFFFFFFF
+    cr = (((cr << 11) | (cr >> 21)) + br) & 0xFFFFFFFF
+    er = ((er << 10) | (er >> 22)) & 0xFFFFFFFF
+    br = (br + (cr ^ dr ^ er) + x11) & 0xFFFFFFFF
+    br = (((br << 11) | (br >> 21)) + ar) & 0xFFFFFFFF
+    dr = ((dr << 10) | (dr >> 22)) & 0xFFFFFFFF
+    # Compose old state, left transform, and right transform into new state.
+    return (
+        (h1 + cl + dr) & 0xFFFFFFFF,
+        (h2 + dl + er) & 0xFFFFFFFF,
+        (h3 + el + ar) & 0xFFFFFFFF,
+        (h4 + al + br) & 0xFFFFFFFF,
+        (h0 + bl + cr) & 0xFFFFFFFF,
+    )
 
-    # Iterate over the 80 rounds of the compression.
-    for j in range(80):
-        rnd = j >> 4
-        # Perform left side of the transformation.
-        al = rol(al + fi(bl, cl, dl, rnd) + x[ML[j]] + KL[rnd], RL[j]) + el
-        al, bl, cl, dl, el = el, al, bl, rol(cl, 10), dl
-        # Perform right side of the transformation.
-        ar = rol(ar + fi(br, cr, dr, 4 - rnd) + x[MR[j]] + KR[rnd], RR[j]) + er
-        ar, br, cr, dr, er = er, ar, br, rol(cr, 10), dr
 
-    # Compose old state, left transform, and right transform into new state.
-    return h1 + cl + dr, h2 + dl + er, h3 + el + ar, h4 + al + br, h0 + bl + cr
+# Initial state.
+IV = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+
+# Padding of 32-byte messages, hash160 always hashes sha256 digests.
+PAD32 = b"\x80" + b"\x00" * 23 + (256).to_bytes(8, "little")
 
 
 def ripemd160(data):
     """Compute the RIPEMD-160 hash of data."""
     # Initialize state.
-    state = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+    state = IV
     # Process full 64-byte blocks in the input.
     for b in range(len(data) >> 6):
         s1, s2, s3, s4, s5 = state  # Unpack state into individual variables
@@ -406,4 +886,17 @@ def ripemd160(data):
         s1, s2, s3, s4, s5 = state  # Unpack state into individual variables
         state = compress(s1, s2, s3, s4, s5, fin[64 * b : 64 * (b + 1)])
     # Produce output.
-    return b"".join((h & 0xFFFFFFFF).to_bytes(4, "little") for h in state)
+    return pack("<5I", *state)
+
+
+def ripemd160_many(msgs):
+    """Compute RIPEMD-160 hashes of a list of messages."""
+    h0, h1, h2, h3, h4 = IV
+    res = []
+    for msg in msgs:
+        if len(msg) == 32:
+            # single block with known padding
+            res.append(pack("<5I", *compress(h0, h1, h2, h3, h4, msg + PAD32)))
+        else:
+            res.append(ripemd160(msg))
+    return res
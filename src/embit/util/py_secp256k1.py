@@ -3,6 +3,7 @@ This is a fallback option if the library can't do ctypes bindings to secp256k1 l
 Mimics the micropython bindings and internal representation of data structs in secp256k1.
 """
 
+import hashlib
 from . import key as _key
 
 # Flags to pass to context_create.
@@ -49,6 +50,23 @@ def ec_pubkey_create(secret, context=None):
     return _pubkey_serialize(pk.get_pubkey())
 
 
+def ec_pubkey_create_batch(secrets, context=None):
+    """Creates pubkeys for a list of secrets with a single field inversion"""
+    points = []
+    for secret in secrets:
+        if len(secret) != 32:
+            raise ValueError("Private key should be 32 bytes long")
+        pk = _key.ECKey()
+        pk.set(secret, compressed=False)
+        if not pk.is_valid:
+            raise ValueError("Invalid private key")
+        points.append(_key.mul_generator(pk.secret))
+    return [
+        p[0].to_bytes(32, "little") + p[1].to_bytes(32, "little")
+        for p in _key.SECP256K1.affine_batch(points)
+    ]
+
+
 def ec_pubkey_parse(sec, context=None):
     if len(sec) != 33 and len(sec) != 65:
         raise ValueError("Serialized pubkey should be 33 or 65 bytes long")
@@ -79,6 +97,11 @@ def ec_pubkey_serialize(pubkey, flag=EC_COMPRESSED, context=None):
     return pub.get_bytes()
 
 
+def ec_pubkey_serialize_batch(pubkeys, flag=EC_COMPRESSED, context=None):
+    # internal representation is affine already, so no inversions here
+    return [ec_pubkey_serialize(pubkey, flag) for pubkey in pubkeys]
+
+
 def ecdsa_signature_parse_compact(compact_sig, context=None):
     if len(compact_sig) != 64:
         raise ValueError("Compact signature should be 64 bytes long")
@@ -170,6 +193,40 @@ def ecdsa_verify(sig, msg, pub, context=None):
     return pubkey.verify_ecdsa(ecdsa_signature_serialize_der(sig), msg)
 
 
+def _bitmap(results):
+    """Packs a list of booleans to a bitmap, bit i is set if results[i] is True"""
+    res = bytearray((len(results) + 7) // 8)
+    for i, r in enumerate(results):
+        if r:
+            res[i >> 3] |= 1 << (i & 7)
+    return bytes(res)
+
+
+def _split(buf, size):
+    return [bytes(buf[i : i + size]) for i in range(0, len(buf), size)]
+
+
+def _batch(sigs, msgs, pubs):
+    """Splits packed buffers to lists of sigs, msgs and pubkeys"""
+    n = len(sigs) // 64
+    if len(sigs) != 64 * n or len(msgs) != 32 * n or len(pubs) != 64 * n:
+        raise ValueError(
+            "Buffers should contain 64-byte sigs, 32-byte msgs and 64-byte pubkeys"
+        )
+    return _split(sigs, 64), _split(msgs, 32), _split(pubs, 64)
+
+
+def ecdsa_verify_batch(sigs, msgs, pubs, context=None):
+    """
+    Verifies n signatures in one call.
+    sigs, msgs and pubs are packed buffers of n 64-byte signatures,
+    32-byte messages and 64-byte pubkeys.
+    Returns a bitmap with bit i set if signature i is valid.
+    """
+    sigs, msgs, pubs = _batch(sigs, msgs, pubs)
+    return _bitmap([ecdsa_verify(*args) for args in zip(sigs, msgs, pubs)])
+
+
 def ecdsa_sign(msg, secret, nonce_function=None, extra_data=None, context=None):
     if len(msg) != 32:
         raise ValueError("Message should be 32 bytes long")
@@ -234,33 +291,51 @@ def ec_pubkey_add(pub, tweak, context=None):
     pubkey = _pubkey_parse(pub)
     pubkey.compressed = True
     t = int.from_bytes(tweak, "big")
-    Q = _key.SECP256K1.affine(
-        _key.SECP256K1.mul([(_key.SECP256K1_G, t), (pubkey.p, 1)])
-    )
+    Q = _key.SECP256K1.affine(_key.SECP256K1.add(_key.mul_generator(t), pubkey.p))
     if Q is None:
         return None
     return Q[0].to_bytes(32, "little") + Q[1].to_bytes(32, "little")
 
 
-# def ec_privkey_tweak_mul(secret, tweak, context=None):
-#     if len(secret)!=32 or len(tweak)!=32:
-#         raise ValueError("Secret and tweak should both be 32 bytes long")
-#     s = int.from_bytes(secret, 'big')
-#     t = int.from_bytes(tweak, 'big')
-#     if t > _key.SECP256K1_ORDER or s > _key.SECP256K1_ORDER:
-#         raise ValueError("Failed to tweak the secret")
-#     r = pow(s, t, _key.SECP256K1_ORDER)
-#     res = r.to_bytes(32, 'big')
-#     for i in range(len(secret)):
-#         secret[i] = res[i]
-
-# def ec_pubkey_tweak_mul(pub, tweak, context=None):
-#     if len(pub)!=64:
-#         raise ValueError("Public key should be 64 bytes long")
-#     if len(tweak)!=32:
-#         raise ValueError("Tweak should be 32 bytes long")
-#     if _secp.secp256k1_ec_pubkey_tweak_mul(context, pub, tweak) == 0:
-#         raise ValueError("Failed to tweak the public key")
+def ec_privkey_tweak_mul(secret, tweak, context=None):
+    # tweak in place
+    if len(secret) != 32 or len(tweak) != 32:
+        raise ValueError("Secret and tweak should both be 32 bytes long")
+    s = int.from_bytes(secret, "big")
+    t = int.from_bytes(tweak, "big")
+    if s == 0 or t == 0 or t >= _key.SECP256K1_ORDER or s >= _key.SECP256K1_ORDER:
+        raise ValueError("Failed to tweak the secret")
+    res = ((s * t) % _key.SECP256K1_ORDER).to_bytes(32, "big")
+    for i in range(len(secret)):
+        secret[i] = res[i]
+
+
+def _pubkey_mul(pub, tweak):
+    """Returns affine point tweak * pub"""
+    pubkey = _pubkey_parse(pub)
+    if not pubkey.is_valid:
+        raise ValueError("Invalid public key")
+    t = int.from_bytes(tweak, "big")
+    if t == 0 or t >= _key.SECP256K1_ORDER:
+        raise ValueError("Invalid tweak")
+    # variable base - uses GLV endomorphism inside
+    return _key.SECP256K1.affine(_key.SECP256K1.mul([(pubkey.p, t)]))
+
+
+def ec_pubkey_tweak_mul(pub, tweak, context=None):
+    # tweak in place
+    if len(pub) != 64:
+        raise ValueError("Public key should be 64 bytes long")
+    if len(tweak) != 32:
+        raise ValueError("Tweak should be 32 bytes long")
+    try:
+        Q = _pubkey_mul(pub, tweak)
+    except ValueError:
+        raise ValueError("Failed to tweak the public key")
+    res = Q[0].to_bytes(32, "little") + Q[1].to_bytes(32, "little")
+    for i in range(len(pub)):
+        pub[i] = res[i]
+
 
 # def ec_pubkey_combine(*args, context=None):
 #     pub = bytes(64)
@@ -270,6 +345,31 @@ def ec_pubkey_add(pub, tweak, context=None):
 #         raise ValueError("Failed to negate pubkey")
 #     return pub
 
+
+# ecdh
+def ecdh(pubkey, scalar, hashfn=None, data=None, context=None):
+    if not len(pubkey) == 64:
+        raise ValueError("Pubkey should be 64 bytes long")
+    if not len(scalar) == 32:
+        raise ValueError("Scalar should be 32 bytes long")
+    try:
+        Q = _pubkey_mul(pubkey, scalar)
+    except ValueError:
+        raise RuntimeError("Failed to compute the shared secret")
+    x = Q[0].to_bytes(32, "big")
+    y = Q[1].to_bytes(32, "big")
+    if hashfn is None:
+        # default hash function of libsecp256k1
+        return hashlib.sha256(bytes([0x02 | (Q[1] & 1)]) + x).digest()
+    try:
+        res = hashfn(x, y, data)
+    except Exception as e:
+        raise RuntimeError("Failed to compute the shared secret")
+    if len(res) != 32:
+        raise RuntimeError("Failed to compute the shared secret")
+    return res
+
+
 # schnorrsig
 
 
@@ -290,6 +390,21 @@ def schnorrsig_verify(sig, msg, pubkey, context=None):
     return _key.verify_schnorr(sec[1:33], sig, msg)
 
 
+def schnorrsig_verify_batch(sigs, msgs, pubkeys, context=None):
+    """
+    Verifies n schnorr signatures in one call.
+    sigs, msgs and pubkeys are packed buffers of n 64-byte signatures,
+    32-byte messages and 64-byte xonly pubkeys.
+    Returns a bitmap with bit i set if signature i is valid.
+    Uses batch verification and checks one by one only if the batch fails.
+    """
+    sigs, msgs, pubkeys = _batch(sigs, msgs, pubkeys)
+    keys = [ec_pubkey_serialize(pubkey)[1:33] for pubkey in pubkeys]
+    if _key.verify_schnorr_batch(keys, sigs, msgs):
+        return _bitmap([True] * len(sigs))
+    return _bitmap([_key.verify_schnorr(*args) for args in zip(keys, sigs, msgs)])
+
+
 def keypair_create(secret, context=None):
     pub = ec_pubkey_create(secret)
     pub2, parity = xonly_pubkey_from_pubkey(pub)
@@ -302,7 +417,13 @@ def schnorrsig_sign(msg, keypair, nonce_function=None, extra_data=None, context=
     if len(keypair) == 32:
         keypair = keypair_create(keypair, context=context)
     assert len(keypair) == 96
-    return _key.sign_schnorr(keypair[:32], msg, extra_data)
+    # reuse public key from the keypair instead of computing it again
+    pub = (
+        int.from_bytes(keypair[32:64], "little"),
+        int.from_bytes(keypair[64:], "little"),
+        1,
+    )
+    return _key.sign_schnorr(keypair[:32], msg, extra_data, pubkey=pub)
 
 
 # recoverable
@@ -372,7 +493,7 @@ def ecdsa_recover(sig, msghash, context=None):
     u1 = (s * rinv) % _key.SECP256K1_ORDER
     u2 = (z * rinv) % _key.SECP256K1_ORDER
     P1 = _key.SECP256K1.mul([(R.p, u1)])
-    P2 = _key.SECP256K1.negate(_key.SECP256K1.mul([(_key.SECP256K1_G, u2)]))
+    P2 = _key.SECP256K1.negate(_key.mul_generator(u2))
     P = _key.SECP256K1.affine(_key.SECP256K1.add(P1, P2))
     result = P[0].to_bytes(32, "little") + P[1].to_bytes(32, "little")
     # verify signature at the end
@@ -13,6 +13,8 @@ from .test_script import *
 from .test_bip85 import *
 from .test_taptree import *
 from .test_finalizer import *
+from .test_hashes import *
+from .test_transaction import *
 
 if sys.implementation.name != "micropython":
     from .test_ecdh import *
@@ -2,6 +2,7 @@ from binascii import unhexlify, hexlify
 from unittest import TestCase
 from embit.util import py_secp256k1
 from embit.util import ctypes_secp256k1
+from embit.util import key
 
 
 class BindingsTest(TestCase):
@@ -16,6 +17,96 @@ class BindingsTest(TestCase):
             g_hex = hexlify(der)
             self.assertEqual(answer, g_hex)
 
+    def test_pubkey_create(self):
+        """Fixed-base multiplication against the library"""
+        order = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+        scalars = [1, 2, 15, 16, 17, 2**128, 2**255, order - 1, order // 3]
+        scalars += [int.from_bytes(bytes([i] * 32), "big") for i in range(1, 10)]
+        for n in scalars:
+            secret = n.to_bytes(32, "big")
+            self.assertEqual(
+                py_secp256k1.ec_pubkey_create(secret),
+                ctypes_secp256k1.ec_pubkey_create(secret),
+            )
+
+    def test_pubkey_batch(self):
+        secrets = [bytes([i] * 32) for i in range(1, 20)]
+        pubs = [ctypes_secp256k1.ec_pubkey_create(secret) for secret in secrets]
+        for secp256k1 in [py_secp256k1, ctypes_secp256k1]:
+            self.assertEqual(secp256k1.ec_pubkey_create_batch(secrets), pubs)
+            self.assertEqual(secp256k1.ec_pubkey_create_batch([]), [])
+            for flag in [secp256k1.EC_COMPRESSED, secp256k1.EC_UNCOMPRESSED]:
+                self.assertEqual(
+                    secp256k1.ec_pubkey_serialize_batch(pubs, flag),
+                    [ctypes_secp256k1.ec_pubkey_serialize(pub, flag) for pub in pubs],
+                )
+            with self.assertRaises(ValueError):
+                secp256k1.ec_pubkey_create_batch(secrets + [b"\x00" * 32])
+
+    def test_multi_mul(self):
+        """Strauss and Pippenger multiplication against fixed-base one"""
+        curve = key.SECP256K1
+        order = key.SECP256K1_ORDER
+        # points k*G with known discrete logs
+        ks = [int.from_bytes(bytes([i] * 32), "big") % order for i in range(1, 40)]
+        points = [curve.affine(key.mul_generator(k)) for k in ks]
+        ns = [(k * 7 + 3) ** 3 % order for k in ks]
+        for size in [0, 1, 2, 3, 39]:
+            ps = list(zip(points[:size], ns[:size]))
+            expected = curve.affine(
+                key.mul_generator(sum(k * n for k, n in zip(ks, ns[:size])))
+            )
+            self.assertEqual(curve.affine(curve.mul_strauss(ps)), expected)
+            self.assertEqual(curve.affine(curve.mul_pippenger(ps)), expected)
+            self.assertEqual(curve.affine(curve.mul(ps)), expected)
+
+    def test_glv(self):
+        """Variable-base multiplication with GLV endomorphism against the library"""
+        curve = key.SECP256K1
+        order = key.SECP256K1_ORDER
+        lam = key.SECP256K1_GLV[2]
+        scalars = [1, 2, 2**128, 2**255, order - 1, order // 3, lam, order - lam]
+        scalars += [int.from_bytes(bytes([i] * 32), "big") for i in range(1, 10)]
+        pub = ctypes_secp256k1.ec_pubkey_create(b"5" * 32)
+        for n in scalars:
+            n1, n2 = curve.split_scalar(n)
+            self.assertEqual((n1 + n2 * lam - n) % order, 0)
+            self.assertTrue(abs(n1) < 2**129 and abs(n2) < 2**129)
+            tweak = n.to_bytes(32, "big")
+            # in-place tweak, ctypes modifies bytes object
+            pub1 = pub[:1] + pub[1:]
+            self.assertIsNone(ctypes_secp256k1.ec_pubkey_tweak_mul(pub1, tweak))
+            pub2 = bytearray(pub)
+            self.assertIsNone(py_secp256k1.ec_pubkey_tweak_mul(pub2, tweak))
+            self.assertEqual(pub1, bytes(pub2))
+            self.assertEqual(
+                ctypes_secp256k1.ecdh(pub, tweak), py_secp256k1.ecdh(pub, tweak)
+            )
+            hashfn = lambda x, y, data: bytes(a ^ b for a, b in zip(x, y))
+            self.assertEqual(
+                ctypes_secp256k1.ecdh(pub, tweak, hashfn),
+                py_secp256k1.ecdh(pub, tweak, hashfn),
+            )
+            secret1 = bytes(bytearray(b"5" * 32))
+            ctypes_secp256k1.ec_privkey_tweak_mul(secret1, tweak)
+            secret2 = bytearray(b"5" * 32)
+            py_secp256k1.ec_privkey_tweak_mul(secret2, tweak)
+            self.assertEqual(secret1, bytes(secret2))
+            self.assertEqual(py_secp256k1.ec_pubkey_create(secret1), pub1)
+        # zero tweak or secret is rejected, buffers are fresh copies
+        # as ctypes may modify them in place
+        ctypes_copy = lambda b: b[:1] + b[1:]
+        for secp256k1, buf in [
+            (py_secp256k1, bytearray),
+            (ctypes_secp256k1, ctypes_copy),
+        ]:
+            with self.assertRaises(ValueError):
+                secp256k1.ec_pubkey_tweak_mul(buf(pub), bytes(32))
+            with self.assertRaises(ValueError):
+                secp256k1.ec_privkey_tweak_mul(buf(b"5" * 32), bytes(32))
+            with self.assertRaises(ValueError):
+                secp256k1.ec_privkey_tweak_mul(buf(bytes(32)), b"5" * 32)
+
     def test_cross(self):
         secret = b"5" * 32
         pub1 = ctypes_secp256k1.ec_pubkey_create(secret)
@@ -112,3 +203,40 @@ class BindingsTest(TestCase):
                 ctypes_secp256k1.keypair_create(secret),
                 py_secp256k1.keypair_create(secret),
             )
+
+    def test_verify_batch(self):
+        secrets = [bytes([i] * 32) for i in range(1, 12)]
+        msgs = [bytes([i] * 32) for i in range(20, 31)]
+        pubs = [ctypes_secp256k1.ec_pubkey_create(secret) for secret in secrets]
+        xonly = [ctypes_secp256k1.xonly_pubkey_from_pubkey(pub)[0] for pub in pubs]
+        sigs = [
+            ctypes_secp256k1.ecdsa_sign(msg, secret)
+            for msg, secret in zip(msgs, secrets)
+        ]
+        schnorr_sigs = [
+            ctypes_secp256k1.schnorrsig_sign(msg, secret)
+            for msg, secret in zip(msgs, secrets)
+        ]
+        # all valid, one invalid and two invalid signatures
+        for invalid in [[], [4], [0, 10]]:
+            batch_msgs = [
+                b"x" * 32 if i in invalid else msg for i, msg in enumerate(msgs)
+            ]
+            expected = 0
+            for i in range(len(msgs)):
+                if i not in invalid:
+                    expected |= 1 << i
+            expected = expected.to_bytes(2, "little")
+            for secp256k1 in [py_secp256k1, ctypes_secp256k1]:
+                res = secp256k1.ecdsa_verify_batch(
+                    b"".join(sigs), b"".join(batch_msgs), b"".join(pubs)
+                )
+                self.assertEqual(res, expected)
+                res = secp256k1.schnorrsig_verify_batch(
+                    b"".join(schnorr_sigs), b"".join(batch_msgs), b"".join(xonly)
+                )
+                self.assertEqual(res, expected)
+        for secp256k1 in [py_secp256k1, ctypes_secp256k1]:
+            self.assertEqual(secp256k1.ecdsa_verify_batch(b"", b"", b""), b"")
+            with self.assertRaises(ValueError):
+                secp256k1.ecdsa_verify_batch(b"".join(sigs), b"".join(msgs), b"")
@@ -2,9 +2,18 @@
 # https://github.com/bitcoin/bips/blob/master/bip-0032.mediawiki#Test_Vectors
 
 from binascii import unhexlify
-from embit.bip32 import HDKey, HDError
+from embit.bip32 import (
+    HDKey,
+    HDError,
+    DerivationCache,
+    set_derivation_cache,
+    get_derivation_cache,
+)
 from embit.ec import ECError
+from embit.hashes import hash160
+from embit import bip32
 from unittest import TestCase
+import pickle
 
 HARD = lambda x: x + 0x80000000
 
@@ -223,3 +232,94 @@ class Bip32Test(TestCase):
         for data in xkeys:
             xkey_bytes = (HDKey.from_base58(data)).serialize()
             self.assertEqual((HDKey.parse(xkey_bytes)).to_base58(), data)
+
+    def test_fingerprint_cache(self):
+        root = HDKey.from_seed(unhexlify(DERIVE_VECTORS[0][0]))
+        fgp = root.my_fingerprint
+        self.assertEqual(fgp, hash160(root.sec())[:4])
+        self.assertIs(root.my_fingerprint, fgp)
+        self.assertIs(root.get_public_key(), root.get_public_key())
+        for i in range(3):
+            self.assertEqual(root.child(i).fingerprint, fgp)
+        self.assertEqual(root.to_public().my_fingerprint, fgp)
+
+    def test_child_hmac(self):
+        seed = unhexlify(DERIVE_VECTORS[0][0])
+        root = HDKey.from_seed(seed)
+        children = [root.child(i) for i in range(3)]
+        for i, child in enumerate(children):
+            self.assertEqual(child, HDKey.from_seed(seed).child(i))
+        # cached hmac state follows the chain code
+        other = HDKey.from_seed(b"\x01" * 64)
+        root.chain_code = other.chain_code
+        root.key = other.key
+        root._my_fingerprint = b""
+        self.assertEqual(root.child(5), other.child(5))
+        # fallback for hashes without copy() (MicroPython)
+        bip32._HMAC_CAN_COPY = False
+        try:
+            for i, child in enumerate(children):
+                self.assertEqual(HDKey.from_seed(seed).child(i), child)
+        finally:
+            bip32._HMAC_CAN_COPY = True
+
+    def test_derive_range(self):
+        root = HDKey.from_seed(unhexlify(DERIVE_VECTORS[0][0]))
+        xpub = root.to_public()
+        self.assertEqual(
+            list(xpub.derive_range(10, 5)), [xpub.child(i) for i in range(10, 15)]
+        )
+        self.assertEqual(
+            list(root.derive_range(0, 3, hardened=True)),
+            [root.child(i, hardened=True) for i in range(3)],
+        )
+        self.assertEqual(list(xpub.derive_range(0, 0)), [])
+        for child in xpub.derive_range(0, 2):
+            self.assertEqual(child.depth, 1)
+            self.assertEqual(child.fingerprint, xpub.my_fingerprint)
+            self.assertEqual(HDKey.from_base58(child.to_base58()), child)
+        # invalid ranges raise before iteration
+        with self.assertRaises(HDError):
+            xpub.derive_range(HARD(0) - 1, 2)
+        with self.assertRaises(HDError):
+            xpub.derive_range(0, 2, hardened=True)
+        with self.assertRaises(HDError):
+            root.derive_range(0xFFFFFFFF, 2)
+        with self.assertRaises(HDError):
+            root.derive_range(0, -1)
+
+    def test_derivation_cache(self):
+        root = HDKey.from_seed(unhexlify(DERIVE_VECTORS[0][0]))
+        expected = [root.derive("m/84h/0h/0h/0/%d" % i) for i in range(5)]
+        cache = DerivationCache(size=8)
+        set_derivation_cache(cache)
+        try:
+            for i in range(5):
+                self.assertEqual(root.derive("m/84h/0h/0h/0/%d" % i), expected[i])
+            self.assertEqual(cache.misses, 1)
+            self.assertEqual(cache.hits, 4)
+            self.assertEqual(len(cache), 8)
+            self.assertEqual(root.derive("m/84h/0h/0h/0/4"), expected[4])
+            self.assertEqual(cache.hits, 5)
+            # different root doesn't hit the cache
+            other = HDKey.from_seed(b"\x01" * 64)
+            self.assertEqual(other.derive([1, 2]), other.child(1).child(2))
+            self.assertEqual(cache.misses, 2)
+            # returned keys are copies, changing them doesn't affect the cache
+            key = root.derive("m/84h/0h/0h/0/4")
+            key.chain_code = bytes(32)
+            self.assertEqual(root.derive("m/84h/0h/0h/0/4"), expected[4])
+            cache.evict(root)
+            self.assertEqual(len(cache), 2)
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+        finally:
+            set_derivation_cache(None)
+        self.assertIsNone(get_derivation_cache())
+
+    def test_pickle(self):
+        root = HDKey.from_seed(unhexlify(DERIVE_VECTORS[0][0]))
+        for key in [root, root.derive("m/84h/0h").to_public()]:
+            restored = pickle.loads(pickle.dumps(key))
+            self.assertEqual(restored.to_base58(), key.to_base58())
+            self.assertEqual(restored.child(1), key.child(1))
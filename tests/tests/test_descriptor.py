@@ -1,11 +1,20 @@
 from unittest import TestCase
 from binascii import hexlify
-from embit.descriptor import Descriptor, Key
+from embit.descriptor import Descriptor, Key, CompiledDescriptor, DescriptorIndex
 from embit.descriptor.arguments import KeyHash, Number
 from embit.descriptor.miniscript import OPERATORS, WRAPPERS
 from embit.descriptor.errors import MiniscriptError
-from embit.descriptor.checksum import add_checksum, DescriptorError
+from embit.descriptor.checksum import (
+    add_checksum,
+    checksum,
+    checksums,
+    DescriptorChecksum,
+    DescriptorError,
+)
 from embit import ec
+from embit.misc import BufferReader, read_until
+from io import BytesIO
+import pickle
 
 
 class DescriptorTest(TestCase):
@@ -19,6 +28,26 @@ class DescriptorTest(TestCase):
         self.assertEqual(add_checksum(desc.split("#")[0]), desc)
         self.assertRaises(DescriptorError, add_checksum, " ✘")
 
+    def test_incremental_checksum(self):
+        desc = (
+            "wpkh([c1684a69/84'/1'/0']tpubDDY2HTrz5YTJGe4dejjxgiiuex6Gfu7Ca21z"
+            "EkCf7GcWpPhpM172yt9aeJqWg5zD7n6gUFfnFJeyMokc54rCQ9tWLjs9VaZHxV95g"
+            "6RYjf5/1/*)"
+        )
+        for size in [1, 2, 3, 7, 64]:
+            chk = DescriptorChecksum()
+            for i in range(0, len(desc), size):
+                chk.update(desc[i : i + size])
+            self.assertEqual(chk.checksum(), "2zrpegx5")
+        # saved state can be continued with different suffixes
+        prefix = DescriptorChecksum(desc[:-3])
+        for suffix in ["0/*)", "1/*)", "<0;1>/*)"]:
+            d = desc[:-3] + suffix
+            self.assertEqual(prefix.copy().update(suffix).checksum(), checksum(d))
+        self.assertEqual(prefix.checksum(), checksum(desc[:-3]))
+        self.assertEqual(checksums([desc, ""]), ["2zrpegx5", checksum("")])
+        self.assertRaises(DescriptorError, DescriptorChecksum().update, "✘")
+
     def test_descriptors(self):
         keys = [
             "[abcdef12/84h/22h]xpub6F6wWxm8F64iBHNhyaoh3QKCuuMUY5pfPPr1H1WuZXUXeXtZ21qjFN5ykaqnLL1jtPEFB9d94CyZrcYWKVdSiJKQ6mLGEB5sfrGFBpg6wgA/<0;1>/*",
@@ -155,6 +184,23 @@ class DescriptorTest(TestCase):
                 kkk = kk.derive(88)
                 self.assertFalse(kkk.can_derive)
 
+    def test_lazy_keys(self):
+        descs = [
+            "tr(c6047f9441ed7d6d3045406e95c07cd85c778e4b8cef3ca7abac09b95c709ee5,multi_a(1,edfc1d6088f9b6470ed4550d8bf2326ebebc0464a7f78581fa7283fc54edecf0,089dc10c7ac6db54f91329af617333db388cead0c231f723379d1b99030b02dc))",
+            "wsh(multi(1,02edfc1d6088f9b6470ed4550d8bf2326ebebc0464a7f78581fa7283fc54edecf0,03089dc10c7ac6db54f91329af617333db388cead0c231f723379d1b99030b02dc))",
+        ]
+        for desc in descs:
+            d = Descriptor.from_string(desc)
+            lazy = Descriptor.from_string(desc, pubkey_cls=ec.LazyPublicKey)
+            self.assertIsInstance(lazy.keys[0].key, ec.LazyPublicKey)
+            self.assertEqual(str(lazy), str(d))
+            self.assertEqual(lazy.script_pubkey(), d.script_pubkey())
+        k = "02edfc1d6088f9b6470ed4550d8bf2326ebebc0464a7f78581fa7283fc54edecf0"
+        self.assertIs(type(Key.from_string(k).key), ec.PublicKey)
+        lazy = Key.from_string(k, pubkey_cls=ec.LazyPublicKey)
+        self.assertIsInstance(lazy.key, ec.LazyPublicKey)
+        self.assertEqual(str(lazy), k)
+
     def test_branch_compatibility(self):
         keys = [
             "[f45912ab/44h/12/32h]xpub6F6wWxm8F64iBHNhyaoh3QKCuuMUY5pfPPr1H1WuZXUXeXtZ21qjFN5ykaqnLL1jtPEFB9d94CyZrcYWKVdSiJKQ6mLGEB5sfrGFBpg6wgA/<0>/*",
@@ -214,6 +260,28 @@ class DescriptorTest(TestCase):
             w = wr(o)
             self.assertEqual(len(w), len(w.compile()))
 
+    def test_miniscript_cache(self):
+        """Checks nodes cache results and derive() reuses subtrees without keys"""
+        desc = Descriptor.from_string(
+            "wsh(andor(pk(xpub661MyMwAqRbcFW31YEwpkMuc5THy2PSt5bDMsktWQcFF8syAmRUapSCGu8ED9W6oDMSgv6Zz8idoc4a6mr8BDzTJY47LJhkJ8UB7WEGuduB/*),older(144),thresh(2,pk(03fff97bd5755eeea420453a14355235d382f6472f8568a18b2f057a1460297556),s:pk(02e493dbf1c10d80f3581e4904930b1404cc6c13900ee0758474fa94abe8c4cd13),sln:after(840000))))"
+        )
+        ms = desc.miniscript
+        self.assertIs(ms.compile(), ms.compile())
+        self.assertEqual(len(ms), len(ms.compile()))
+        derived = desc.derive(5)
+        dms = derived.miniscript
+        # key-bearing nodes are rebuilt, subtrees without keys are shared
+        self.assertIsNot(dms, ms)
+        self.assertIsNot(dms.args[0], ms.args[0])
+        self.assertIs(dms.args[1], ms.args[1])
+        self.assertIs(dms.args[2].args[3], ms.args[2].args[3])
+        self.assertEqual((dms.type, dms.properties), (ms.type, ms.properties))
+        # compiled script matches freshly parsed derived descriptor
+        fresh = Descriptor.from_string(str(derived))
+        self.assertEqual(derived.script_pubkey(), fresh.script_pubkey())
+        self.assertEqual(len(dms), len(fresh.miniscript))
+        self.assertNotEqual(derived.script_pubkey(), desc.derive(6).script_pubkey())
+
     def test_multisig(self):
         keys = tuple([ec.PrivateKey(bytes([i + 1] * 32)).to_public() for i in range(4)])
         descriptors = [
@@ -249,6 +317,192 @@ class DescriptorTest(TestCase):
             self.assertEqual(d.is_basic_multisig, is_basic)
             self.assertEqual(d.is_sorted, is_sorted)
 
+    def test_pickle(self):
+        for d in [
+            "wpkh([12345678/84h/0h/0h]xpub661MyMwAqRbcFW31YEwpkMuc5THy2PSt5bDMsktWQcFF8syAmRUapSCGu8ED9W6oDMSgv6Zz8idoc4a6mr8BDzTJY47LJhkJ8UB7WEGuduB/0/*)",
+            "sh(wsh(or_d(pk(03fff97bd5755eeea420453a14355235d382f6472f8568a18b2f057a1460297556),and_v(v:pkh(02e493dbf1c10d80f3581e4904930b1404cc6c13900ee0758474fa94abe8c4cd13),older(12960)))))",
+        ]:
+            desc = Descriptor.from_string(d)
+            restored = pickle.loads(pickle.dumps(desc))
+            self.assertEqual(str(restored), str(desc))
+            self.assertEqual(
+                restored.derive(3).script_pubkey(), desc.derive(3).script_pubkey()
+            )
+
+    def test_buffer_reader(self):
+        data = b"pk(02abcd),{pk(03ef),older(10)}#checksum"
+        for chars in [b",)(#", b"(", b"}", b"]", b",)/"]:
+            stream = BytesIO(data)
+            reader = BufferReader(data)
+            while True:
+                res = read_until(reader, chars)
+                self.assertEqual(res, read_until(stream, chars))
+                self.assertEqual(reader.tell(), stream.tell())
+                if res[1] is None:
+                    break
+        reader = BufferReader(data)
+        self.assertEqual(reader.read(3), b"pk(")
+        reader.seek(-1, 1)
+        self.assertEqual(reader.read(1), b"(")
+        self.assertEqual(reader.read(), data[3:])
+        self.assertEqual(reader.read(1), b"")
+
+    def test_compiled(self):
+        xpubs = [
+            "xpub661MyMwAqRbcFW31YEwpkMuc5THy2PSt5bDMsktWQcFF8syAmRUapSCGu8ED9W6oDMSgv6Zz8idoc4a6mr8BDzTJY47LJhkJ8UB7WEGuduB/<0;1>/*",
+            "xpub69H7F5d8KSRgmmdJg2KhpAK8SR3DjMwAdkxj3ZuxV27CprR9LgpeyGmXUbC6wb7ERfvrnKZjXoUmmDznezpbZb7ap6r1D3tgFxHmwMkQTPH/<0;1>/*",
+        ]
+        pub = "03fff97bd5755eeea420453a14355235d382f6472f8568a18b2f057a1460297556"
+        descs = [
+            "wpkh(%s)" % xpubs[0],
+            "pkh(%s)" % xpubs[0],
+            "sh(wpkh(%s))" % xpubs[0],
+            "wsh(sortedmulti(2,%s,%s,%s))" % (xpubs[0], xpubs[1], pub),
+            "sh(wsh(multi(1,%s,%s)))" % (xpubs[1], xpubs[0]),
+            "wsh(or_d(pk(%s),and_v(v:pkh(%s),older(12960))))" % tuple(xpubs),
+            "tr(%s)" % xpubs[0],
+            "tr(%s,{pk(%s),sortedmulti_a(1,%s,%s)})"
+            % (xpubs[0], xpubs[1], xpubs[0], pub[2:]),
+        ]
+        for d in descs:
+            desc = Descriptor.from_string(d)
+            for branch in range(2):
+                compiled = CompiledDescriptor(desc, branch)
+                expected = [
+                    desc.derive(i, branch_index=branch).script_pubkey()
+                    for i in range(3, 8)
+                ]
+                self.assertEqual(compiled.script_pubkeys(3, 5), expected)
+                self.assertEqual(compiled.script_pubkey(7), expected[-1])
+                self.assertEqual(
+                    compiled.address(3), desc.derive(3, branch_index=branch).address()
+                )
+            # original descriptor is not changed
+            self.assertEqual(str(desc), d)
+
+    def test_descriptor_index(self):
+        desc = Descriptor.from_string(
+            "wpkh([12345678/84h/0h/0h]xpub661MyMwAqRbcFW31YEwpkMuc5THy2PSt5bDMsktWQcFF8syAmRUapSCGu8ED9W6oDMSgv6Zz8idoc4a6mr8BDzTJY47LJhkJ8UB7WEGuduB/<0;1>/*)"
+        )
+        index = DescriptorIndex(desc, gap=5)
+        self.assertEqual(len(index), 10)
+        change = desc.derive(3, branch_index=1).script_pubkey()
+        self.assertEqual(index.lookup(change), (3, 1))
+        self.assertEqual(index.lookup(change.data), (3, 1))
+        # hit close to the edge extends the branch
+        self.assertEqual(len(index), 14)
+        far = desc.derive(12, branch_index=1).script_pubkey()
+        self.assertFalse(far in index)
+        self.assertIn(desc.derive(8, branch_index=1).script_pubkey(), index)
+        self.assertIn(far, index)
+        self.assertFalse(desc.derive(12, branch_index=0).script_pubkey() in index)
+        # descriptor without wildcard has a single script
+        single = Descriptor.from_string(
+            "wpkh(03fff97bd5755eeea420453a14355235d382f6472f8568a18b2f057a1460297556)"
+        )
+        index = DescriptorIndex(single)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.lookup(single.script_pubkey()), (0, 0))
+
+    def test_parallel_derivation(self):
+        from embit.descriptor.parallel import derive_script_pubkeys
+        from embit.networks import NETWORKS
+
+        desc = Descriptor.from_string(
+            "wsh(sortedmulti(1,xpub661MyMwAqRbcFW31YEwpkMuc5THy2PSt5bDMsktWQcFF8syAmRUapSCGu8ED9W6oDMSgv6Zz8idoc4a6mr8BDzTJY47LJhkJ8UB7WEGuduB/<0;1>/*,xpub69H7F5d8KSRgmmdJg2KhpAK8SR3DjMwAdkxj3ZuxV27CprR9LgpeyGmXUbC6wb7ERfvrnKZjXoUmmDznezpbZb7ap6r1D3tgFxHmwMkQTPH/<0;1>/*))"
+        )
+        net = NETWORKS["test"]
+        expected = [
+            (d.script_pubkey(), d.address(net))
+            for d in [desc.derive(i, branch_index=1) for i in range(3, 20)]
+        ]
+        for workers in [1, 2]:
+            res = derive_script_pubkeys(
+                desc, range(3, 20), workers=workers, branch_index=1, network=net
+            )
+            self.assertEqual(res, expected)
+        self.assertEqual(derive_script_pubkeys(str(desc), range(0), workers=2), [])
+
+    def test_parse_cache(self):
+        from embit import misc
+        from embit.bip32 import HDKey
+
+        xpub = "xpub661MyMwAqRbcFW31YEwpkMuc5THy2PSt5bDMsktWQcFF8syAmRUapSCGu8ED9W6oDMSgv6Zz8idoc4a6mr8BDzTJY47LJhkJ8UB7WEGuduB"
+        d = "wpkh([12345678/84h/0h/0h]%s/0/*)" % xpub
+        cache = misc.ParseCache(16)
+        misc.set_parse_cache(cache)
+        try:
+            first = Descriptor.from_string(d)
+            # descriptor and xpub inside it
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+            # checksum doesn't change the cache entry
+            second = Descriptor.from_string(add_checksum(d))
+            self.assertEqual((cache.hits, cache.misses), (1, 2))
+            self.assertEqual(str(first), str(second))
+            self.assertIsNot(first, second)
+            # results are copies, changing them doesn't affect the cache
+            first.keys[0].allowed_derivation = None
+            self.assertEqual(str(Descriptor.from_string(d)), d)
+            # extended keys are cached as well
+            self.assertIsNot(HDKey.from_base58(xpub), HDKey.from_base58(xpub))
+            # with their ec keys
+            HDKey.from_base58(xpub).key.compressed = False
+            self.assertTrue(HDKey.from_base58(xpub).key.compressed)
+            self.assertEqual(cache.hits, 6)
+            self.assertEqual(cache.hit_rate, cache.hits / (cache.hits + cache.misses))
+            cache.clear()
+            self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+        finally:
+            misc.set_parse_cache(None)
+        self.assertIsNone(misc.get_parse_cache())
+
+    def test_parse_cache_copies(self):
+        from embit import misc
+        from embit.bip32 import HDKey
+
+        class ParseCounter:
+            """Counts ec_pubkey_parse calls of the secp256k1 module"""
+
+            def __init__(self, lib):
+                self.lib = lib
+                self.calls = 0
+
+            def ec_pubkey_parse(self, *args, **kwargs):
+                self.calls += 1
+                return self.lib.ec_pubkey_parse(*args, **kwargs)
+
+            def __getattr__(self, name):
+                return getattr(self.lib, name)
+
+        xpub = "xpub661MyMwAqRbcFW31YEwpkMuc5THy2PSt5bDMsktWQcFF8syAmRUapSCGu8ED9W6oDMSgv6Zz8idoc4a6mr8BDzTJY47LJhkJ8UB7WEGuduB"
+        descs = [
+            "wpkh([12345678/84h/0h/0h]%s/0/*)" % xpub,
+            "wsh(multi(1,02edfc1d6088f9b6470ed4550d8bf2326ebebc0464a7f78581fa7283fc54edecf0,03089dc10c7ac6db54f91329af617333db388cead0c231f723379d1b99030b02dc))",
+        ]
+        cache = misc.ParseCache(16)
+        misc.set_parse_cache(cache)
+        counter = ParseCounter(ec.secp256k1)
+        try:
+            for d in descs:
+                Descriptor.from_string(d)
+                Descriptor.from_string(d, pubkey_cls=ec.LazyPublicKey)
+            HDKey.from_base58(xpub)
+            ec.secp256k1 = counter
+            # hits copy parsed keys instead of parsing them again
+            for d in descs:
+                self.assertEqual(str(Descriptor.from_string(d)), d)
+                lazy = Descriptor.from_string(d, pubkey_cls=ec.LazyPublicKey)
+                self.assertEqual(str(lazy), d)
+            self.assertEqual(HDKey.from_base58(xpub).to_base58(), xpub)
+            self.assertEqual(counter.calls, 0)
+            self.assertEqual(cache.misses, 5)
+            # copies of lazy keys stay lazy
+            self.assertIsInstance(lazy.keys[0].key, ec.LazyPublicKey)
+            self.assertIsNone(lazy.keys[0].key._parsed)
+        finally:
+            ec.secp256k1 = counter.lib
+            misc.set_parse_cache(None)
+
 
 # test that:
 # + str(d) == d
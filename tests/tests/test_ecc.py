@@ -1,7 +1,11 @@
 from binascii import unhexlify, hexlify
 from unittest import TestCase
 from embit.ec import PublicKey, PrivateKey, Signature, secp256k1
+from embit import ec, hashes
 from io import BytesIO
+import pickle
+from copy import deepcopy
+from embit.networks import NETWORKS
 
 
 class ECCTest(TestCase):
@@ -74,3 +78,119 @@ class ECCTest(TestCase):
             self.assertEqual(str(priv), priv.to_base58())
             hash(priv)
             hash(pub)
+
+    def test_pubkey_cache(self):
+        pub = PrivateKey(b"1" * 32).get_public_key()
+        sec = pub.sec()
+        self.assertIs(pub.sec(), sec)
+        self.assertEqual(pub.xonly(), sec[1:33])
+        self.assertEqual(pub.hash160(), hashes.hash160(sec))
+        # changing compressed flag invalidates the cache
+        pub.compressed = False
+        self.assertEqual(len(pub.sec()), 65)
+        self.assertEqual(pub.xonly(), sec[1:33])
+        self.assertEqual(pub.hash160(), hashes.hash160(pub.sec()))
+        pub.compressed = True
+        self.assertEqual(pub.sec(), sec)
+
+    def test_privkey_pubkey_cache(self):
+        pk = PrivateKey(b"1" * 32)
+        pub = pk.get_public_key()
+        self.assertIs(pk.get_public_key(), pub)
+        self.assertIs(pk.sec(), pub.sec())
+        # compressed flag of the private key is respected
+        pk.compressed = False
+        self.assertEqual(len(pk.sec()), 65)
+        self.assertEqual(pk.get_public_key().sec(), PrivateKey(b"1" * 32, False).sec())
+        pk.compressed = True
+        self.assertEqual(pk.sec(), pub.sec())
+
+    def test_pickle(self):
+        pk = PrivateKey(b"1" * 32, compressed=False)
+        pk2 = pickle.loads(pickle.dumps(pk))
+        self.assertEqual(pk2.secret, pk.secret)
+        self.assertEqual(pk2.wif(), pk.wif())
+        for pub in [pk.get_public_key(), ec.LazyPublicKey.parse(pk.sec())]:
+            pub2 = pickle.loads(pickle.dumps(pub))
+            self.assertEqual(type(pub2), type(pub))
+            self.assertEqual(pub2.sec(), pub.sec())
+
+    def test_deepcopy(self):
+        pk = PrivateKey(b"\x11" * 32)
+        pub = pk.get_public_key()
+        for key in [pk, pub, ec.LazyPublicKey.parse(pub.sec())]:
+            cp = deepcopy(key)
+            self.assertIsNot(cp, key)
+            self.assertIsInstance(cp, type(key))
+            self.assertEqual(cp.sec(), key.sec())
+            # copies are independent
+            cp.compressed = False
+            self.assertTrue(key.compressed)
+            self.assertEqual(len(key.sec()), 33)
+        cp = deepcopy(pk)
+        cp.network = NETWORKS["test"]
+        self.assertEqual(pk.network, NETWORKS["main"])
+
+    def test_lazy_pubkey(self):
+        pk = PrivateKey(b"1" * 32)
+        pub = pk.get_public_key()
+        for compressed in [True, False]:
+            pub.compressed = compressed
+            lazy = ec.LazyPublicKey.parse(pub.sec())
+            self.assertEqual(lazy, pub)
+            self.assertEqual(hash(lazy), hash(pub))
+            self.assertEqual(lazy.hash160(), pub.hash160())
+            self.assertTrue(lazy.verify(pk.sign(b"2" * 32), b"2" * 32))
+            lazy.compressed = not compressed
+            pub.compressed = not compressed
+            self.assertEqual(lazy.sec(), pub.sec())
+        # invalid point is detected only when the point is used
+        lazy = ec.LazyPublicKey.parse(b"\x02" + b"\x00" * 32)
+        self.assertEqual(lazy.xonly(), b"\x00" * 32)
+        with self.assertRaises(ec.ECError):
+            lazy.verify(pk.sign(b"2" * 32), b"2" * 32)
+        # wrong prefix and length are detected on parsing
+        with self.assertRaises(ec.ECError):
+            ec.LazyPublicKey.parse(b"\x05" + b"\x00" * 32)
+        with self.assertRaises(ec.ECError):
+            ec.LazyPublicKey.parse(b"\x02" + b"\x00" * 31)
+
+    def test_keypair_cache(self):
+        pk = PrivateKey(b"1" * 32)
+        kp = pk.keypair()
+        self.assertIs(pk.keypair(), kp)
+        for i in range(3):
+            msg = bytes([i]) * 32
+            sig = pk.schnorr_sign(msg)
+            self.assertEqual(sig, PrivateKey(b"1" * 32).schnorr_sign(msg))
+            self.assertTrue(pk.schnorr_verify(sig, msg))
+        tweaked = pk.taproot_tweak(b"2" * 32)
+        self.assertIs(pk.taproot_tweak(b"2" * 32), tweaked)
+        self.assertNotEqual(pk.taproot_tweak(), tweaked)
+        self.assertEqual(
+            pk.taproot_tweak(b"2" * 32).sec(),
+            PrivateKey(b"1" * 32).taproot_tweak(b"2" * 32).sec(),
+        )
+
+    def test_verify_batch(self):
+        keys = [PrivateKey(bytes([i] * 32)) for i in range(1, 11)]
+        msgs = [bytes([i] * 32) for i in range(20, 30)]
+        items = [
+            (pk.sign(msg), msg, pk.get_public_key()) for pk, msg in zip(keys, msgs)
+        ]
+        self.assertEqual(ec.verify_batch(items), [True] * 10)
+        # corrupt few messages
+        items[3] = (items[3][0], b"x" * 32, items[3][2])
+        items[8] = (items[8][0], items[8][1], items[0][2])
+        res = ec.verify_batch(items)
+        self.assertEqual(res, [i not in [3, 8] for i in range(10)])
+        self.assertEqual(ec.verify_batch([]), [])
+
+        items = [
+            (pk.schnorr_sign(msg), msg, pk.get_public_key())
+            for pk, msg in zip(keys, msgs)
+        ]
+        self.assertEqual(ec.schnorr_verify_batch(items), [True] * 10)
+        items[5] = (items[5][0], b"x" * 32, items[5][2])
+        res = ec.schnorr_verify_batch(items)
+        self.assertEqual(res, [i != 5 for i in range(10)])
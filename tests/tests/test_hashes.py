@@ -0,0 +1,63 @@
+from unittest import TestCase
+from binascii import hexlify, unhexlify
+import hashlib
+from embit import hashes
+
+
+def reference_tagged_hash(tag, data):
+    hashtag = hashlib.sha256(tag.encode()).digest()
+    return hashlib.sha256(hashtag + hashtag + data).digest()
+
+
+class HashesTest(TestCase):
+    def test_tagged_hash(self):
+        tags = [
+            "TapTweak",
+            "TapLeaf",
+            "TapBranch",
+            "BIP0340/challenge",
+            "liquid/txseed",
+        ]
+        can_copy = hasattr(hashlib.sha256(), "copy")
+        # MicroPython hashes can't be copied, only the fallback is tested there
+        for mode in [False, True] if can_copy else [False]:
+            hashes._CAN_COPY = mode
+            hashes._tagged_midstates.clear()
+            try:
+                for tag in tags:
+                    for data in [b"", b"a", b"x" * 100]:
+                        # repeated calls don't change cached midstate
+                        for i in range(2):
+                            self.assertEqual(
+                                hashes.tagged_hash(tag, data),
+                                reference_tagged_hash(tag, data),
+                            )
+                        h = hashes.tagged_hash_init(tag, data[:1])
+                        h.update(data[1:])
+                        self.assertEqual(h.digest(), reference_tagged_hash(tag, data))
+            finally:
+                hashes._CAN_COPY = can_copy
+                hashes._tagged_midstates.clear()
+
+    def test_hash160_many(self):
+        msgs = [bytes([i]) * i for i in range(70)]
+        self.assertEqual(hashes.hash160_many(msgs), [hashes.hash160(m) for m in msgs])
+        self.assertEqual(hashes.hash160_many([]), [])
+        # known vector: hash160 of the generator point
+        sec = unhexlify(
+            "0279be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798"
+        )
+        self.assertEqual(
+            hexlify(hashes.hash160_many([sec])[0]),
+            b"751e76e8199196d454941c45d1b3a323f1433bd6",
+        )
+
+    def test_double_sha256(self):
+        msgs = [b"", b"a", b"x" * 100]
+        self.assertEqual(
+            hashes.double_sha256_many(msgs), [hashes.double_sha256(m) for m in msgs]
+        )
+        h = hashes.DoubleSha256(b"x" * 10)
+        self.assertEqual(h.write(b"x" * 50), 50)
+        h.update(b"x" * 40)
+        self.assertEqual(h.digest(), hashes.double_sha256(b"x" * 100))
@@ -5,7 +5,9 @@ from embit.liquid.pset import PSET
 from embit.liquid.transaction import LTransaction, LTransactionInput, LTransactionOutput
 from embit.liquid import slip77
 from embit.script import Script
-from embit.liquid.descriptor import LDescriptor
+from embit.liquid.descriptor import LDescriptor, LCompiledDescriptor
+from embit.descriptor import CompiledDescriptor
+from embit.descriptor.errors import DescriptorError
 from embit.bip32 import HDKey
 from embit.ec import PrivateKey
 from embit.hashes import tagged_hash
@@ -142,6 +144,26 @@ class LiquidTest(TestCase):
             self.assertEqual(d, str(desc))
             # test we can derive addresses
             addr = desc.derive(0).address()
+            for branch in range(2):
+                compiled = LCompiledDescriptor(desc, branch)
+                for i in range(3):
+                    derived = desc.derive(i, branch_index=branch)
+                    self.assertEqual(compiled.address(i), derived.address())
+                    if desc.is_blinded:
+                        bkey = derived.blinding_key.get_blinding_key(
+                            derived.script_pubkey()
+                        )
+                        self.assertEqual(compiled.blinding_pubkey(i).sec(), bkey.sec())
+            # generic compiled descriptor doesn't know about blinding keys
+            if desc.is_blinded:
+                with self.assertRaises(DescriptorError):
+                    CompiledDescriptor(desc)
+            else:
+                self.assertIsNone(LCompiledDescriptor(desc).blinding_pubkey(0))
+                self.assertEqual(
+                    CompiledDescriptor(desc).script_pubkey(1),
+                    desc.derive(1).script_pubkey(),
+                )
         invalid_descs = [
             # slip77 must be WIF key
             "blinded(slip77(xprvA18YC5Aog5LxHgMrSv5t9QaHyfh5DU8Pr8zFTP5QhJSTjdg3mSpEyxLZfNQaEc8sALUtsHeDJYsp8YnobhjJT9D7JADoEV4wXiMuNMYDLZ2),%s)"
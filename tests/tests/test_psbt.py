@@ -3,8 +3,9 @@
 
 from binascii import hexlify, unhexlify
 from embit.bip32 import HDKey
-from embit.psbt import PSBT
+from embit.psbt import PSBT, CompressMode
 from unittest import TestCase
+import pickle
 
 INVALID_VECTORS = [
     # Case: Network transaction, not PSBT format
@@ -85,6 +86,28 @@ class PSBTTest(TestCase):
             )
             psbt_act.verify(ignore_missing=True)
             self.assertEqual(psbt_act.serialize(), psbt_bytes, msg)
+            # lazy keys don't change serialization
+            psbt_lazy = PSBT.parse(psbt_bytes, lazy_keys=True)
+            self.assertEqual(psbt_lazy.serialize(), psbt_bytes, msg)
+
+    def test_pickle(self):
+        for psbt_str in VALID_VECTORS:
+            psbt = PSBT.parse(unhexlify(psbt_str))
+            restored = pickle.loads(pickle.dumps(psbt))
+            self.assertEqual(restored.serialize(), psbt.serialize())
+            tx = pickle.loads(pickle.dumps(psbt.tx))
+            self.assertEqual(tx.serialize(), psbt.tx.serialize())
+            # compressed and lazy state survives pickling
+            psbt = PSBT.parse(
+                unhexlify(psbt_str), compress=CompressMode.CLEAR_ALL, lazy_keys=True
+            )
+            restored = pickle.loads(pickle.dumps(psbt))
+            self.assertEqual(restored.serialize(), psbt.serialize())
+            for inp, rinp in zip(psbt.inputs, restored.inputs):
+                self.assertEqual(rinp.compress, CompressMode.CLEAR_ALL)
+                self.assertIs(rinp._pubkey_cls, inp._pubkey_cls)
+                self.assertEqual(rinp.utxo, inp.utxo)
+                self.assertEqual(rinp._txhash, inp._txhash)
 
     def test_sign(self):
         """Parses a PSBT, signs both inputs (1 segwit and 1 legacy), and verifies each signature is correct"""
@@ -103,8 +126,10 @@ class PSBTTest(TestCase):
             },
         ]
         # check with both compressed parsing and uncompressed
-        for compress in [False, True]:
-            psbt = PSBT.parse(unhexlify(psbt_str), compress=compress)
+        for compress, lazy_keys in [(False, False), (True, False), (False, True)]:
+            psbt = PSBT.parse(
+                unhexlify(psbt_str), compress=compress, lazy_keys=lazy_keys
+            )
             if compress:
                 self.assertTrue(len(psbt.serialize()) < len(unhexlify(psbt_str)))
             psbt.sign_with(xkey)
@@ -1,16 +1,21 @@
 from unittest import TestCase
 from embit.hashes import ripemd160
-from embit.util.py_ripemd160 import ripemd160 as py_ripemd160
+from embit.util.py_ripemd160 import ripemd160 as py_ripemd160, ripemd160_many
 import os
 
 
 class Ripemd160Test(TestCase):
     def test_vs_hashlib(self):
         # tests python version against hashlib version
-        for l in range(1, 60):
+        # single and multiple blocks, all padding variants
+        for l in range(0, 200):
             data = os.urandom(l)
             self.assertEqual(ripemd160(data), py_ripemd160(data))
 
+    def test_many(self):
+        msgs = [os.urandom(l) for l in [32, 0, 31, 33, 64, 32, 100]]
+        self.assertEqual(ripemd160_many(msgs), [ripemd160(msg) for msg in msgs])
+
     def test_ripemd160(self):
         """RIPEMD-160 test vectors."""
         # See https://homes.esat.kuleuven.be/~bosselae/ripemd160.html
@@ -2,6 +2,12 @@ from unittest import TestCase
 from embit.descriptor import Descriptor
 from embit.networks import NETWORKS
 from embit.descriptor.errors import MiniscriptError
+from embit.descriptor import CompiledDescriptor
+from embit.descriptor.miniscript import Miniscript
+from embit.descriptor.taptree import TapLeaf, TapTree
+from embit.bip32 import HDKey
+from embit.hashes import tagged_hash
+from embit.ec import PrivateKey
 
 NETWORK = NETWORKS["test"]
 
@@ -115,6 +121,9 @@ ADDRESSES = [
 # - sec pubkeys or xpubs can be used in taproot as root key
 # - p2tr accepts empty pubkey if taptree is set
 
+# order of secp256k1 curve
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
 
 class TapTreeTest(TestCase):
     def test_addresses(self):
@@ -144,3 +153,60 @@ class TapTreeTest(TestCase):
         Descriptor.from_string("wsh(sortedmulti(1,%s,%s,%s))" % keys)
         Descriptor.from_string("tr(%s,multi_a(1,%s,%s))" % keys)
         Descriptor.from_string("tr(%s,sortedmulti_a(1,%s,%s))" % keys)
+
+    def test_precomputed_tree(self):
+        root = HDKey.from_string(TPRVS[0])
+        d = "tr(%s/*,{pk(%s/*),{and_v(v:pk(%s),older(144)),pk(%s)}})" % (
+            TPRVS[0],
+            TPUBS[1],
+            PUBKEYS[0],
+            PUBKEYS[1],
+        )
+        desc = Descriptor.from_string(d)
+        compiled = CompiledDescriptor(desc)
+        for idx in range(3):
+            derived = desc.derive(idx)
+            tree = derived.taptree
+            # subtree without derivable keys is reused with its hashes
+            self.assertIs(tree.tree[1], desc.taptree.tree[1])
+            self.assertIs(tree.tweak(), tree.tweak())
+            fresh = Descriptor.from_string(str(derived))
+            self.assertEqual(derived.script_pubkey(), fresh.script_pubkey())
+            self.assertEqual(compiled.script_pubkey(idx), derived.script_pubkey())
+            # parity of the output key from the tweaked secret before normalization
+            prv = root.derive([idx]).key
+            secret = int.from_bytes(prv.secret, "big")
+            if prv.sec()[0] == 0x03:
+                secret = N - secret
+            tweak = tagged_hash("TapTweak", prv.xonly() + tree.tweak())
+            secret = (secret + int.from_bytes(tweak, "big")) % N
+            out = PrivateKey(secret.to_bytes(32, "big")).get_public_key()
+            blocks = tree.control_blocks(derived.key)
+            self.assertEqual(len(blocks), 3)
+            for leaf, cb in blocks:
+                self.assertEqual(cb[0], 0xC0 | (out.sec()[0] & 1))
+                self.assertEqual(cb[1:33], prv.xonly())
+                self.assertEqual(len(cb) % 32, 1)
+                # merkle root from the control block matches the tree
+                h = tagged_hash("TapLeaf", leaf.serialize())
+                for i in range(33, len(cb), 32):
+                    h = tagged_hash("TapBranch", b"".join(sorted([h, cb[i : i + 32]])))
+                self.assertEqual(h, tree.tweak())
+                self.assertEqual(derived.script_pubkey().data[2:], out.xonly())
+
+    def test_leaf_from_compiled_miniscript(self):
+        """Script compiled before the key became taproot is recompiled in the tree"""
+        s = "and_v(v:pk(%s),pk(%s))" % tuple(PUBKEYS[:2])
+        ms = Miniscript.from_string(s)
+        # sec pubkeys
+        self.assertEqual(len(ms.compile()), 70)
+        self.assertEqual(len(ms), 70)
+        leaf = TapLeaf(ms)
+        tree = TapTree(leaf)
+        fresh = TapLeaf(Miniscript.from_string(s, taproot=True))
+        # x-only pubkeys
+        self.assertEqual(len(ms.compile()), 68)
+        self.assertEqual(len(ms), 68)
+        self.assertEqual(ms.compile(), fresh.miniscript.compile())
+        self.assertEqual(leaf.leaf_hash(), fresh.leaf_hash())
+        self.assertEqual(tree.tweak(), TapTree(fresh).tweak())
@@ -3,6 +3,10 @@ from embit.ec import PrivateKey
 from embit.liquid.pset import PSET
 from embit.hashes import tagged_hash
 from embit.liquid import slip77
+from embit.util import ctypes_secp256k1
+from embit.bip32 import HDKey, DerivationCache
+from embit.descriptor import Descriptor
+from embit import misc
 import threading
 
 mbkey = PrivateKey.from_string("L2U2zGBgimb2vNee3bTw2y936PDJZXq3p7nMXEWuPP5MmpE1nCfv")
@@ -91,3 +95,79 @@ class ThreadingTest(TestCase):
             t.join()
 
         self.assertEqual(str(pset1), REBLINDED)
+
+    def test_contexts(self):
+        # every thread should get its own context
+        contexts = []
+        sigs = []
+        msg = b"1" * 32
+        # keep all threads alive so contexts are not freed and reused
+        barrier = threading.Barrier(5)
+
+        def worker():
+            contexts.append(ctypes_secp256k1.get_context())
+            sigs.append(mbkey.sign(msg).serialize())
+            barrier.wait()
+
+        tarr = [threading.Thread(target=worker) for i in range(5)]
+        for t in tarr:
+            t.start()
+        for t in tarr:
+            t.join()
+        self.assertEqual(len(set(contexts)), len(tarr))
+        self.assertEqual(set(sigs), {mbkey.sign(msg).serialize()})
+
+    def test_derivation_cache(self):
+        root = HDKey.from_seed(b"\x01" * 64)
+        paths = [[1, 2, i] for i in range(20)]
+        expected = [root.derive(path) for path in paths]
+        # small cache to evict keys all the time
+        cache = DerivationCache(size=4)
+        errors = []
+
+        def worker():
+            try:
+                for i, path in enumerate(paths):
+                    self.assertEqual(cache.derive(root, path), expected[i])
+            except Exception as e:
+                errors.append(e)
+
+        tarr = [threading.Thread(target=worker) for i in range(5)]
+        for t in tarr:
+            t.start()
+        for t in tarr:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertTrue(len(cache) <= 4)
+
+    def test_parse_cache(self):
+        root = HDKey.from_seed(b"\x01" * 64)
+        descs = [
+            "wpkh(%s/%d/*)" % (root.derive([i]).to_public().to_base58(), i)
+            for i in range(10)
+        ]
+        # small cache to evict descriptors all the time
+        cache = misc.ParseCache(size=4)
+        errors = []
+
+        def worker():
+            try:
+                for i in range(3):
+                    for d in descs:
+                        self.assertEqual(str(Descriptor.from_string(d)), d)
+            except Exception as e:
+                errors.append(e)
+
+        misc.set_parse_cache(cache)
+        try:
+            tarr = [threading.Thread(target=worker) for i in range(5)]
+            for t in tarr:
+                t.start()
+            for t in tarr:
+                t.join()
+        finally:
+            misc.set_parse_cache(None)
+        self.assertEqual(errors, [])
+        self.assertTrue(len(cache) <= 4)
+        # every descriptor is looked up, xpubs inside only on misses
+        self.assertTrue(cache.hits + cache.misses >= 5 * 3 * 10)
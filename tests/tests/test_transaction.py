@@ -0,0 +1,58 @@
+from unittest import TestCase
+from io import BytesIO
+from embit import hashes
+from embit.ec import PrivateKey
+from embit.script import p2wpkh, p2pkh, Script, Witness
+from embit.transaction import (
+    Transaction,
+    TransactionInput,
+    TransactionOutput,
+    TransactionError,
+    txids,
+)
+
+pk = PrivateKey(b"1" * 32)
+
+
+def make_tx(segwit):
+    vin = [
+        TransactionInput(
+            bytes([i]) * 32,
+            i,
+            script_sig=Script(b"" if segwit else b"\x01\x02"),
+            witness=Witness([b"\x01" * 72, pk.sec()] if segwit else []),
+        )
+        for i in range(3)
+    ]
+    vout = [TransactionOutput(1000 * i, p2wpkh(pk)) for i in range(2)]
+    vout.append(TransactionOutput(5, p2pkh(pk)))
+    return Transaction(vin=vin, vout=vout, locktime=123)
+
+
+class TransactionTest(TestCase):
+    def test_txid(self):
+        for segwit in [False, True]:
+            tx = make_tx(segwit)
+            # txid doesn't commit to witness
+            for inp in tx.vin:
+                inp.witness = Witness([])
+            legacy = tx.serialize()
+            tx = make_tx(segwit)
+            self.assertEqual(tx.is_segwit, segwit)
+            self.assertEqual(tx.hash(), hashes.double_sha256(legacy))
+            self.assertEqual(tx.txid(), bytes(reversed(tx.hash())))
+            raw = tx.serialize()
+            self.assertEqual(txids([tx, raw, legacy]), [tx.txid()] * 3)
+            vout, h = Transaction.read_vout(BytesIO(raw), 2)
+            self.assertEqual(h, tx.hash())
+            self.assertEqual(vout.serialize(), tx.vout[2].serialize())
+        self.assertEqual(txids([]), [])
+
+    def test_txids_invalid(self):
+        for segwit in [False, True]:
+            raw = make_tx(segwit).serialize()
+            for invalid in [raw[:3], raw[:5], raw[:-1], raw + b"\x00", raw * 2]:
+                with self.assertRaises(TransactionError):
+                    txids([invalid])
+        with self.assertRaises(TransactionError):
+            txids([b""])